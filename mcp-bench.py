@@ -0,0 +1,1167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+파일명: mcp-bench.py
+기능 요약: mcp-installer.py / mcp-status.py 성능 측정 도구
+          합성(synthetic) ~/.claude.json을 만들어 주요 경로의 지연시간/메모리 측정
+
+File History:
+  2026.10.17 PM01:00 초기 버전 생성 - 설정 파일 로드(전체 vs 스트리밍) 벤치마크
+  2026.10.17 PM03:00 보안 검증(위험 패턴 검사) 판정 일치 확인 및 처리량 측정 추가
+  2026.10.17 PM06:00 설정 조각 N개 가져오기 - 개별 실행 N회 vs 한 번의 일괄 실행 비교
+  2026.10.18 AM02:00 가짜 stdio MCP 서버(응답/무응답)로 --probe 마감시간·프로세스 그룹 종료 검증
+  2026.10.18 AM03:00 등록된 MCP 서버 콜드/웜 시작 지연 측정 (첫 JSON-RPC 응답까지 p50/p95/max)
+  2026.10.18 AM04:00 probe 검증에 --optimize-launch 적용 조건 추가 (변경 설정이 initialize에 응답한 항목만 적용)
+  2026.10.18 AM05:00 핫 경로 벤치마크 모음 (서버 10/1k/10k x 프로젝트 100/10k) 및 기준값 비교 회귀 검출
+  2026.10.18 AM08:00 -X importtime 기반 시작 임포트 예산 검사 (--list / --offline 경로, 무거운 모듈 금지 목록)
+  2026.10.18 AM10:00 연결 수를 세는 로컬 HTTPS 레지스트리 스텁으로 keep-alive 연결 재사용 검증 (매 요청 연결 vs 풀)
+  2026.10.18 PM01:00 레지스트리 스텁에 ETag/Last-Modified 및 304 응답 추가, registry --revalidate로 재조회 시 본문 0 bytes 검증
+  2026.10.18 PM04:00 suite에 뷰 캐시를 지우고 재는 load_config(read_only, cold) 추가, 기존 항목은 (read_only, cached)로 구분
+=====================================================================
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# 자식 프로세스에서 실행할 로더 (프로세스별 최대 RSS를 분리 측정하기 위함)
+_LOADER_CODE = {
+    'json.load': (
+        "import json\n"
+        "with open(PATH, 'r', encoding='utf-8') as f:\n"
+        "    data = json.load(f)\n"
+        "servers = data.get('mcpServers', {})\n"
+    ),
+    'load_mcp_view': (
+        "from mcp_common import load_mcp_view\n"
+        "data = load_mcp_view(PATH)\n"
+        "servers = data.get('mcpServers', {})\n"
+    ),
+}
+
+_CHILD_TEMPLATE = """
+import sys, time
+sys.path.insert(0, {script_dir!r})
+PATH = {path!r}
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+except ImportError:
+    rss = 0
+print(elapsed, rss, len(servers), len(data.get('projects', {{}})))
+"""
+
+
+def make_synthetic_config(path: Path, target_mb: float, servers: int = 20,
+                          history_chars: int = 2000) -> Dict[str, int]:
+    """대화 기록이 많은 프로젝트를 포함한 합성 ~/.claude.json을 목표 크기까지 생성"""
+    target_bytes = int(target_mb * 1024 * 1024)
+    blob = "이전 대화 내용 \"quoted\" {braces} [brackets] " * (history_chars // 40 + 1)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "numStartups": 42,\n  "mcpServers": ')
+        f.write(json.dumps({
+            f"server-{i}": {"type": "stdio", "command": "npx", "args": ["-y", f"@bench/server-{i}"]}
+            for i in range(servers)
+        }, indent=2))
+        f.write(',\n  "projects": {')
+        written = f.tell()
+        count = 0
+        while written < target_bytes:
+            project = {
+                "allowedTools": [],
+                "history": [{"display": blob, "pastedContents": {}} for _ in range(3)],
+                "mcpServers": ({f"local-{count}": {"type": "stdio", "command": "node", "args": ["server.js"]}}
+                               if count % 10 == 0 else {}),
+            }
+            f.write(('' if count == 0 else ',') + f'\n    {json.dumps(f"/home/dev/project-{count}")}: ')
+            f.write(json.dumps(project, ensure_ascii=False))
+            count += 1
+            written = f.tell()
+        f.write('\n  }\n}\n')
+    return {'bytes': path.stat().st_size, 'projects': count}
+
+
+def measure_loader(name: str, path: Path) -> Dict[str, Any]:
+    """별도 프로세스에서 로더를 실행해 지연시간(초)과 최대 RSS(KB) 측정"""
+    code = _CHILD_TEMPLATE.format(script_dir=str(SCRIPT_DIR), path=str(path), code=_LOADER_CODE[name])
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    elapsed, rss, servers, projects = result.stdout.split()
+    return {'loader': name, 'seconds': float(elapsed), 'max_rss_kb': int(rss),
+            'servers': int(servers), 'projects': int(projects)}
+
+
+def bench_load(sizes: List[float], repeat: int) -> List[Dict[str, Any]]:
+    """설정 파일 크기별 전체 로드 vs 스트리밍 추출 비교"""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"claude_{size:g}mb.json"
+            meta = make_synthetic_config(path, size)
+            for loader in _LOADER_CODE:
+                runs = [measure_loader(loader, path) for _ in range(repeat)]
+                best = min(runs, key=lambda r: r['seconds'])
+                best.update({'size_mb': size, 'file_bytes': meta['bytes']})
+                rows.append(best)
+            path.unlink()
+    return rows
+
+
+def load_script(name: str):
+    """하이픈이 들어간 스크립트 파일(mcp-installer.py 등)을 모듈로 로드"""
+    module_name = name.replace('-', '_').replace('.py', '')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    sys.path.insert(0, str(SCRIPT_DIR))
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_args_corpus(count: int, seed: int = 42) -> List[List[str]]:
+    """안전한 인자와 위험한 인자가 섞인 검증용 인자 목록 생성"""
+    rng = random.Random(seed)
+    safe = [
+        ['-y', '@modelcontextprotocol/server-filesystem', '/home/dev/projects'],
+        ['-y', 'mcp-server-fetch'],
+        ['/c', 'npx', '-y', '@anaisbetts/mcp-installer'],
+        ['-m', 'mcp_server_time', '--local-timezone', 'Asia/Seoul'],
+        ['server.js', '--port', '8080', '--verbose'],
+    ]
+    dangerous = [
+        'rm -rf /', 'del /s C:\\', 'Remove-Item x -Recurse', 'rd /s tmp', 'format c:',
+        'dd if=/dev/zero of=/dev/sda', 'eval (x)', 'exec(x)', 'Invoke-Expression $x',
+        'iex (x)', '$(whoami)', '`id`', 'a && b', 'a || b', 'a; b', 'a | b', 'a > f',
+        'a < f', 'a >> f', 'a 2> f', 'Add-Type x', 'System.Reflection.Assembly',
+        '-WindowStyle Hidden', 'DownloadString', 'new WebClient',
+    ]
+    corpus = []
+    for i in range(count):
+        args = list(rng.choice(safe))
+        if i % 4 == 0:
+            args.insert(rng.randrange(len(args) + 1), rng.choice(dangerous))
+        corpus.append(args)
+    return corpus
+
+
+def _reference_dangerous_pattern(patterns: List[str], args: List[str]):
+    """기존 방식(패턴별 re.search 반복)으로 첫 번째로 감지되는 패턴 반환"""
+    args_str = ' '.join(str(arg) for arg in args)
+    for pattern in patterns:
+        if re.search(pattern, args_str, re.IGNORECASE):
+            return pattern
+    return None
+
+
+def bench_validate(count: int, repeat: int) -> List[Dict[str, Any]]:
+    """SecurityValidator.validate_args 판정 일치 확인 및 처리량 측정"""
+    validator = load_script('mcp-installer.py').SecurityValidator
+    corpus = make_args_corpus(count)
+    patterns = validator.DANGEROUS_PATTERNS
+
+    # 1. 판정 및 경고 메시지 일치 확인
+    mismatches = 0
+    for args in corpus:
+        expected = _reference_dangerous_pattern(patterns, args)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            verdict = validator.validate_args(args, 'node')
+        if verdict != (expected is None) or (expected and f"위험한 패턴 감지: {expected}" not in out.getvalue()):
+            mismatches += 1
+
+    # 2. 처리량 측정 (경고 출력은 버림)
+    def run(fn):
+        best = None
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for args in corpus:
+                    fn(args)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    rows = []
+    for name, fn in (('re.search loop', lambda a: _reference_dangerous_pattern(patterns, a)),
+                     ('validate_args', lambda a: validator.validate_args(a, 'node'))):
+        seconds = run(fn)
+        rows.append({'impl': name, 'configs': count, 'seconds': seconds,
+                     'per_sec': count / seconds if seconds else 0.0, 'mismatches': mismatches})
+    return rows
+
+
+def _run_installer(home: Path, config_args: List[str]) -> None:
+    """임시 HOME에서 mcp-installer.py -c 실행"""
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    subprocess.run(
+        [sys.executable, str(SCRIPT_DIR / 'mcp-installer.py'), '-c', *config_args,
+         '--on-duplicate', 'skip', '--force'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, check=True
+    )
+
+
+def bench_import(fragments: int, servers: int, size_mb: float) -> List[Dict[str, Any]]:
+    """설정 조각 N개를 개별 실행 N회로 가져올 때와 한 번에 가져올 때 비교"""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        tmp = Path(tmp)
+        frag_dir = tmp / 'fragments'
+        frag_dir.mkdir()
+        for i in range(fragments):
+            frag = {f"team{i}-server{j}": {"type": "stdio", "command": "node", "args": [f"team{i}/server{j}.js"]}
+                    for j in range(servers)}
+            (frag_dir / f"team{i:03d}.json").write_text(json.dumps({"mcpServers": frag}), encoding='utf-8')
+        frag_files = sorted(str(p) for p in frag_dir.glob('*.json'))
+
+        for mode in ('separate', 'batched'):
+            home = tmp / mode
+            home.mkdir()
+            make_synthetic_config(home / '.claude.json', size_mb)
+            start = time.perf_counter()
+            if mode == 'separate':
+                for frag in frag_files:
+                    _run_installer(home, [frag])
+            else:
+                _run_installer(home, [str(frag_dir)])
+            seconds = time.perf_counter() - start
+            with open(home / '.claude.json', 'r', encoding='utf-8') as f:
+                total = len(json.load(f)['mcpServers'])
+            rows.append({'mode': mode, 'fragments': fragments, 'config_mb': size_mb,
+                         'seconds': seconds, 'servers_after': total})
+    return rows
+
+
+# 콜드 실행 시 빈 임시 디렉토리로 바꿀 패키지 매니저 캐시 (npx/uvx 등이 처음부터 해석·설치하도록)
+_COLD_CACHE_ENV = ('npm_config_cache', 'UV_CACHE_DIR', 'PIP_CACHE_DIR', 'BUN_INSTALL_CACHE_DIR', 'DENO_DIR')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def describe_launcher(config: Dict[str, Any]) -> str:
+    """실행 방식 요약 (cmd.exe /c npx -y, uvx, node 등)"""
+    command = os.path.basename(str(config.get('command', ''))).lower()
+    args = [str(a) for a in config.get('args') or []]
+    if command in ('cmd', 'cmd.exe') and args[:1] == ['/c'] and len(args) > 1:
+        command, args = f"cmd /c {args[1]}", args[2:]
+    return f"{command} -y" if args[:1] == ['-y'] else command
+
+
+def load_benchmark_servers(config_file: str = None) -> Dict[str, Dict[str, Any]]:
+    """측정 대상 stdio 서버 (기본: MCPInstaller가 읽는 ~/.claude.json, 보안 검증 통과분만)"""
+    installer_mod = load_script('mcp-installer.py')
+    with contextlib.redirect_stdout(io.StringIO()):
+        if config_file:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                servers = json.load(f).get('mcpServers', {})
+        else:
+            installer = installer_mod.MCPInstaller()
+            if not installer.load_config(read_only=True):
+                raise SystemExit("설정 파일을 읽을 수 없습니다")
+            servers = installer.data.get('mcpServers', {})
+        return {
+            name: config for name, config in servers.items()
+            if isinstance(config, dict) and config.get('type', 'stdio') == 'stdio'
+            and installer_mod.SecurityValidator.validate_server_config(name, config)
+        }
+
+
+def bench_startup(servers: Dict[str, Dict[str, Any]], cold_runs: int, warm_runs: int,
+                  timeout: float) -> List[Dict[str, Any]]:
+    """
+    서버별 콜드/웜 시작 지연 (실행부터 initialize 응답까지, ms)
+
+    cold: 실행마다 패키지 매니저 캐시를 빈 임시 디렉토리로 지정 (npx -y 첫 실행 상황)
+    warm: 평소 캐시로 한 번 예열한 뒤 측정. 실행은 서로 간섭하지 않도록 순차 수행.
+    """
+    from mcp_common import probe_stdio_server
+
+    rows = []
+    for name, config in servers.items():
+        for mode, runs in (('cold', cold_runs), ('warm', warm_runs)):
+            if runs <= 0:
+                continue
+            samples = []
+            last_error = None
+            if mode == 'warm':
+                probe_stdio_server(config, time.monotonic() + timeout)  # 예열 (측정 제외)
+            for _ in range(runs):
+                with tempfile.TemporaryDirectory(prefix='mcp-bench-cold-') as cache_dir:
+                    run_config = config
+                    if mode == 'cold':
+                        env = dict(config.get('env') or {})
+                        env.update({var: os.path.join(cache_dir, var) for var in _COLD_CACHE_ENV})
+                        run_config = dict(config, env=env)
+                    result = probe_stdio_server(run_config, time.monotonic() + timeout)
+                if result['first_response_ms'] is not None:
+                    samples.append(result['first_response_ms'])
+                else:
+                    last_error = result['error']
+            rows.append({
+                'server': name, 'launcher': describe_launcher(config), 'mode': mode,
+                'runs': runs, 'ok': len(samples),
+                'p50_ms': percentile(samples, 50) if samples else None,
+                'p95_ms': percentile(samples, 95) if samples else None,
+                'max_ms': max(samples) if samples else None,
+                'error': last_error,
+            })
+
+    # 느린 서버부터 (서버별 최악 p95 기준, 실패는 맨 앞)
+    worst = {}
+    for row in rows:
+        value = float('inf') if row['p95_ms'] is None else row['p95_ms']
+        worst[row['server']] = max(worst.get(row['server'], 0.0), value)
+    rows.sort(key=lambda r: (-worst[r['server']], r['server'], r['mode']))
+    return rows
+
+
+# 핫 경로 벤치마크 모음: 합성 설정 규모 (서버 수 x 프로젝트 수)
+SUITE_SERVER_COUNTS = (10, 1000, 10000)
+SUITE_PROJECT_COUNTS = (100, 10000)
+SUITE_BASELINE_FILE = SCRIPT_DIR / 'bench-baseline.json'
+SUITE_TOLERANCE = 0.5         # 기준값 대비 허용 증가율 (공유 CI 머신의 측정 편차 고려)
+SUITE_NOISE_FLOOR = 0.005     # 이보다 작은 차이(초)는 측정 잡음으로 보고 무시
+SUITE_DUPLICATE_LOOKUPS = 100
+SUITE_CONFIRM_RUNS = 2        # 회귀 판정 전 해당 규모 재측정 횟수
+
+
+def make_scaled_config(path: Path, servers: int, projects: int) -> int:
+    """서버 수/프로젝트 수를 지정한 합성 ~/.claude.json 생성 (파일 크기 반환)"""
+    safe_packages = ['@modelcontextprotocol/server-memory', '@modelcontextprotocol/server-filesystem',
+                     'mcp-server-fetch']
+    mcp_servers = {}
+    for i in range(servers):
+        if i % 3 == 0:
+            mcp_servers[f"server-{i}"] = {"type": "stdio", "command": "npx",
+                                          "args": ["-y", safe_packages[i % len(safe_packages)], f"/srv/{i}"]}
+        else:
+            mcp_servers[f"server-{i}"] = {"type": "stdio", "command": "node", "args": [f"servers/{i}/index.js"],
+                                          "env": {"SERVER_ID": str(i)}}
+    data = {
+        "numStartups": 42,
+        "mcpServers": mcp_servers,
+        "projects": {
+            f"/home/dev/project-{i}": {
+                "allowedTools": [],
+                "history": [{"display": f"작업 {i}-{j} \"quoted\" {{braces}}", "pastedContents": {}}
+                            for j in range(3)],
+                "mcpServers": ({f"local-{i}": {"type": "stdio", "command": "node", "args": ["server.js"]}}
+                               if i % 10 == 0 else {}),
+            }
+            for i in range(projects)
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path.stat().st_size
+
+
+def _time_case(fn, repeat: int, setup=None) -> float:
+    """setup(측정 제외) 후 fn 실행 시간을 repeat회 재서 최솟값(초) 반환 (잡음에 가장 덜 민감)"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        # timeit과 같이 측정 중에는 GC를 끔 (이전 규모에서 남은 객체 수에 따라 흔들리지 않도록)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(samples)
+
+
+def _suite_cases(installer_mod, status_mod, installer, repeat: int) -> Dict[str, float]:
+    """현재 HOME의 ~/.claude.json에 대해 핫 경로별 최소 실행 시간(초) 측정"""
+    from mcp_common import VIEW_CACHE_FILE
+
+    def drop_view_cache():
+        # 지문 캐시 적중 없이 설정 파일을 실제로 다시 읽도록 매번 뷰 캐시 삭제
+        try:
+            VIEW_CACHE_FILE.unlink()
+        except FileNotFoundError:
+            pass
+
+    results = {}
+    results['load_config(read_only, cold)'] = _time_case(
+        lambda: installer.load_config(read_only=True), repeat, setup=drop_view_cache)
+    results['load_config(read_only, cached)'] = _time_case(lambda: installer.load_config(read_only=True), repeat)
+    results['load_config'] = _time_case(lambda: installer.load_config(), repeat)
+
+    servers = installer.data['mcpServers']
+    counter = iter(range(10 ** 9))
+
+    def touch():
+        # 저장/백업이 매번 실제 변경을 다루도록 서버 하나의 인자를 바꿈
+        servers['server-0']['args'][-1] = f"/srv/rev-{next(counter)}"
+
+    results['save_config'] = _time_case(installer.save_config, repeat, setup=touch)
+
+    def touch_and_save():
+        touch()
+        installer.save_config()
+
+    results['create_backup'] = _time_case(installer.create_backup, repeat, setup=touch_and_save)
+    results['_cleanup_old_backups'] = _time_case(installer._cleanup_old_backups, repeat)
+
+    validator = installer_mod.SecurityValidator
+    results['validate_server_config(all)'] = _time_case(
+        lambda: [validator.validate_server_config(name, config) for name, config in servers.items()], repeat)
+
+    probes = [{"type": "stdio", "command": "node", "args": [f"servers/{i * 7}/index.js"]}
+              for i in range(SUITE_DUPLICATE_LOOKUPS)]
+
+    def reset_index():
+        installer._signature_index = None
+
+    results[f'find_duplicate_command(x{SUITE_DUPLICATE_LOOKUPS})'] = _time_case(
+        lambda: [installer.find_duplicate_command(probe) for probe in probes], repeat, setup=reset_index)
+
+    # 레지스트리 대신 미리 채운 온라인 정보 사용 (네트워크 없음)
+    full = installer.data
+    online_infos = {}
+    for mcp_name, package_name in status_mod.collect_mcp_targets(full):
+        stub = status_mod.empty_online_info()
+        stub.update({'version': '1.0.0', 'description': f"{mcp_name} 합성 설명", 'homepage': 'https://example.invalid'})
+        online_infos[status_mod.online_info_key(mcp_name, package_name)] = stub
+    results['generate_markdown_report'] = _time_case(
+        lambda: status_mod.generate_markdown_report(full, online_infos), repeat)
+    return results
+
+
+def bench_suite(server_counts: List[int], project_counts: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """
+    mcp-installer.py / mcp-status.py 핫 경로 벤치마크 (합성 설정 규모별 최소 실행 시간)
+
+    임시 HOME에서 실행하므로 실제 ~/.claude.json, 백업, 캐시는 건드리지 않는다.
+    """
+    rows = []
+    saved_env = {var: os.environ.get(var) for var in ('HOME', 'USERPROFILE')}
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-suite-') as tmp:
+        # 모듈 수준 경로(뷰 캐시, 온라인 정보 캐시)가 임시 HOME을 가리키도록 로드 전에 지정
+        os.environ['HOME'] = os.environ['USERPROFILE'] = tmp
+        installer_mod = load_script('mcp-installer.py')
+        status_mod = load_script('mcp-status.py')
+        status_mod.CACHE_OPTIONS['offline'] = True
+
+        for servers in server_counts:
+            for projects in project_counts:
+                # 규모별로 별도 HOME (설정, 백업 저장소, 잠금 파일)
+                home = Path(tmp) / f"servers{servers}-projects{projects}"
+                home.mkdir()
+                os.environ['HOME'] = os.environ['USERPROFILE'] = str(home)
+                size = make_scaled_config(home / '.claude.json', servers, projects)
+                installer = installer_mod.MCPInstaller()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    installer.acquire_lock()
+                    try:
+                        results = _suite_cases(installer_mod, status_mod, installer, repeat)
+                    finally:
+                        installer.release_lock()
+                for case, seconds in results.items():
+                    rows.append({'case': case, 'servers': servers, 'projects': projects,
+                                 'file_kb': size // 1024, 'seconds': seconds})
+    for var, value in saved_env.items():
+        if value is None:
+            os.environ.pop(var, None)
+        else:
+            os.environ[var] = value
+    return rows
+
+
+def _baseline_machine() -> str:
+    """기준값을 구분하는 실행 환경 키 (다른 환경의 기준값과 비교하지 않도록)"""
+    return f"{platform.system()}-{platform.machine()}-{platform.python_implementation()}-{platform.python_version()}"
+
+
+def _baseline_key(row: Dict[str, Any]) -> str:
+    return f"{row['case']}|servers={row['servers']}|projects={row['projects']}"
+
+
+def compare_baseline(rows: List[Dict[str, Any]], path: Path, tolerance: float) -> int:
+    """기준값과 비교해 각 행에 baseline/ratio/status를 채우고 회귀 건수 반환"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get(_baseline_machine(), {})
+    except (OSError, ValueError):
+        baseline = {}
+    regressions = 0
+    for row in rows:
+        base = baseline.get(_baseline_key(row))
+        row['baseline'] = base
+        if base is None:
+            row['status'] = 'new'
+            continue
+        row['ratio'] = row['seconds'] / base if base else None
+        if row['seconds'] > base * (1 + tolerance) and row['seconds'] - base > SUITE_NOISE_FLOOR:
+            row['status'] = 'REGRESSION'
+            regressions += 1
+        else:
+            row['status'] = 'ok'
+    return regressions
+
+
+def save_baseline(rows: List[Dict[str, Any]], path: Path) -> None:
+    """현재 실행 환경의 기준값 갱신 (다른 환경 기준값은 유지)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    machine = stored.setdefault(_baseline_machine(), {})
+    machine.update({_baseline_key(row): round(row['seconds'], 6) for row in rows})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+# 시작 임포트 예산: 스크립트 임포트 시간에서 피할 수 없는 표준 모듈(json/pathlib/argparse 등)만
+# 임포트하는 기준 프로세스 시간을 뺀 "자체 부담"에 적용 (단일 코어 CI의 절대 시간 편차 상쇄)
+# 변경 전 자체 부담은 이 장비에서 --list 약 39ms, status --offline 약 75ms (subprocess/ssl/urllib 등 선임포트)
+IMPORTTIME_BUDGET_MS = 12.0
+IMPORTTIME_REFERENCE = ('json', 'pathlib', 'typing', 'argparse', 'datetime', 'threading', 'contextlib', 're')
+IMPORTTIME_CASES = {
+    'installer --list': (['mcp-installer.py', '--list'],
+                         ('subprocess', 'socket', 'socketserver', 'tempfile', 'hashlib', 'ssl',
+                          'urllib.request', 'concurrent.futures')),
+    'status --offline': (['mcp-status.py', '--offline'],
+                         ('subprocess', 'socket', 'ssl', 'urllib.request', 'concurrent.futures')),
+}
+_INTERPRETER_STARTUP_MODULES = {'_frozen_importlib_external', 'zipimport', 'encodings', 'encodings.utf_8',
+                                '_signal', '_abc', 'abc', 'io', 'site', 'codecs'}
+
+
+def parse_importtime(stderr: str) -> Dict[str, Any]:
+    """-X importtime 출력에서 최상위 임포트 누적 시간(ms)과 임포트된 모듈 목록 추출"""
+    top_level = {}
+    modules = set()
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$', line)
+        if not match:
+            continue
+        name = match.group(4)
+        modules.add(name)
+        if len(match.group(3)) == 1 and name not in _INTERPRETER_STARTUP_MODULES:
+            top_level[name] = top_level.get(name, 0) + int(match.group(2)) / 1000.0
+    return {'total_ms': sum(top_level.values()), 'top_level': top_level, 'modules': modules}
+
+
+def _importtime_run(argv: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *argv], env=env, stdin=subprocess.DEVNULL,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60)
+    return parse_importtime(proc.stderr)
+
+
+def bench_importtime(repeat: int) -> List[Dict[str, Any]]:
+    """빈 임시 HOME에서 조회 경로를 -X importtime으로 실행해 자체 임포트 부담과 금지 모듈 확인"""
+    rows = []
+    reference_argv = ['-c', 'import ' + ', '.join(IMPORTTIME_REFERENCE)]
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        home = Path(tmp)
+        make_scaled_config(home / '.claude.json', 10, 10)
+        env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+        env.pop('PYTHONPROFILEIMPORTTIME', None)
+        for case, (argv, forbidden) in IMPORTTIME_CASES.items():
+            best = reference = None
+            # 첫 실행은 .pyc 생성 비용이 섞이므로 버림. 기준 프로세스와 번갈아 실행해 각각 최솟값 사용
+            for attempt in range(repeat + 1):
+                result = _importtime_run([str(SCRIPT_DIR / argv[0]), *argv[1:]], env)
+                ref = _importtime_run(reference_argv, env)['total_ms']
+                if not attempt:
+                    continue
+                if best is None or result['total_ms'] < best['total_ms']:
+                    best = result
+                reference = ref if reference is None else min(reference, ref)
+            heavy = sorted(best['top_level'].items(), key=lambda item: item[1], reverse=True)[:5]
+            rows.append({'case': case, 'import_ms': best['total_ms'], 'reference_ms': reference,
+                         'overhead_ms': max(0.0, best['total_ms'] - reference), 'modules': len(best['modules']),
+                         'forbidden': ','.join(m for m in forbidden if m in best['modules']) or None,
+                         'top': ', '.join(f"{name} {ms:.1f}" for name, ms in heavy)})
+    return rows
+
+
+class _CountingRegistryStub:
+    """
+    받은 연결 수와 요청 수를 세는 로컬 npm 레지스트리 스텁 (HTTP/1.1 keep-alive)
+
+    tls=True면 openssl로 만든 자체 서명 인증서로 HTTPS 제공 (클라이언트는 인증서 검증 생략).
+    패키지마다 고정 ETag/Last-Modified를 보내고, 조건부 요청이 일치하면 본문 없는 304로 응답하며
+    304 응답 수와 보낸 본문 바이트 수도 센다.
+    """
+
+    def __init__(self, tls: bool, workdir: Path):
+        import email.utils
+        import hashlib
+        import http.server
+        import ssl
+        import threading
+        import urllib.parse
+
+        stub = self
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.body_bytes = 0
+        self._lock = threading.Lock()
+        last_modified = email.utils.formatdate(time.time() - 3600, usegmt=True)
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 나눠 쓰므로 Nagle을 끄지 않으면 유지된 연결에서 지연 ACK(40ms)만큼 멈춤
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                name = urllib.parse.unquote(self.path.lstrip('/'))
+                etag = f'"{hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]}"'
+                if_none_match = self.headers.get('If-None-Match')
+                if (if_none_match == etag if if_none_match is not None
+                        else self.headers.get('If-Modified-Since') == last_modified):
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', last_modified)
+                    self.end_headers()
+                    return
+                body = json.dumps({
+                    'name': name, 'description': f"{name} (bench)", 'dist-tags': {'latest': '1.0.0'},
+                    'keywords': ['mcp', 'bench'], 'repository': {'url': f"git+https://example.test/{name}.git"},
+                    'readme': 'x' * 2048,
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.body_bytes += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(http.server.ThreadingHTTPServer):
+            # 기본 backlog(5)는 동시 연결 시 넘쳐 SYN 재전송(1초) 대기가 생김
+            request_queue_size = 128
+            daemon_threads = True
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.scheme = 'http'
+        if tls:
+            cert = workdir / 'registry-stub.pem'
+            subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                            '-subj', '/CN=127.0.0.1', '-keyout', str(cert), '-out', str(cert)],
+                           stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           check=True)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(str(cert))
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = 'https'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://127.0.0.1:{self.server.server_address[1]}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connections = self.requests = self.not_modified = self.body_bytes = 0
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def bench_registry(packages: int, jobs: int, tls: bool, revalidate: bool = False) -> List[Dict[str, Any]]:
+    """
+    mcp-status.py 선조회로 스텁 레지스트리에서 패키지 N개 조회 - 매 요청 새 연결 vs keep-alive 풀
+
+    revalidate=True면 풀로 두 번 조회: 첫 실행(전체 응답)에서 캐시에 저장한 ETag/Last-Modified로
+    두 번째 실행(--refresh와 같은 강제 재조회)이 조건부 요청을 보내 304만 받는지 확인.
+    """
+    status_mod = load_script('mcp-status.py')
+    targets = [(f"bench-{i}", f"@bench/server-{i}") for i in range(packages)]
+    pooled_idle = max(status_mod.REGISTRY_MAX_IDLE, jobs)
+    modes = ((('first', pooled_idle), ('revalidate', pooled_idle)) if revalidate
+             else (('per-request', 0), ('pooled', pooled_idle)))
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        stub = _CountingRegistryStub(tls, Path(tmp))
+        saved = (status_mod.NPM_REGISTRY_URL, status_mod.REGISTRY_POOL, dict(status_mod.CACHE_OPTIONS),
+                 dict(status_mod.MCP_INFO_CACHE))
+        try:
+            status_mod.NPM_REGISTRY_URL = stub.url
+            status_mod.CACHE_OPTIONS.update(refresh=True, offline=False)
+            status_mod.MCP_INFO_CACHE.clear()
+            for mode, max_idle in modes:
+                pool = status_mod.RegistryConnectionPool(max_idle)
+                status_mod.REGISTRY_POOL = pool
+                if mode != 'revalidate':
+                    # 이전 모드가 남긴 검증자로 304를 받으면 연결 재사용 비교가 달라지므로 비움
+                    status_mod.MCP_INFO_CACHE.clear()
+                stub.reset()
+                start = time.perf_counter()
+                results = status_mod.prefetch_online_targets(targets, max_workers=jobs, deadline=120)
+                seconds = time.perf_counter() - start
+                pool.close()
+                rows.append({'mode': mode, 'scheme': stub.scheme, 'packages': packages, 'jobs': jobs,
+                             'ok': sum(1 for info in results.values() if info.get('version')),
+                             'requests': stub.requests, 'connections': stub.connections,
+                             'not_modified': stub.not_modified, 'body_bytes': stub.body_bytes,
+                             'seconds': seconds, 'ms_per_request': seconds * 1000 / max(1, packages)})
+        finally:
+            status_mod.NPM_REGISTRY_URL, status_mod.REGISTRY_POOL = saved[:2]
+            status_mod.CACHE_OPTIONS.update(saved[2])
+            status_mod.MCP_INFO_CACHE.clear()
+            status_mod.MCP_INFO_CACHE.update(saved[3])
+            stub.close()
+    return rows
+
+
+# 점검/실행 최적화 검증용 가짜 stdio MCP 서버: ok는 initialize/tools/list에 응답, hang은 응답하지 않음.
+# 둘 다 오래 자는 자식 프로세스를 하나 띄우고 자신/부모/자식 pid를 pid 파일에 남김 (강제 종료 확인용)
+_FAKE_MCP_SERVER = """
+import json, os, subprocess, sys
+mode, pid_file = sys.argv[1], sys.argv[2]
+child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(600)'])
+with open(pid_file, 'a') as f:
+    f.write(f"{os.getpid()} {os.getppid()} {child.pid}\\n")
+for line in sys.stdin:
+    message = json.loads(line)
+    if mode != 'ok' or 'id' not in message:
+        continue
+    if message['method'] == 'initialize':
+        result = {'protocolVersion': message['params']['protocolVersion'], 'capabilities': {'tools': {}},
+                  'serverInfo': {'name': 'fake-mcp', 'version': '1.0.0'}}
+    elif message['method'] == 'tools/list':
+        result = {'tools': [{'name': 'echo', 'inputSchema': {'type': 'object'}}]}
+    else:
+        result = {}
+    print(json.dumps({'jsonrpc': '2.0', 'id': message['id'], 'result': result}), flush=True)
+"""
+
+# npx 캐시에 설치된 것처럼 둘 패키지의 bin 스크립트 (node가 가짜 서버를 실행하고 stdio를 그대로 넘김)
+_FAKE_NODE_BIN = """
+const { spawn } = require('child_process');
+const child = spawn(%s, [%s, %s, %s], { stdio: 'inherit' });
+child.on('exit', (code) => process.exit(code === null ? 1 : code));
+"""
+
+# PATH 앞에 둘 npx 대역: 레지스트리 대신 항상 응답하는 가짜 서버 실행 (기존 설정 측정이 네트워크에 의존하지 않도록)
+_FAKE_NPX = """#!%s
+import os, sys
+os.execv(sys.executable, [sys.executable, %r, 'ok', %r])
+"""
+
+
+def _read_pids(pid_file: Path) -> List[int]:
+    if not pid_file.exists():
+        return []
+    return [int(pid) for pid in pid_file.read_text().split() if pid.isdigit()]
+
+
+def _alive_pids(pids: List[int], wait: float = 2.0) -> List[int]:
+    """아직 살아 있는 pid (좀비는 종료로 간주, 부모가 정리할 시간을 wait초까지 줌)"""
+    def alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        try:
+            with open(f"/proc/{pid}/stat", 'r') as f:
+                return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+        except OSError:
+            return True
+    end = time.monotonic() + wait
+    while True:
+        remaining = [pid for pid in set(pids) if alive(pid)]
+        if not remaining or time.monotonic() >= end:
+            return sorted(remaining)
+        time.sleep(0.05)
+
+
+def _installer_summary(home: Path, env: Dict[str, str], argv: List[str], timeout: float) -> Dict[str, Any]:
+    """임시 HOME에서 mcp-installer.py를 --json-summary로 실행해 요약 JSON 반환"""
+    proc = subprocess.run([sys.executable, str(SCRIPT_DIR / 'mcp-installer.py'), *argv, '--json-summary'],
+                          env=dict(env, HOME=str(home), USERPROFILE=str(home)), stdin=subprocess.DEVNULL,
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=timeout)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_probe(timeout: float) -> List[Dict[str, Any]]:
+    """
+    가짜 stdio MCP 서버로 --probe / --optimize-launch --apply-launch 동작 검증
+
+    probe: 응답하는 서버는 ok, 응답하지 않는 서버는 마감시간에 timeout이고 자식까지 남지 않아야 함.
+    optimize-launch: npx 캐시의 bin을 node로 직접 실행하는 변경 설정이 initialize에 응답한
+    항목만 적용되고, 응답하지 않는 항목은 기존 설정이 그대로 남아야 함 (node 없으면 생략).
+    """
+    import shutil
+
+    rows = []
+
+    def check(name, expected, actual, ok):
+        rows.append({'check': name, 'expected': expected, 'actual': actual, 'status': 'ok' if ok else 'FAIL'})
+
+    if sys.platform == 'win32':
+        raise SystemExit("probe 검증은 POSIX 환경에서만 지원합니다 (프로세스 그룹 종료 확인)")
+    python = sys.executable
+    extend = ['--extend-command', Path(python).name]
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        tmp = Path(tmp)
+        fake = tmp / 'fake_mcp_server.py'
+        fake.write_text(_FAKE_MCP_SERVER, encoding='utf-8')
+        env = dict(os.environ)
+
+        # 1. --probe: ok / hang 동시 점검
+        home = tmp / 'probe'
+        home.mkdir()
+        pid_file = tmp / 'probe.pids'
+        servers = {mode: {'type': 'stdio', 'command': python, 'args': [str(fake), mode, str(pid_file)]}
+                   for mode in ('ok', 'hang')}
+        (home / '.claude.json').write_text(json.dumps({'mcpServers': {f"fake-{m}": c for m, c in servers.items()}}),
+                                           encoding='utf-8')
+        start = time.perf_counter()
+        summary = _installer_summary(home, env, ['--probe', '--probe-timeout', str(timeout), *extend],
+                                     timeout + 30)
+        elapsed = time.perf_counter() - start
+        probe = summary.get('probe') or {}
+        ok_result = probe.get('fake-ok', {})
+        check('probe fake-ok', 'ok, tools=1', f"{ok_result.get('status')}, tools={ok_result.get('tools')}",
+              ok_result.get('status') == 'ok' and ok_result.get('tools') == 1)
+        hang_status = probe.get('fake-hang', {}).get('status')
+        check('probe fake-hang', 'timeout', hang_status, hang_status == 'timeout')
+        # 인터프리터 시작과 정리 여유 5초
+        check('probe elapsed', f"<= {timeout + 5:g}s", f"{elapsed:.2f}s", elapsed <= timeout + 5)
+        pids = _read_pids(pid_file)
+        leftover = _alive_pids(pids)
+        check('probe leftover processes', '0', f"{len(leftover)} / {len(set(pids))}", pids and not leftover)
+        for pid in leftover:
+            os.kill(pid, 9)
+
+        # 2. --optimize-launch --apply-launch: 변경 설정이 initialize에 응답해야만 적용
+        node = shutil.which('node')
+        if not node:
+            rows.append({'check': 'optimize-launch', 'expected': 'node', 'actual': None, 'status': 'skipped'})
+            return rows
+        home = tmp / 'launch'
+        home.mkdir()
+        pid_file = tmp / 'launch.pids'
+        bin_dir = tmp / 'bin'
+        bin_dir.mkdir()
+        npx = bin_dir / 'npx'
+        npx.write_text(_FAKE_NPX % (python, str(fake), str(pid_file)), encoding='utf-8')
+        npx.chmod(0o755)
+        cache = tmp / 'npm-cache'
+        config = {}
+        for mode in ('ok', 'hang'):
+            package = f"@bench/fake-{mode}"
+            package_dir = cache / '_npx' / 'benchhash' / 'node_modules' / package
+            package_dir.mkdir(parents=True)
+            (package_dir / 'package.json').write_text(
+                json.dumps({'name': package, 'version': '1.0.0', 'bin': 'server.js'}), encoding='utf-8')
+            (package_dir / 'server.js').write_text(
+                _FAKE_NODE_BIN % tuple(json.dumps(v) for v in (python, str(fake), mode, str(pid_file))),
+                encoding='utf-8')
+            config[f"fake-{mode}"] = {'type': 'stdio', 'command': 'npx', 'args': ['-y', package]}
+            extend += ['--extend-package', package]
+        (home / '.claude.json').write_text(json.dumps({'mcpServers': config}), encoding='utf-8')
+        launch_env = dict(env, npm_config_cache=str(cache), PATH=f"{bin_dir}{os.pathsep}{env.get('PATH', '')}")
+        launch_env.pop('NPM_CONFIG_CACHE', None)
+        summary = _installer_summary(home, launch_env, ['--optimize-launch', '--apply-launch', '--launch-runs', '1',
+                                                        '--probe-timeout', str(timeout), *extend], timeout * 4 + 30)
+        launch = summary.get('optimize_launch') or {}
+        with open(home / '.claude.json', 'r', encoding='utf-8') as f:
+            saved = json.load(f)['mcpServers']
+        ok_result = launch.get('fake-ok', {})
+        check('launch fake-ok', 'ok, applied, command=node',
+              f"{ok_result.get('status')}, {'applied' if ok_result.get('applied') else 'not applied'}, "
+              f"command={saved['fake-ok'].get('command')}",
+              ok_result.get('status') == 'ok' and ok_result.get('applied') and saved['fake-ok'].get('command') == 'node')
+        hang_result = launch.get('fake-hang', {})
+        check('launch fake-hang', 'failed, not applied, command=npx',
+              f"{hang_result.get('status')}, {'applied' if hang_result.get('applied') else 'not applied'}, "
+              f"command={saved['fake-hang'].get('command')}",
+              hang_result.get('status') == 'failed' and not hang_result.get('applied')
+              and saved['fake-hang'] == config['fake-hang'])
+        pids = _read_pids(pid_file)
+        leftover = _alive_pids(pids)
+        check('launch leftover processes', '0', f"{len(leftover)} / {len(set(pids))}", pids and not leftover)
+        for pid in leftover:
+            os.kill(pid, 9)
+    return rows
+
+
+def print_table(rows: List[Dict[str, Any]], columns: List[str]) -> None:
+    """결과를 고정폭 테이블로 출력"""
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join('-' * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value: Any) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(
+        description='mcp-installer.py / mcp-status.py 성능 측정 도구',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python mcp-bench.py load                       # 10MB / 100MB 설정 파일 로드 비교
+  python mcp-bench.py load --sizes 1,10 --json   # 크기 지정, JSON 출력
+  python mcp-bench.py validate --count 5000      # 위험 패턴 검사 판정 일치 및 처리량
+  python mcp-bench.py import --fragments 20      # 조각 20개: 개별 실행 vs 일괄 실행
+  python mcp-bench.py startup --cold 3 --warm 5  # 등록된 서버 콜드/웜 시작 지연 (p50/p95/max)
+  python mcp-bench.py startup --config servers.json --servers memory,git --json
+  python mcp-bench.py suite --save-baseline      # 핫 경로 벤치마크 실행 후 기준값 저장 (bench-baseline.json)
+  python mcp-bench.py suite                      # 기준값 대비 50% 넘게 느려진 항목이 있으면 종료 코드 1
+  python mcp-bench.py suite --servers 10,1000 --projects 100 --repeat 3
+  python mcp-bench.py registry --packages 50    # 로컬 HTTPS 스텁: 매 요청 새 연결 vs keep-alive 풀 (연결 수가 동시 조회 수를 넘으면 종료 코드 1)
+  python mcp-bench.py registry --revalidate      # 두 번째 조회가 ETag/Last-Modified 조건부 요청으로 모두 304(본문 0 bytes)가 아니면 종료 코드 1
+  python mcp-bench.py probe                      # 가짜 MCP 서버로 --probe ok/timeout, 남은 자식 프로세스, --optimize-launch 적용 조건 검증
+  python mcp-bench.py importtime                 # --list/--offline 시작 임포트 부담 예산(12ms) 초과 또는 무거운 모듈 임포트 시 종료 코드 1
+        """
+    )
+    sub = parser.add_subparsers(dest='command')
+
+    load = sub.add_parser('load', help='전체 json.load vs 스트리밍 mcpServers 추출 비교')
+    load.add_argument('--sizes', default='10,100', help='합성 설정 파일 크기 목록 (MB, 쉼표 구분)')
+    load.add_argument('--repeat', type=int, default=3, help='크기별 반복 횟수 (최솟값 사용)')
+    load.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    validate = sub.add_parser('validate', help='위험 패턴 검사 판정 일치 확인 및 처리량 측정')
+    validate.add_argument('--count', type=int, default=5000, help='검증할 인자 목록 수')
+    validate.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    validate.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    imp = sub.add_parser('import', help='설정 조각 N개: 개별 실행 N회 vs 일괄 실행 1회')
+    imp.add_argument('--fragments', type=int, default=20, help='설정 조각 파일 수')
+    imp.add_argument('--servers', type=int, default=5, help='조각당 서버 수')
+    imp.add_argument('--size', type=float, default=10, help='기존 ~/.claude.json 크기 (MB)')
+    imp.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    startup = sub.add_parser('startup', help='등록된 stdio 서버의 콜드/웜 시작 지연 (첫 JSON-RPC 응답까지)')
+    startup.add_argument('--cold', type=int, default=3, help='서버별 콜드 실행 횟수 (빈 패키지 캐시)')
+    startup.add_argument('--warm', type=int, default=5, help='서버별 웜 실행 횟수 (예열 후)')
+    startup.add_argument('--timeout', type=float, default=120.0, help='실행 1회 마감시간(초)')
+    startup.add_argument('--servers', help='측정할 서버 이름 (쉼표 구분, 기본: 전체)')
+    startup.add_argument('--config', help='~/.claude.json 대신 사용할 mcpServers 설정 JSON')
+    startup.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    suite = sub.add_parser('suite', help='설치/현황 스크립트 핫 경로 벤치마크 및 기준값 회귀 검사')
+    suite.add_argument('--servers', default=','.join(map(str, SUITE_SERVER_COUNTS)),
+                       help='합성 설정의 서버 수 목록 (쉼표 구분)')
+    suite.add_argument('--projects', default=','.join(map(str, SUITE_PROJECT_COUNTS)),
+                       help='합성 설정의 프로젝트 수 목록 (쉼표 구분)')
+    suite.add_argument('--repeat', type=int, default=5, help='항목별 반복 횟수 (최솟값 사용)')
+    suite.add_argument('--baseline', default=str(SUITE_BASELINE_FILE), help='기준값 파일')
+    suite.add_argument('--tolerance', type=float, default=SUITE_TOLERANCE,
+                       help="회귀로 판정할 기준값 대비 증가율 (기본: 0.5)")
+    suite.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장')
+    suite.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    importtime = sub.add_parser('importtime', help='조회 경로 시작 임포트 시간 예산 및 무거운 모듈 임포트 검사')
+    importtime.add_argument('--repeat', type=int, default=10, help='경로별 반복 횟수 (최솟값 사용)')
+    importtime.add_argument('--budget', type=float, default=IMPORTTIME_BUDGET_MS,
+                            help=f"기준 프로세스 대비 허용 임포트 부담 (ms, 기본: {IMPORTTIME_BUDGET_MS:g})")
+    importtime.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    registry = sub.add_parser('registry', help='레지스트리 조회 keep-alive 연결 재사용 검증 (연결 수를 세는 로컬 스텁)')
+    registry.add_argument('--packages', type=int, default=50, help='조회할 패키지 수')
+    registry.add_argument('--jobs', type=int, default=8, help='동시 조회 수 (mcp-status.py --jobs)')
+    registry.add_argument('--plain-http', action='store_true', help='HTTPS 대신 HTTP 스텁 사용 (openssl 없는 환경)')
+    registry.add_argument('--revalidate', action='store_true',
+                          help='두 번 조회해 두 번째 실행이 ETag/Last-Modified 조건부 요청으로 304만 받는지 검증')
+    registry.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    probe = sub.add_parser('probe', help='가짜 stdio MCP 서버로 --probe / --optimize-launch 동작 검증')
+    probe.add_argument('--timeout', type=float, default=3.0, help='--probe-timeout 값 (초, 무응답 서버 마감시간)')
+    probe.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    args = parser.parse_args()
+
+    if args.command == 'load':
+        sizes = [float(s) for s in args.sizes.split(',') if s.strip()]
+        rows = bench_load(sizes, max(1, args.repeat))
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_table(rows, ['size_mb', 'loader', 'seconds', 'max_rss_kb', 'servers', 'projects'])
+        return 0
+
+    if args.command == 'validate':
+        rows = bench_validate(max(1, args.count), max(1, args.repeat))
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_table(rows, ['impl', 'configs', 'seconds', 'per_sec', 'mismatches'])
+        # 판정이 하나라도 다르면 실패
+        return 1 if rows[0]['mismatches'] else 0
+
+    if args.command == 'import':
+        rows = bench_import(max(1, args.fragments), max(1, args.servers), args.size)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_table(rows, ['mode', 'fragments', 'config_mb', 'seconds', 'servers_after'])
+        return 0
+
+    if args.command == 'suite':
+        rows = bench_suite([int(n) for n in args.servers.split(',') if n.strip()],
+                           [int(n) for n in args.projects.split(',') if n.strip()], max(1, args.repeat))
+        baseline_path = Path(args.baseline)
+        regressions = 0
+        if args.save_baseline:
+            save_baseline(rows, baseline_path)
+        else:
+            regressions = compare_baseline(rows, baseline_path, args.tolerance)
+            # 일시적인 잡음과 구분하기 위해 회귀가 난 규모만 다시 재서 더 빠른 쪽으로 판정
+            for _ in range(SUITE_CONFIRM_RUNS):
+                if not regressions:
+                    break
+                flagged = {(r['servers'], r['projects']) for r in rows if r['status'] == 'REGRESSION'}
+                for servers, projects in sorted(flagged):
+                    rerun = {r['case']: r['seconds'] for r in bench_suite([servers], [projects], max(1, args.repeat))}
+                    for row in rows:
+                        if (row['servers'], row['projects']) == (servers, projects):
+                            row['seconds'] = min(row['seconds'], rerun[row['case']])
+                regressions = compare_baseline(rows, baseline_path, args.tolerance)
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_table(rows, ['case', 'servers', 'projects', 'file_kb', 'seconds']
+                        + ([] if args.save_baseline else ['baseline', 'status']))
+        if args.save_baseline:
+            print(f"기준값 저장: {baseline_path} ({_baseline_machine()})", file=sys.stderr)
+        elif regressions:
+            print(f"성능 회귀 {regressions}건 (허용 {args.tolerance:.0%} 초과)", file=sys.stderr)
+        return 1 if regressions else 0
+
+    if args.command == 'startup':
+        servers = load_benchmark_servers(args.config)
+        if args.servers:
+            wanted = [n.strip() for n in args.servers.split(',') if n.strip()]
+            servers = {n: servers[n] for n in wanted if n in servers}
+        if not servers:
+            print("측정할 stdio 서버가 없습니다", file=sys.stderr)
+            return 1
+        rows = bench_startup(servers, max(0, args.cold), max(0, args.warm), args.timeout)
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_table(rows, ['server', 'launcher', 'mode', 'runs', 'ok', 'p50_ms', 'p95_ms', 'max_ms'])
+            for row in rows:
+                if row['error']:
+                    print(f"  {row['server']} ({row['mode']}): {row['error']}", file=sys.stderr)
+        return 1 if any(r['ok'] < r['runs'] for r in rows) else 0
+
+    if args.command == 'registry':
+        rows = bench_registry(max(1, args.packages), max(1, args.jobs), tls=not args.plain_http,
+                              revalidate=args.revalidate)
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_table(rows, ['mode', 'scheme', 'packages', 'jobs', 'ok', 'requests', 'connections',
+                               'not_modified', 'body_bytes', 'seconds', 'ms_per_request'])
+        # 풀은 동시 조회 수보다 많은 연결을 열지 않아야 하고, 모든 조회가 성공해야 함
+        pooled = rows[-1]
+        failed = any(r['ok'] < r['packages'] for r in rows)
+        if pooled['connections'] > min(args.jobs, args.packages):
+            failed = True
+            print(f"연결 재사용 실패: 풀 모드 연결 {pooled['connections']}개 (허용 {min(args.jobs, args.packages)}개)",
+                  file=sys.stderr)
+        # 재검증: 첫 실행은 전체 응답, 두 번째 실행은 모두 304이고 본문 0바이트여야 함
+        if args.revalidate:
+            first, second = rows
+            if first['not_modified'] or second['not_modified'] != second['packages'] or second['body_bytes']:
+                failed = True
+                print(f"재검증 실패: 두 번째 실행 304 {second['not_modified']}/{second['packages']}개, "
+                      f"본문 {second['body_bytes']} bytes (첫 실행 304 {first['not_modified']}개)", file=sys.stderr)
+        return 1 if failed else 0
+
+    if args.command == 'probe':
+        rows = bench_probe(max(0.5, args.timeout))
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_table(rows, ['check', 'expected', 'actual', 'status'])
+        return 1 if any(r['status'] == 'FAIL' for r in rows) else 0
+
+    if args.command == 'importtime':
+        rows = bench_importtime(max(1, args.repeat))
+        failures = 0
+        for row in rows:
+            row['budget_ms'] = args.budget
+            row['status'] = 'ok'
+            if row['forbidden']:
+                row['status'] = 'FORBIDDEN'
+            elif row['overhead_ms'] > args.budget:
+                row['status'] = 'OVER'
+            failures += row['status'] != 'ok'
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_table(rows, ['case', 'import_ms', 'reference_ms', 'overhead_ms', 'budget_ms',
+                               'modules', 'forbidden', 'status'])
+            for row in rows:
+                print(f"  {row['case']}: {row['top']}", file=sys.stderr)
+        if failures:
+            print(f"시작 임포트 예산 초과 {failures}건", file=sys.stderr)
+        return 1 if failures else 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,21 +12,62 @@ File History:
   2025.09.04 PM03:45 크로스 플랫폼 지원 - OS별 명령어 분기 처리
   2025.09.04 PM06:15 명령 중복 검증 및 파일 잠금 메커니즘 구현
   2025.09.04 PM06:30 --trust 옵션 제거 및 화이트리스트 확장 기능 추가
+  2026.10.17 PM01:00 조회 전용 작업은 mcpServers만 스트리밍 추출 (mcp_common.load_mcp_view)
+  2026.10.17 PM02:00 저장 시 mcpServers 영역만 부분 패치 (mcp_common.patch_mcp_servers)
+  2026.10.17 PM03:00 위험 패턴 검사를 사전 컴파일된 단일 정규식으로 통합
+  2026.10.17 PM04:00 중복 명령어 검사를 시그니처 인덱스로 변경 (cmd.exe /c 래퍼 정규화)
+  2026.10.17 PM05:00 비대화형 일괄 가져오기 (--on-duplicate 정책, --json-summary 출력)
+  2026.10.17 PM06:00 -c 다중 소스 지원 (여러 파일, glob, 디렉토리, stdin) - 한 번의 잠금/백업/저장
+  2026.10.17 PM07:00 백업을 내용 주소 기반 저장소로 변경 (SHA-256 중복 제거, zlib/lzma 압축)
+  2026.10.17 PM08:00 스냅샷 + 델타 백업 체인 (최대 1000개 보존), --restore-at / --list-backups 추가
+  2026.10.17 PM09:00 백업 정리/복구를 인덱스 기반으로 변경 (glob+stat 제거, 인덱스 자가 복구)
+  2026.10.17 PM10:00 폴링 잠금을 flock 기반 잠금으로 교체 (즉시 깨어남, 조회는 공유 잠금)
+  2026.10.17 PM11:00 설정 저장 시 세대 번호 증가, 조회 전용 로드는 세대 번호 기반 뷰 캐시 사용
+  2026.10.18 AM12:00 --serve 상주 모드 (Unix 소켓 JSON-RPC: list/add/remove/status/validate) 및 --query 클라이언트
+  2026.10.18 AM02:00 --probe 실행 점검 (stdio 서버 병렬 실행 + initialize/tools/list 핸드셰이크)
+  2026.10.18 AM04:00 --optimize-launch: npx/uvx 항목을 로컬 진입점 직접 실행으로 변환 제안/적용 (시작 시간 비교)
+  2026.10.18 AM06:00 --profile 단계별 소요 시간 계측 (표 / JSON / Chrome trace)
+  2026.10.18 AM07:00 구조화 작업 로그 (--log-format json, --log-file 회전 파일) 및 --metrics-file Prometheus 지표
+  2026.10.18 AM08:00 시작 시간 단축 - subprocess/socket/shutil/glob 등은 필요한 명령에서만 임포트, 미사용 hashlib 제거
+  2026.10.18 PM04:00 --probe: 객체가 아닌 서버 설정 항목은 실행하지 않고 skipped로 표시
 =====================================================================
 """
 
 import json
 import sys
 import os
-import shutil
 import argparse
+import contextlib
+import io
 import re
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-import subprocess
 import time
-import hashlib
+
+# 특정 명령에서만 쓰는 모듈(subprocess, socket/socketserver/signal, shutil, glob, importlib.util,
+# tempfile)은 해당 함수 안에서 임포트한다 (IDE가 자주 부르는 --list 등의 시작 시간 단축)
+
+from mcp_common import (
+    BACKUP_CODECS,
+    BACKUP_MAX_AGE_DAYS,
+    BACKUP_MAX_KEEP,
+    OPLOG,
+    OPLOG_FILE,
+    PROFILER,
+    BackupStore,
+    ConfigLock,
+    config_fingerprint,
+    load_mcp_view,
+    load_mcp_view_cached,
+    logged,
+    patch_mcp_servers,
+    plan_direct_launch,
+    probe_servers,
+    probe_stdio_server,
+    profiled,
+)
 
 # 색상 코드 (Windows 콘솔 호환)
 class Colors:
@@ -38,20 +79,24 @@ class Colors:
     RESET = '\033[0m'
 
 def info(msg: str) -> None:
-    """정보 메시지 출력"""
-    print(f"{Colors.CYAN}[INFO]{Colors.RESET} {msg}")
+    """정보 메시지 출력 (--log-format json이면 JSON 한 줄)"""
+    if not OPLOG.message('info', msg):
+        print(f"{Colors.CYAN}[INFO]{Colors.RESET} {msg}")
 
 def success(msg: str) -> None:
     """성공 메시지 출력"""
-    print(f"{Colors.GREEN}[SUCCESS]{Colors.RESET} {msg}")
+    if not OPLOG.message('success', msg):
+        print(f"{Colors.GREEN}[SUCCESS]{Colors.RESET} {msg}")
 
 def warn(msg: str) -> None:
     """경고 메시지 출력"""
-    print(f"{Colors.YELLOW}[WARN]{Colors.RESET} {msg}")
+    if not OPLOG.message('warn', msg):
+        print(f"{Colors.YELLOW}[WARN]{Colors.RESET} {msg}")
 
 def error(msg: str) -> None:
     """에러 메시지 출력"""
-    print(f"{Colors.RED}[ERROR]{Colors.RESET} {msg}")
+    if not OPLOG.message('error', msg):
+        print(f"{Colors.RED}[ERROR]{Colors.RESET} {msg}")
 
 class SecurityValidator:
     """MCP 서버 설정 보안 검증 클래스"""
@@ -110,6 +155,13 @@ class SecurityValidator:
         r'WebClient'
     ]
     
+    # 사전 컴파일된 위험 패턴 (모든 패턴을 하나로 합쳐 한 번에 검사)
+    _DANGEROUS_RE = re.compile('|'.join(f'(?:{p})' for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+    _DANGEROUS_COMPILED = [(p, re.compile(p, re.IGNORECASE)) for p in DANGEROUS_PATTERNS]
+    
+    # 환경 변수 값의 위험 문자
+    _ENV_DANGEROUS_RE = re.compile(r'[$`";|&<>]')
+    
     @classmethod
     def add_custom_packages(cls, packages: List[str]) -> None:
         """사용자 정의 패키지를 화이트리스트에 추가"""
@@ -181,11 +233,12 @@ class SecurityValidator:
         
         args_str = ' '.join(str(arg) for arg in args)
         
-        # 위험한 패턴 검사
-        for pattern in cls.DANGEROUS_PATTERNS:
-            if re.search(pattern, args_str, re.IGNORECASE):
-                warn(f"위험한 패턴 감지: {pattern}")
-                return False
+        # 위험한 패턴 검사 (통합 정규식 한 번으로 판정, 감지 시에만 목록 순서대로 해당 패턴 확인)
+        if cls._DANGEROUS_RE.search(args_str):
+            for pattern, compiled in cls._DANGEROUS_COMPILED:
+                if compiled.search(args_str):
+                    warn(f"위험한 패턴 감지: {pattern}")
+                    return False
         
         # npx 명령인 경우 패키지 화이트리스트 확인
         if command and Path(command).name.lower() in ['npx', 'npx.cmd', 'npx.exe']:
@@ -219,13 +272,14 @@ class SecurityValidator:
                 return False
             
             # 위험한 문자 검사
-            if re.search(r'[$`";|&<>]', str(value)):
+            if cls._ENV_DANGEROUS_RE.search(str(value)):
                 warn(f"환경 변수에 위험한 문자 포함: {key}")
                 return False
         
         return True
     
     @classmethod
+    @profiled('validate.server_config')
     def validate_server_config(cls, name: str, config: Dict[str, Any]) -> bool:
         """MCP 서버 설정의 보안 검증"""
         # 필수 필드 확인
@@ -260,89 +314,98 @@ class SecurityValidator:
 class MCPInstaller:
     """Claude Code CLI MCP 서버 설치 관리 클래스"""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, on_duplicate: Optional[str] = None,
+                 backup_compression: str = 'zlib'):
         """
         초기화
         
         Args:
             dry_run: True면 실제 파일 수정 없이 미리보기만
+            on_duplicate: 중복 처리 정책 (None이면 대화형, 'skip'/'replace'/'rename'/'fail')
+            backup_compression: 백업 압축 방식 ('zlib', 'lzma', 'none')
         """
         self.dry_run = dry_run
+        self.on_duplicate = on_duplicate
+        self.import_summary = {
+            'added': [], 'skipped': [], 'failed': [], 'duplicates': [],
+            'replaced': [], 'renamed': {}, 'aborted': False, 'failed_sources': []
+        }
+        self.probe_results = None
+        self.launch_results = None
         self.home_dir = Path.home()
         self.claude_json_path = self.home_dir / ".claude.json"
         self.backup_dir = self.home_dir / ".claude-backups"
+        self.backup_store = BackupStore(self.backup_dir, compression=backup_compression)
         self.lock_file = self.home_dir / ".claude.lock"
+        self.config_lock = ConfigLock(self.lock_file)
         self.data = None
+        self.read_only = False
         self.lock_acquired = False
+        self._signature_index = None  # 정규화된 명령어 시그니처 -> 서버 이름
     
-    def acquire_lock(self, timeout: int = 10) -> bool:
-        """파일 잠금 획득 (간단한 파일 기반 잠금)"""
+    @logged('lock.acquire')
+    def acquire_lock(self, timeout: int = 10, shared: bool = False) -> bool:
+        """
+        파일 잠금 획득 (커널 advisory lock - mcp_common.ConfigLock)
+        
+        Args:
+            timeout: 최대 대기 시간(초). 보유자가 해제하면 즉시 획득
+            shared: True면 공유(읽기) 잠금 - 조회 작업끼리는 동시에 실행 가능
+        """
         if self.dry_run:
             return True
-            
-        start_time = time.time()
-        process_id = os.getpid()
-        lock_content = f"{process_id}:{time.time()}"
         
-        while time.time() - start_time < timeout:
-            try:
-                # 잠금 파일이 없으면 생성
-                if not self.lock_file.exists():
-                    with open(self.lock_file, 'x') as f:
-                        f.write(lock_content)
-                    self.lock_acquired = True
-                    return True
-                
-                # 잠금 파일이 있으면 확인
-                try:
-                    with open(self.lock_file, 'r') as f:
-                        existing = f.read()
-                    
-                    # 오래된 잠금 파일 확인 (30초 이상)
-                    if ':' in existing:
-                        pid_str, timestamp_str = existing.split(':', 1)
-                        if time.time() - float(timestamp_str) > 30:
-                            # 오래된 잠금 제거
-                            self.lock_file.unlink()
-                            continue
-                except (ValueError, OSError):
-                    pass
-                
-                # 짧은 대기 후 재시도
-                time.sleep(0.5)
-                
-            except FileExistsError:
-                # 다른 프로세스가 이미 잠금을 획득함
-                time.sleep(0.5)
-            except Exception:
-                time.sleep(0.5)
+        try:
+            self.lock_acquired = self.config_lock.acquire(shared=shared, timeout=timeout)
+        except OSError as e:
+            error(f"잠금 파일을 열 수 없습니다: {e}")
+            return False
         
-        error("다른 프로세스가 실행 중입니다. 잠시 후 다시 시도하세요.")
-        return False
+        if not self.lock_acquired:
+            error("다른 프로세스가 실행 중입니다. 잠시 후 다시 시도하세요.")
+        return self.lock_acquired
     
     def release_lock(self) -> None:
         """파일 잠금 해제"""
-        if self.lock_acquired and self.lock_file.exists():
+        if self.lock_acquired:
+            self.config_lock.release()
+            self.lock_acquired = False
+    
+    def _mark_changed(self) -> None:
+        """설정 파일을 쓴 뒤 세대 번호 증가 (다른 프로세스의 조회 캐시 무효화)"""
+        if self.config_lock.locked and not self.config_lock.shared:
             try:
-                self.lock_file.unlink()
-                self.lock_acquired = False
-            except Exception:
-                pass  # 잠금 해제 실패는 무시
+                self.config_lock.bump_generation()
+            except OSError as e:
+                warn(f"설정 세대 번호 갱신 실패 (무시됨): {e}")
     
     def __del__(self):
         """소멸자에서 잠금 해제"""
         self.release_lock()
         
-    def load_config(self) -> bool:
-        """Claude 설정 파일 로드"""
+    @profiled('config.load')
+    @logged('config.load', size=lambda result, self, *args: self.claude_json_path.stat().st_size)
+    def load_config(self, read_only: bool = False) -> bool:
+        """
+        Claude 설정 파일 로드
+        
+        Args:
+            read_only: True면 mcpServers와 프로젝트별 mcpServers만 스트리밍 추출
+                       (대용량 설정 파일에서 빠름, save_config 불가)
+        """
+        self.read_only = read_only
+        self._signature_index = None
         if not self.claude_json_path.exists():
             info("Claude 설정 파일이 없습니다. 새로 생성합니다.")
             self.data = {"mcpServers": {}}
             return True
             
         try:
-            with open(self.claude_json_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            if read_only:
+                self.data = load_mcp_view_cached(self.claude_json_path, self.config_lock.read_generation())
+            else:
+                with open(self.claude_json_path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
             info(f"설정 파일 로드 완료: {self.claude_json_path}")
             
             # mcpServers가 없으면 생성
@@ -357,43 +420,52 @@ class MCPInstaller:
             error(f"파일 읽기 오류: {e}")
             return False
     
-    def create_backup(self) -> Optional[Path]:
-        """백업 파일 생성 (예외 처리 포함)"""
+    @profiled('backup.create')
+    @logged('backup.create', size=lambda record, *args: record.get('stored'))
+    def create_backup(self) -> Optional[Dict[str, Any]]:
+        """
+        백업 생성 (내용 주소 기반 저장소, 예외 처리 포함)
+        
+        Returns:
+            백업 기록 {'name', 'sha256', 'size', ...} 또는 실패 시 None
+        """
         if not self.claude_json_path.exists():
             return None
-            
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"claude_{timestamp}.json"
         
         if self.dry_run:
-            info(f"(DryRun) 백업 생성 예정: {backup_path.name}")
-            return backup_path
+            name = f"claude_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            info(f"(DryRun) 백업 생성 예정: {name}")
+            return {'name': name}
             
         try:
             # 백업 디렉토리 생성
             if not self.backup_dir.exists():
                 self.backup_dir.mkdir(parents=True, exist_ok=True)
             
-            # 오래된 백업 파일 정리 (최대 10개 유지)
-            self._cleanup_old_backups(max_keep=10)
+            # 오래된 백업 정리 (델타 체인은 최대 BACKUP_MAX_KEEP개 유지)
+            self._cleanup_old_backups()
             
             # 디스크 공간 체크 (최소 10MB)
+            import shutil
             stat = shutil.disk_usage(self.backup_dir)
             if stat.free < 10 * 1024 * 1024:
                 warn("디스크 공간 부족 - 백업을 건너뜁니다")
                 return None
             
-            # 백업 파일 생성
-            shutil.copy2(self.claude_json_path, backup_path)
+            # 백업 생성 (같은 내용이 이미 저장되어 있으면 재사용)
+            record = self.backup_store.save(self.claude_json_path)
             
-            # 백업 파일 검증
-            if backup_path.exists() and backup_path.stat().st_size > 0:
-                info(f"백업 생성 완료: {backup_path.name}")
-                return backup_path
+            # 백업 검증
+            if record['size'] > 0:
+                if record['deduplicated']:
+                    info(f"백업 생성 완료: {record['name']} (변경 없음 - 기존 데이터 재사용)")
+                elif record['kind'] == 'delta':
+                    info(f"백업 생성 완료: {record['name']} (델타 {record['patch_size']:,} → {record['stored']:,} bytes)")
+                else:
+                    info(f"백업 생성 완료: {record['name']} ({record['size']:,} → {record['stored']:,} bytes)")
+                return record
             else:
                 warn("백업 파일 생성 실패 - 크기가 0입니다")
-                if backup_path.exists():
-                    backup_path.unlink()
                 return None
                 
         except PermissionError as e:
@@ -406,41 +478,27 @@ class MCPInstaller:
             warn(f"백업 생성 실패: {e}")
             return None
     
-    def _cleanup_old_backups(self, max_keep: int = 10, max_age_days: int = 30):
-        """오래된 백업 파일 정리"""
+    def _cleanup_old_backups(self):
+        """
+        오래된 백업 정리 (BACKUP_MAX_KEEP개 / BACKUP_MAX_AGE_DAYS일까지 유지)
+        
+        백업 인덱스(manifest)만 읽으므로 백업 개수와 무관하게 디렉토리를 나열하거나
+        파일마다 stat하지 않는다. 이전 방식의 claude_*.json 복사본은 인덱스 재구성 시
+        저장소로 옮겨진다.
+        """
         if not self.backup_dir.exists():
             return
         
         try:
-            # 백업 파일 목록 가져오기
-            backup_files = list(self.backup_dir.glob("claude_*.json"))
-            
-            # 날짜별 정렬 (최신 파일 먼저)
-            backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # 1. 개수 제한 적용 (최대 max_keep개)
-            if len(backup_files) > max_keep:
-                for old_backup in backup_files[max_keep:]:
-                    try:
-                        old_backup.unlink()
-                        info(f"오래된 백업 삭제: {old_backup.name}")
-                    except Exception:
-                        pass  # 삭제 실패 시 무시
-            
-            # 2. 날짜 제한 적용 (max_age_days일 이상)
-            cutoff_time = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
-            for backup in backup_files[:max_keep]:  # 개수 제한 내에서만
-                try:
-                    if backup.stat().st_mtime < cutoff_time:
-                        backup.unlink()
-                        info(f"만료된 백업 삭제: {backup.name}")
-                except Exception:
-                    pass  # 삭제 실패 시 무시
-                    
+            removed = self.backup_store.cleanup(max_keep=BACKUP_MAX_KEEP, max_age_days=BACKUP_MAX_AGE_DAYS)
+            if removed:
+                info(f"오래된 백업 {len(removed)}개 삭제 ({removed[0]['name']} ~ {removed[-1]['name']})")
         except Exception as e:
             # 백업 정리 실패는 경고만 (치명적이지 않음)
             warn(f"백업 정리 중 오류 (무시됨): {e}")
     
+    @profiled('config.save')
+    @logged('config.save', size=lambda result, self: self.claude_json_path.stat().st_size)
     def save_config(self) -> bool:
         """설정 파일 저장 (원자적 쓰기)"""
         if self.dry_run:
@@ -448,11 +506,23 @@ class MCPInstaller:
             print(json.dumps(self.data.get('mcpServers', {}), indent=2))
             return True
         
+        if self.read_only:
+            # 부분 문서로 저장하면 나머지 설정이 모두 사라지므로 차단
+            error("읽기 전용으로 로드된 설정은 저장할 수 없습니다")
+            return False
+        
         import tempfile
         temp_fd = None
         temp_path = None
         
         try:
+            # 기존 파일은 mcpServers 영역만 교체 (나머지는 재직렬화 없이 그대로 복사)
+            # mcpServers 키가 파일에 없으면 아래의 전체 저장으로 진행
+            if self.claude_json_path.exists() and patch_mcp_servers(self.claude_json_path, self.data['mcpServers']):
+                self._mark_changed()
+                success(f"설정 저장 완료: {self.claude_json_path}")
+                return True
+            
             # 1단계: 임시 파일에 쓰기
             temp_fd, temp_path = tempfile.mkstemp(
                 dir=self.claude_json_path.parent,
@@ -468,7 +538,8 @@ class MCPInstaller:
             with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
                 f.write(json_str)
                 f.flush()
-                os.fsync(f.fileno())  # 디스크에 강제 쓰기
+                with PROFILER.span('fsync'):
+                    os.fsync(f.fileno())  # 디스크에 강제 쓰기
             temp_fd = None  # fdopen이 닫았으므로 None으로 설정
             
             # 2단계: 임시 파일 검증
@@ -492,6 +563,7 @@ class MCPInstaller:
                 # Unix: 원자적 이동
                 temp_path_obj.replace(self.claude_json_path)
             
+            self._mark_changed()
             success(f"설정 저장 완료: {self.claude_json_path}")
             return True
             
@@ -520,16 +592,25 @@ class MCPInstaller:
                     pass  # 삭제 실패 시 무시 (임시 파일이므로)
     
     def _attempt_recovery(self) -> bool:
-        """백업에서 복구 시도"""
+        """백업에서 복구 시도 (백업 인덱스의 최신 기록)"""
         if not self.backup_dir.exists():
             return False
         
         try:
-            backups = sorted(self.backup_dir.glob("claude_*.json"), reverse=True)
-            if backups:
-                latest_backup = backups[0]
-                warn(f"최신 백업에서 복구 시도: {latest_backup.name}")
-                shutil.copy2(latest_backup, self.claude_json_path)
+            record = self.backup_store.latest()
+            if record:
+                warn(f"최신 백업에서 복구 시도: {record['name']}")
+                try:
+                    self.backup_store.restore(record, self.claude_json_path)
+                except (OSError, ValueError) as e:
+                    # 인덱스와 저장 내용이 어긋난 경우: 인덱스 재구성 후 남은 최신 기록으로 재시도
+                    warn(f"백업 데이터 오류 ({e}) - 백업 인덱스 재구성 후 재시도")
+                    records = self.backup_store.rebuild()
+                    if not records:
+                        return False
+                    warn(f"최신 백업에서 복구 시도: {records[-1]['name']}")
+                    self.backup_store.restore(records[-1], self.claude_json_path)
+                self._mark_changed()
                 info("백업에서 복구 성공")
                 return True
         except Exception as e:
@@ -537,6 +618,66 @@ class MCPInstaller:
         
         return False
     
+    def list_backups(self):
+        """백업 기록 목록 출력 (오래된 것부터)"""
+        records = self.backup_store.entries()
+        if not records:
+            info("저장된 백업이 없습니다.")
+            return
+        
+        print(f"\n{Colors.CYAN}=== 백업 기록 ({len(records)}개) ==={Colors.RESET}")
+        total = 0
+        for record in records:
+            stamp = datetime.fromtimestamp(record.get('time', 0)).strftime('%Y-%m-%d %H:%M:%S')
+            kind = record.get('kind', 'full')
+            total += record.get('stored', 0)
+            print(f"  {stamp}  {record['name']}  {kind:<5}  {record['size']:>12,} → {record.get('stored', 0):>10,} bytes")
+        print(f"  저장 용량 합계(중복 포함): {total:,} bytes")
+    
+    @logged('backup.restore')
+    def restore_at(self, when: str, force: bool = False) -> bool:
+        """
+        특정 시점의 설정으로 복원
+        
+        Args:
+            when: 백업 이름(claude_...) 또는 시각 (ISO 형식 / Unix timestamp).
+                  시각이면 그 시각 이전의 가장 최근 백업으로 복원
+            force: 현재 설정 백업에 실패해도 복원 진행
+        """
+        record = self.backup_store.find(when) if when.startswith('claude_') else None
+        if record is None:
+            timestamp = parse_restore_time(when)
+            if timestamp is None:
+                error(f"시각 형식을 해석할 수 없습니다: {when} (예: '2026-10-17 14:30', 1760680000, claude_20261017_143000_000)")
+                return False
+            record = self.backup_store.at(timestamp)
+            if record is None:
+                error(f"{datetime.fromtimestamp(timestamp)} 이전의 백업이 없습니다")
+                return False
+        
+        stamp = datetime.fromtimestamp(record.get('time', 0)).strftime('%Y-%m-%d %H:%M:%S')
+        info(f"복원 대상 백업: {record['name']} ({stamp}, {record.get('kind', 'full')})")
+        
+        if self.dry_run:
+            info(f"(DryRun) {self.claude_json_path}을(를) 위 백업으로 복원할 예정")
+            return True
+        
+        # 복원도 되돌릴 수 있도록 현재 상태를 먼저 백업
+        if self.claude_json_path.exists() and not self.create_backup() and not force:
+            error("현재 설정 백업 실패 - --force로 강제 복원할 수 있습니다")
+            return False
+        
+        try:
+            self.backup_store.restore(record, self.claude_json_path)
+        except Exception as e:
+            error(f"백업 복원 실패: {e}")
+            return False
+        self._mark_changed()
+        
+        success(f"{record['name']} 시점으로 복원 완료")
+        info("Claude Code를 재시작하면 변경사항이 적용됩니다.")
+        return True
+    
     def add_mcp_installer(self) -> bool:
         """mcp-installer 추가 (크로스 플랫폼 지원)"""
         if 'mcp-installer' in self.data['mcpServers']:
@@ -572,90 +713,239 @@ class MCPInstaller:
             return False
         
         self.data['mcpServers']['mcp-installer'] = config
+        self._index_server('mcp-installer', config)
         success(f"mcp-installer 추가 완료 (플랫폼: {sys.platform})")
         return True
     
-    def find_duplicate_command(self, new_config: Dict[str, Any]) -> Optional[str]:
-        """중복된 명령어 설정을 찾아 반환"""
-        new_cmd = new_config.get('command', '')
-        new_args = new_config.get('args', [])
+    @staticmethod
+    def command_signature(config: Dict[str, Any]) -> tuple:
+        """
+        중복 검사용 명령어 시그니처 생성
+        
+        명령어는 파일명만 소문자로 비교하고 .exe/.cmd/.bat 확장자를 무시하며,
+        Windows의 'cmd.exe /c' 래퍼는 벗겨내므로 'cmd.exe /c npx -y pkg'와
+        'npx -y pkg'는 같은 시그니처가 된다.
+        """
+        parts = [str(config.get('command', ''))] + [str(arg) for arg in config.get('args', []) or []]
         
-        # 명령어와 인자를 정규화하여 비교
-        new_signature = f"{new_cmd}:{':'.join(str(arg) for arg in new_args)}"
+        def _base(cmd: str) -> str:
+            name = Path(cmd).name.lower() if cmd else ''
+            for ext in ('.exe', '.cmd', '.bat'):
+                if name.endswith(ext):
+                    return name[:-len(ext)]
+            return name
         
-        for existing_name, existing_config in self.data['mcpServers'].items():
-            existing_cmd = existing_config.get('command', '')
-            existing_args = existing_config.get('args', [])
-            existing_signature = f"{existing_cmd}:{':'.join(str(arg) for arg in existing_args)}"
-            
-            if new_signature == existing_signature:
-                return existing_name
+        # cmd /c <명령> ... 래퍼 제거
+        if _base(parts[0]) == 'cmd' and len(parts) > 2 and parts[1].lower() == '/c':
+            parts = parts[2:]
         
-        return None
+        return (_base(parts[0]),) + tuple(parts[1:])
+    
+    def _build_signature_index(self) -> Dict[tuple, str]:
+        """현재 mcpServers로 시그니처 인덱스 생성 (인스턴스당 한 번, 이후 추가/제거 시 갱신)"""
+        index = {}
+        for existing_name, existing_config in self.data['mcpServers'].items():
+            if isinstance(existing_config, dict):
+                # 같은 시그니처가 여러 개면 먼저 등록된 서버 이름 유지
+                index.setdefault(self.command_signature(existing_config), existing_name)
+        self._signature_index = index
+        return index
+    
+    def _index_server(self, name: str, config: Dict[str, Any]) -> None:
+        """추가된 서버를 시그니처 인덱스에 반영"""
+        if self._signature_index is not None and isinstance(config, dict):
+            self._signature_index.setdefault(self.command_signature(config), name)
+    
+    def _unindex_server(self, name: str, config: Dict[str, Any]) -> None:
+        """제거된 서버를 시그니처 인덱스에서 삭제 (같은 시그니처의 다른 서버가 있으면 그 이름으로 대체)"""
+        if self._signature_index is None or not isinstance(config, dict):
+            return
+        signature = self.command_signature(config)
+        if self._signature_index.get(signature) != name:
+            return
+        del self._signature_index[signature]
+        for other_name, other_config in self.data['mcpServers'].items():
+            if isinstance(other_config, dict) and self.command_signature(other_config) == signature:
+                self._signature_index[signature] = other_name
+                break
+    
+    def find_duplicate_command(self, new_config: Dict[str, Any]) -> Optional[str]:
+        """중복된 명령어 설정을 찾아 반환"""
+        index = self._signature_index
+        if index is None:
+            index = self._build_signature_index()
+        return index.get(self.command_signature(new_config))
+    
+    def _unique_name(self, name: str) -> str:
+        """이름 충돌 시 사용할 새 이름 생성 (name-2, name-3, ...)"""
+        n = 2
+        while f"{name}-{n}" in self.data['mcpServers']:
+            n += 1
+        return f"{name}-{n}"
     
     def add_server(self, config_file: Path) -> bool:
         """외부 설정 파일에서 MCP 서버 추가"""
+        return self.add_servers_from_sources([config_file])
+    
+    def _read_source(self, source) -> Optional[Dict[str, Any]]:
+        """설정 소스(파일 경로 또는 '-' = stdin) 하나를 읽어 서버 목록 반환 (실패 시 None)"""
+        label = '<stdin>' if source == '-' else str(source)
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
-                
-            # mcpServers 필드가 있는지 확인
-            servers = import_data.get('mcpServers', import_data)
+            if source == '-':
+                import_data = json.load(sys.stdin)
+            else:
+                with open(source, 'r', encoding='utf-8') as f:
+                    import_data = json.load(f)
+        except json.JSONDecodeError as e:
+            error(f"JSON 파싱 오류 ({label}): {e}")
+            return None
+        except Exception as e:
+            error(f"설정 파일 처리 오류 ({label}): {e}")
+            return None
+        
+        # mcpServers 필드가 있는지 확인
+        servers = import_data.get('mcpServers', import_data) if isinstance(import_data, dict) else None
+        if not isinstance(servers, dict):
+            error(f"설정 파일의 mcpServers가 올바른 형식이 아닙니다: {label}")
+            return None
+        return servers
+    
+    def _iter_source_servers(self, sources: List[Any]):
+        """여러 설정 소스의 서버를 순서대로 하나씩 반환 (소스는 필요할 때 하나씩 읽음)"""
+        for source in sources:
+            servers = self._read_source(source)
+            if servers is None:
+                self.import_summary['failed_sources'].append('-' if source == '-' else str(source))
+                continue
+            yield from servers.items()
+    
+    def add_servers_from_sources(self, sources: List[Any]) -> bool:
+        """
+        여러 설정 소스(파일 경로, '-' = stdin)의 서버를 한 번에 병합
+        
+        모든 소스를 하나의 순서 있는 흐름으로 처리하므로 잠금, 로드, 백업, 저장은
+        호출자 쪽에서 한 번만 일어난다. 소스끼리 같은 이름이 있으면 on_duplicate
+        정책의 이름 충돌로 처리된다.
+        """
+        return self.import_servers(self._iter_source_servers(sources))
+    
+    def import_servers(self, servers) -> bool:
+        """
+        서버 설정 목록(딕셔너리 또는 (이름, 설정) 쌍의 반복자)을 mcpServers에 병합 (on_duplicate 정책 적용)
+        
+        정책 (self.on_duplicate):
+            None: 이름 충돌은 건너뛰고, 명령어 중복은 사용자에게 확인
+            'skip': 이름 충돌/명령어 중복 모두 건너뜀
+            'replace': 같은 이름은 덮어쓰고, 명령어 중복이면 기존 서버를 새 서버로 교체
+            'rename': 같은 이름은 name-2 형식으로 추가하고, 명령어 중복도 그대로 추가
+            'fail': 충돌이 하나라도 있으면 이번 병합 전체를 취소
+        
+        결과는 self.import_summary에 누적된다.
+        """
+        policy = self.on_duplicate
+        summary = self.import_summary
+        snapshot = dict(self.data['mcpServers'])
+        
+        added = []
+        skipped = []
+        failed = []
+        duplicates = []
+        
+        items = servers.items() if isinstance(servers, dict) else servers
+        for name, config in items:
+            target_name = name
+            if name in self.data['mcpServers']:
+                if policy == 'fail':
+                    error(f"'{name}' 서버가 이미 존재합니다 (--on-duplicate fail)")
+                    return self._abort_import(snapshot, name)
+                if policy not in ('replace', 'rename'):
+                    skipped.append(name)
+                    continue
             
-            if not isinstance(servers, dict):
-                error("설정 파일의 mcpServers가 올바른 형식이 아닙니다")
-                return False
+            # 보안 검증 (항상 수행)
+            if not SecurityValidator.validate_server_config(name, config):
+                failed.append(name)
+                error(f"'{name}' 서버가 보안 검증을 통과하지 못했습니다")
+                continue
             
-            added = []
-            skipped = []
-            failed = []
-            duplicates = []
+            if name in self.data['mcpServers']:
+                if policy == 'replace':
+                    self._unindex_server(name, self.data['mcpServers'].pop(name))
+                    summary['replaced'].append(name)
+                else:
+                    target_name = self._unique_name(name)
+                    summary['renamed'][name] = target_name
+                    info(f"'{name}' 서버를 '{target_name}' 이름으로 추가합니다")
             
-            for name, config in servers.items():
-                if name in self.data['mcpServers']:
+            # 중복 명령어 검사
+            duplicate = self.find_duplicate_command(config)
+            if duplicate:
+                warn(f"'{name}' 서버가 '{duplicate}'와 동일한 명령어를 사용합니다")
+                duplicates.append(f"{name} (= {duplicate})")
+                record = {'name': name, 'existing': duplicate}
+                summary['duplicates'].append(record)
+                if policy == 'fail':
+                    error("명령어 중복으로 병합을 취소합니다 (--on-duplicate fail)")
+                    return self._abort_import(snapshot, name)
+                if policy == 'skip':
+                    record['action'] = 'skipped'
                     skipped.append(name)
                     continue
-                
-                # 보안 검증 (항상 수행)
-                if not SecurityValidator.validate_server_config(name, config):
-                    failed.append(name)
-                    error(f"'{name}' 서버가 보안 검증을 통과하지 못했습니다")
-                    continue
-                
-                # 중복 명령어 검사
-                duplicate = self.find_duplicate_command(config)
-                if duplicate:
-                    warn(f"'{name}' 서버가 '{duplicate}'와 동일한 명령어를 사용합니다")
-                    duplicates.append(f"{name} (= {duplicate})")
+                if policy == 'replace':
+                    self._unindex_server(duplicate, self.data['mcpServers'].pop(duplicate))
+                    if duplicate in added:
+                        added.remove(duplicate)  # 이번 병합에서 추가된 서버를 다시 교체한 경우
+                    else:
+                        summary['replaced'].append(duplicate)
+                    record['action'] = 'replaced'
+                elif policy == 'rename':
+                    record['action'] = 'added'
+                else:
                     # 사용자에게 확인 요청
                     try:
                         response = input(f"  계속 추가하시겠습니까? (y/n): ")
                         if response.lower() != 'y':
+                            record['action'] = 'skipped'
+                            skipped.append(name)
                             continue
                     except (KeyboardInterrupt, EOFError):
+                        record['action'] = 'skipped'
+                        skipped.append(name)
                         continue
-                
-                self.data['mcpServers'][name] = config
-                added.append(name)
+                    record['action'] = 'added'
             
-            if added:
-                success(f"추가된 서버: {', '.join(added)}")
-            if skipped:
-                warn(f"이미 존재하는 서버 (건너뜀): {', '.join(skipped)}")
-            if duplicates:
-                warn(f"중복 명령어 감지: {', '.join(duplicates)}")
-            if failed:
-                error(f"보안 검증 실패 (추가 안됨): {', '.join(failed)}")
-                
-            return len(added) > 0 or len(skipped) > 0
+            self.data['mcpServers'][target_name] = config
+            self._index_server(target_name, config)
+            added.append(target_name)
+        
+        summary['added'].extend(added)
+        summary['skipped'].extend(skipped)
+        summary['failed'].extend(failed)
+        for outcome, names in (('added', added), ('skipped', skipped), ('failed', failed)):
+            for server in names:
+                OPLOG.emit('server.import', outcome, server=server)
+        
+        if added:
+            success(f"추가된 서버: {', '.join(added)}")
+        if skipped:
+            warn(f"이미 존재하거나 중복되어 건너뛴 서버: {', '.join(skipped)}")
+        if duplicates:
+            warn(f"중복 명령어 감지: {', '.join(duplicates)}")
+        if failed:
+            error(f"보안 검증 실패 (추가 안됨): {', '.join(failed)}")
             
-        except json.JSONDecodeError as e:
-            error(f"JSON 파싱 오류: {e}")
-            return False
-        except Exception as e:
-            error(f"설정 파일 처리 오류: {e}")
-            return False
+        return len(added) > 0 or len(skipped) > 0
     
+    def _abort_import(self, snapshot: Dict[str, Any], name: str) -> bool:
+        """fail 정책: 병합 전 상태로 되돌리고 실패 처리"""
+        self.data['mcpServers'].clear()
+        self.data['mcpServers'].update(snapshot)
+        self._signature_index = None
+        self.import_summary['failed'].append(name)
+        self.import_summary['aborted'] = True
+        return False
+    
+    @profiled('report.list')
     def list_servers(self) -> None:
         """등록된 MCP 서버 목록 출력"""
         servers = self.data.get('mcpServers', {})
@@ -674,14 +964,18 @@ class MCPInstaller:
         """MCP 서버 제거"""
         if name not in self.data['mcpServers']:
             error(f"'{name}' 서버를 찾을 수 없습니다.")
+            OPLOG.emit('server.remove', 'failed', server=name)
             return False
             
-        del self.data['mcpServers'][name]
+        removed = self.data['mcpServers'].pop(name)
+        self._unindex_server(name, removed)
         success(f"'{name}' 서버 제거 완료")
+        OPLOG.emit('server.remove', 'ok', server=name)
         return True
     
     def verify(self) -> bool:
         """Claude CLI 작동 확인"""
+        import subprocess
         info("Claude CLI 확인 중...")
         
         try:
@@ -708,6 +1002,497 @@ class MCPInstaller:
         except Exception as e:
             error(f"Claude CLI 확인 실패: {e}")
             return False
+    
+    def probe(self, names: Optional[List[str]] = None, jobs: int = 4,
+              timeout: float = 30.0) -> Dict[str, Dict[str, Any]]:
+        """
+        등록된 stdio 서버를 실제로 실행해 MCP 핸드셰이크 점검 (결과 표 출력)
+        
+        보안 검증을 통과한 stdio 서버만 실행하며, timeout초가 지나면 남은 서버는
+        강제 종료한다. 서버 이름 -> 점검 결과 반환 (mcp_common.probe_stdio_server 참고)
+        """
+        servers = self.data.get('mcpServers', {})
+        if names:
+            for name in names:
+                if name not in servers:
+                    error(f"'{name}' 서버를 찾을 수 없습니다.")
+            servers = {name: servers[name] for name in names if name in servers}
+        
+        results = {}
+        targets = {}
+        for name, config in servers.items():
+            if not isinstance(config, dict):
+                results[name] = {'status': 'skipped', 'error': f"설정이 객체가 아님 ({type(config).__name__})"}
+            elif config.get('type', 'stdio') != 'stdio':
+                results[name] = {'status': 'skipped', 'error': f"stdio가 아닌 타입 ({config.get('type')})"}
+            elif not SecurityValidator.validate_server_config(name, config):
+                results[name] = {'status': 'blocked', 'error': "보안 검증 실패 - 실행하지 않음"}
+            else:
+                targets[name] = config
+        
+        if targets:
+            info(f"{len(targets)}개 서버 점검 중 (동시 {jobs}개, 마감 {timeout:g}초)...")
+            results.update(probe_servers(targets, max_workers=jobs, deadline=timeout))
+        results = {name: results[name] for name in servers}  # 설정 순서 유지
+        for name, result in results.items():
+            first_response = result.get('first_response_ms')
+            OPLOG.emit('server.probe', result['status'], server=name,
+                       duration=first_response / 1000 if first_response is not None else None,
+                       tools=result.get('tools'), error=result.get('error'))
+        
+        def _ms(value):
+            return f"{value:,.0f}" if value is not None else "-"
+        
+        print(f"\n{Colors.CYAN}=== MCP 서버 실행 점검 ==={Colors.RESET}")
+        print(f"  {'서버':<20} {'상태':<8} {'spawn ms':>9} {'init ms':>9} {'tools ms':>9} {'도구':>5}")
+        for name, result in results.items():
+            color = Colors.GREEN if result['status'] == 'ok' else Colors.RED
+            print(f"  {name:<20} {color}{result['status']:<8}{Colors.RESET} "
+                  f"{_ms(result.get('spawn_ms')):>9} {_ms(result.get('initialize_ms')):>9} "
+                  f"{_ms(result.get('tools_ms')):>9} {result.get('tools') if result.get('tools') is not None else '-':>5}")
+            if result.get('error'):
+                print(f"    {result['error']}")
+            for line in result.get('stderr', []):
+                print(f"    stderr: {line}")
+        print()
+        return results
+
+    @staticmethod
+    def _measure_launch(config: Dict[str, Any], runs: int, timeout: float) -> tuple:
+        """순차 실행 runs회의 첫 응답 시간 중앙값(ms)과 마지막 오류"""
+        samples = []
+        last_error = None
+        for _ in range(runs):
+            result = probe_stdio_server(config, time.monotonic() + timeout)
+            if result['first_response_ms'] is not None:
+                samples.append(result['first_response_ms'])
+            else:
+                last_error = result['error']
+        if not samples:
+            return None, last_error
+        return sorted(samples)[len(samples) // 2], None
+    
+    def optimize_launch(self, names: Optional[List[str]] = None, apply: bool = False,
+                        runs: int = 3, timeout: float = 30.0) -> Dict[str, Dict[str, Any]]:
+        """
+        npx/uvx 항목을 로컬에 설치된 진입점 직접 실행으로 바꾸는 제안 (apply=True면 적용)
+        
+        바꾼 설정도 보안 검증을 다시 거치며, 기존/변경 설정을 각각 runs회 실행해
+        첫 응답까지의 시간(중앙값)을 비교한다. 변경 설정이 정상 응답한 항목만 적용한다.
+        """
+        servers = self.data.get('mcpServers', {})
+        if names:
+            for name in names:
+                if name not in servers:
+                    error(f"'{name}' 서버를 찾을 수 없습니다.")
+            servers = {name: servers[name] for name in names if name in servers}
+        
+        results = {}
+        for name, config in servers.items():
+            if not isinstance(config, dict) or config.get('type', 'stdio') != 'stdio':
+                continue
+            rewritten, note = plan_direct_launch(config)
+            if rewritten is None:
+                results[name] = {'status': 'skipped', 'reason': note}
+                continue
+            if not SecurityValidator.validate_server_config(name, config):
+                results[name] = {'status': 'blocked', 'reason': "기존 설정이 보안 검증 실패 - 실행하지 않음"}
+                continue
+            if not SecurityValidator.validate_server_config(name, rewritten):
+                results[name] = {'status': 'blocked', 'reason': "변경 설정이 보안 검증 실패"}
+                continue
+            
+            info(f"'{name}' 시작 시간 측정 중 ({note})...")
+            before_ms, before_error = self._measure_launch(config, runs, timeout)
+            after_ms, after_error = self._measure_launch(rewritten, runs, timeout)
+            results[name] = {
+                'status': 'ok' if after_ms is not None else 'failed',
+                'source': note, 'config': rewritten,
+                'before_ms': before_ms, 'after_ms': after_ms,
+                'reason': (f"변경 설정: {after_error}" if after_error
+                           else f"기존 설정: {before_error}" if before_error else None),
+                'applied': False,
+            }
+            if apply and after_ms is not None:
+                self._unindex_server(name, config)
+                self.data['mcpServers'][name] = rewritten
+                self._index_server(name, rewritten)
+                results[name]['applied'] = True
+            OPLOG.emit('server.optimize_launch', results[name]['status'], server=name,
+                       before_ms=before_ms, after_ms=after_ms, applied=results[name]['applied'])
+        
+        def _ms(value):
+            return f"{value:,.0f}" if value is not None else "-"
+        
+        print(f"\n{Colors.CYAN}=== 실행 최적화 (npx/uvx -> 직접 실행) ==={Colors.RESET}")
+        print(f"  {'서버':<20} {'상태':<8} {'기존 ms':>9} {'변경 ms':>9} {'단축 ms':>9}")
+        for name, result in results.items():
+            color = Colors.GREEN if result['status'] == 'ok' else Colors.GRAY if result['status'] == 'skipped' else Colors.RED
+            saved = None
+            if result.get('before_ms') is not None and result.get('after_ms') is not None:
+                saved = result['before_ms'] - result['after_ms']
+            print(f"  {name:<20} {color}{result['status']:<8}{Colors.RESET} "
+                  f"{_ms(result.get('before_ms')):>9} {_ms(result.get('after_ms')):>9} {_ms(saved):>9}")
+            if result.get('config'):
+                mark = "적용됨" if result['applied'] else "제안"
+                print(f"    {mark}: {result['config']['command']} {' '.join(result['config']['args'])}")
+            if result.get('reason'):
+                print(f"    {result['reason']}")
+        if not apply and any(result['status'] == 'ok' for result in results.values()):
+            info("제안을 적용하려면 --apply-launch를 함께 지정하세요 (직접 실행 항목은 자동 업데이트되지 않음)")
+        print()
+        return results
+
+# --serve 상주 모드 기본 소켓 경로
+DAEMON_SOCKET = Path.home() / ".claude-mcp-cache" / "daemon.sock"
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+class DaemonError(Exception):
+    """JSON-RPC 오류 응답으로 변환되는 예외"""
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+class ConfigDaemon:
+    """
+    --serve 상주 모드: 설정 뷰, SecurityValidator 상태, 온라인 정보 캐시를 메모리에 유지
+    
+    Unix 도메인 소켓에서 한 줄에 JSON-RPC 2.0 요청 하나를 받아 한 줄로 응답한다.
+    설정 뷰는 요청마다 지문(세대 번호 + 파일 stat)을 확인해 바뀐 경우에만 다시 읽고,
+    변경 요청(add/remove)은 CLI와 같은 배타 잠금 → 백업 → 저장 순서로 처리한다.
+    요청 처리는 한 번에 하나씩 직렬화된다 (출력 캡처와 설치 인스턴스 공유).
+    """
+    
+    METHODS = ('ping', 'list', 'validate', 'add', 'remove', 'status')
+    
+    def __init__(self, installer: MCPInstaller, socket_path: Path = DAEMON_SOCKET):
+        self.installer = installer
+        self.socket_path = Path(socket_path)
+        self.started = time.time()
+        self.requests = 0
+        self._dispatch_lock = threading.Lock()
+        self._view = None
+        self._fingerprint = None
+        self._status = None  # mcp-status.py 모듈 (status 첫 요청 시 로드)
+    
+    def _current_view(self) -> Dict[str, Any]:
+        """공유 잠금 아래에서 설정 지문을 확인하고 바뀐 경우에만 mcpServers 뷰 다시 읽기"""
+        path = self.installer.claude_json_path
+        lock = self.installer.config_lock
+        locked = lock.acquire(shared=True, timeout=10)
+        try:
+            try:
+                fingerprint = config_fingerprint(path, lock.read_generation())
+            except FileNotFoundError:
+                self._view, self._fingerprint = {'mcpServers': {}}, None
+                return self._view
+            if fingerprint != self._fingerprint:
+                self._view = load_mcp_view(path)
+                self._fingerprint = fingerprint
+            return self._view
+        finally:
+            if locked:
+                lock.release()
+    
+    def _modify(self, apply) -> Any:
+        """배타 잠금 → 전체 로드 → 백업 → apply() → (변경 시) 저장"""
+        installer = self.installer
+        if not installer.acquire_lock(timeout=10):
+            raise DaemonError(-32001, "다른 프로세스가 설정을 수정 중입니다")
+        try:
+            if not installer.load_config():
+                raise DaemonError(-32002, "설정 파일을 읽을 수 없습니다")
+            if installer.claude_json_path.exists() and not installer.create_backup():
+                raise DaemonError(-32003, "백업 생성 실패 - 변경하지 않았습니다")
+            result, changed = apply()
+            if changed and not installer.save_config():
+                raise DaemonError(-32004, "설정 저장 실패")
+            return result
+        finally:
+            installer.release_lock()
+            installer.data = None  # 다음 요청은 항상 새로 로드
+    
+    def rpc_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 3),
+            'requests': self.requests,
+            'generation': self.installer.config_lock.read_generation(),
+        }
+    
+    def rpc_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        view = self._current_view()
+        projects = {
+            path: config['mcpServers']
+            for path, config in (view.get('projects') or {}).items()
+            if isinstance(config, dict) and config.get('mcpServers')
+        }
+        return {'mcpServers': view.get('mcpServers', {}), 'projects': projects}
+    
+    @staticmethod
+    def _servers_param(params: Dict[str, Any]) -> Dict[str, Any]:
+        servers = params.get('servers')
+        if servers is None and 'name' in params:
+            servers = {params['name']: params.get('config')}
+        if not isinstance(servers, dict) or not all(isinstance(c, dict) for c in servers.values()):
+            raise DaemonError(-32602, "params: {'servers': {이름: 설정}} 또는 {'name', 'config'}가 필요합니다")
+        return servers
+    
+    def rpc_validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        servers = self._servers_param(params)
+        return {'valid': {name: SecurityValidator.validate_server_config(name, config)
+                          for name, config in servers.items()}}
+    
+    def rpc_add(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        servers = self._servers_param(params)
+        policy = params.get('on_duplicate', 'skip')
+        if policy not in ('skip', 'replace', 'rename', 'fail'):
+            raise DaemonError(-32602, f"지원하지 않는 on_duplicate 정책: {policy}")
+        
+        installer = self.installer
+        installer.on_duplicate = policy  # 상주 모드에서는 확인 질문 없이 정책대로 처리
+        installer.import_summary = {
+            'added': [], 'skipped': [], 'failed': [], 'duplicates': [],
+            'replaced': [], 'renamed': {}, 'aborted': False, 'failed_sources': []
+        }
+        
+        def apply():
+            installer.import_servers(servers)
+            summary = installer.import_summary
+            return summary, bool(summary['added'] or summary['replaced']) and not summary['aborted']
+        
+        return self._modify(apply)
+    
+    def rpc_remove(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get('name')
+        if not isinstance(name, str):
+            raise DaemonError(-32602, "params: {'name': 서버 이름}이 필요합니다")
+        
+        def apply():
+            if not self.installer.remove_server(name):
+                raise DaemonError(-32005, f"'{name}' 서버를 찾을 수 없습니다")
+            return {'removed': name}, True
+        
+        return self._modify(apply)
+    
+    def _status_module(self):
+        if self._status is None:
+            import importlib.util
+            path = Path(__file__).resolve().parent / 'mcp-status.py'
+            spec = importlib.util.spec_from_file_location('mcp_status', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.load_info_cache()
+            self._status = module
+        return self._status
+    
+    def rpc_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """서버별 온라인 정보 (메모리 캐시 재사용, params: offline, refresh, deadline)"""
+        status = self._status_module()
+        status.CACHE_OPTIONS['offline'] = bool(params.get('offline', False))
+        status.CACHE_OPTIONS['refresh'] = bool(params.get('refresh', False))
+        view = self._current_view()
+        online_infos = status.prefetch_mcp_online_info(
+            view, deadline=float(params.get('deadline', status.PREFETCH_DEADLINE)))
+        status.save_info_cache()
+        
+        servers = {}
+        for name, config in view.get('mcpServers', {}).items():
+            package = status.extract_package_name(config) if isinstance(config, dict) else None
+            servers[name] = {
+                'config': config,
+                'package': package,
+                'online': status.lookup_online_info(online_infos, name, package),
+            }
+        return {'servers': servers}
+    
+    def handle(self, request: Any) -> Dict[str, Any]:
+        """JSON-RPC 요청 하나 처리 (일반 메시지 출력은 result/error의 messages로 전달)"""
+        if not isinstance(request, dict):
+            return {'jsonrpc': '2.0', 'id': None,
+                    'error': {'code': -32600, 'message': "요청은 JSON 객체여야 합니다"}}
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+        if method not in self.METHODS:
+            return {'jsonrpc': '2.0', 'id': request_id,
+                    'error': {'code': -32601, 'message': f"지원하지 않는 메서드: {method}"}}
+        if not isinstance(params, dict):
+            return {'jsonrpc': '2.0', 'id': request_id,
+                    'error': {'code': -32602, 'message': "params는 객체여야 합니다"}}
+        
+        output = io.StringIO()
+        with self._dispatch_lock, contextlib.redirect_stdout(output):
+            self.requests += 1
+            try:
+                result = getattr(self, f"rpc_{method}")(params)
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+            except DaemonError as e:
+                response = {'jsonrpc': '2.0', 'id': request_id,
+                            'error': {'code': e.code, 'message': str(e)}}
+            except Exception as e:
+                response = {'jsonrpc': '2.0', 'id': request_id,
+                            'error': {'code': -32000, 'message': f"{type(e).__name__}: {e}"}}
+        
+        messages = [line for line in _ANSI_RE.sub('', output.getvalue()).splitlines() if line.strip()]
+        if messages:
+            if 'result' in response and isinstance(response['result'], dict):
+                response['result']['messages'] = messages
+            elif 'error' in response:
+                response['error']['data'] = {'messages': messages}
+        return response
+    
+    def _prepare_socket(self) -> bool:
+        """소켓 디렉토리 준비 및 남은 소켓 파일 정리 (다른 데몬이 실행 중이면 False)"""
+        import socket
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if not self.socket_path.exists():
+            return True
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+            error(f"이미 실행 중인 데몬이 있습니다: {self.socket_path}")
+            return False
+        except OSError:
+            self.socket_path.unlink()  # 비정상 종료로 남은 소켓
+            return True
+        finally:
+            probe.close()
+    
+    def serve(self) -> int:
+        """소켓을 열고 종료 신호(SIGTERM/SIGINT)까지 요청 처리"""
+        import signal
+        import socket
+        import socketserver
+        if not hasattr(socket, 'AF_UNIX'):
+            error("이 플랫폼은 Unix 도메인 소켓을 지원하지 않습니다")
+            return 1
+        if not self._prepare_socket():
+            return 1
+        
+        daemon = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            timeout = 60  # 유휴 연결 정리
+            
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        response = {'jsonrpc': '2.0', 'id': None,
+                                    'error': {'code': -32700, 'message': f"JSON 파싱 오류: {e}"}}
+                    else:
+                        response = daemon.handle(request)
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+        
+        old_umask = os.umask(0o177)  # 소켓은 소유자만 접근 (0600)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon_threads = True
+        
+        def _shutdown(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        signal.signal(signal.SIGTERM, _shutdown)
+        
+        success(f"MCP 설정 데몬 시작: {self.socket_path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+            info(f"MCP 설정 데몬 종료 (처리한 요청 {self.requests}개)")
+        return 0
+
+def query_daemon(method: str, params: Optional[Dict[str, Any]] = None,
+                 socket_path: Path = DAEMON_SOCKET, timeout: float = 30.0) -> Dict[str, Any]:
+    """
+    --serve 데몬에 JSON-RPC 요청 하나 보내고 응답 반환 (얇은 클라이언트)
+    
+    Raises:
+        OSError: 데몬에 연결할 수 없는 경우
+    """
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+        client.sendall((json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8'))
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("데몬이 응답 없이 연결을 닫았습니다")
+    return json.loads(line)
+
+def expand_config_sources(specs: List[str]) -> Optional[List[Any]]:
+    """
+    -c 인자를 순서 있는 설정 소스 목록으로 확장
+    
+    - '-': 표준 입력 (한 번만 허용)
+    - 디렉토리: 안의 *.json 파일 (이름순)
+    - glob 패턴: 일치하는 파일 (이름순)
+    - 그 외: 파일 경로
+    
+    같은 파일은 한 번만 포함한다. 찾을 수 없는 소스가 있으면 None 반환.
+    """
+    import glob
+    sources = []
+    seen = set()
+    
+    def _add(source):
+        key = source if source == '-' else str(Path(source).resolve())
+        if key not in seen:
+            seen.add(key)
+            sources.append(source)
+    
+    for spec in specs:
+        if spec == '-':
+            _add('-')
+            continue
+        path = Path(spec)
+        if path.is_dir():
+            matches = sorted(p for p in path.glob('*.json') if p.is_file())
+            if not matches:
+                warn(f"디렉토리에 JSON 파일이 없습니다: {spec}")
+            for match in matches:
+                _add(match)
+        elif glob.has_magic(spec):
+            matches = sorted(Path(m) for m in glob.glob(spec) if Path(m).is_file())
+            if not matches:
+                error(f"패턴과 일치하는 설정 파일이 없습니다: {spec}")
+                return None
+            for match in matches:
+                _add(match)
+        elif path.is_file():
+            _add(path)
+        else:
+            error(f"설정 파일을 찾을 수 없습니다: {spec}")
+            return None
+    
+    if len(sources) > 1:
+        info(f"{len(sources)}개의 설정 소스를 한 번에 병합합니다")
+    return sources
+
+def parse_restore_time(text: str) -> Optional[float]:
+    """--restore-at 시각 해석 (Unix timestamp 또는 ISO 형식 'YYYY-MM-DD[ HH:MM[:SS]]')"""
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text.strip()).timestamp()
+    except ValueError:
+        return None
 
 def main():
     """메인 실행 함수"""
@@ -718,17 +1503,32 @@ def main():
 사용 예시:
   python mcp-installer.py --add-installer              # mcp-installer 추가
   python mcp-installer.py -c config.json               # 설정 파일에서 서버 추가
+  python mcp-installer.py -c team-a.json "fragments/*.json" conf.d/ -  # 여러 소스를 한 번에 병합
   python mcp-installer.py --list                       # 서버 목록 보기
   python mcp-installer.py --remove shrimp              # 특정 서버 제거
   python mcp-installer.py --verify                     # Claude CLI 확인
   python mcp-installer.py -c config.json --dry-run     # 미리보기 모드
   python mcp-installer.py --extend-package "@mycompany/mcp-server"  # 패키지 화이트리스트 추가
   python mcp-installer.py --whitelist-file custom.json              # 외부 화이트리스트 파일 로드
+  python mcp-installer.py -c servers.json --on-duplicate skip --json-summary --force  # 무인 일괄 가져오기
+  python mcp-installer.py --list-backups               # 백업 기록 보기
+  python mcp-installer.py --restore-at "2026-10-17 14:30"  # 해당 시각 이전의 최근 백업으로 복원
+  python mcp-installer.py --probe                      # 모든 stdio 서버 실행 점검 (핸드셰이크, 도구 수, 지연 시간)
+  python mcp-installer.py --probe memory --probe-timeout 60  # 특정 서버만 점검
+  python mcp-installer.py --optimize-launch            # npx/uvx 항목의 직접 실행 변환 제안 + 시작 시간 비교
+  python mcp-installer.py --optimize-launch memory --apply-launch  # 측정 후 변환 적용 (백업 생성)
+  python mcp-installer.py -c config.json --profile     # 단계별 소요 시간 표 (잠금, 파싱, 백업, fsync, 검증)
+  python mcp-installer.py --list --profile chrome --profile-output trace.json  # chrome://tracing 용 trace
+  python mcp-installer.py -c config.json --log-format json  # 메시지/작업 이벤트를 JSON lines로 stdout에 출력
+  python mcp-installer.py --list --log-file --metrics-file /var/lib/node_exporter/textfile/mcp.prom
+  python mcp-installer.py --serve                      # 상주 모드 (Unix 소켓 JSON-RPC)
+  python mcp-installer.py --query list                 # 상주 데몬에 질의 (list/add/remove/status/validate/ping)
+  python mcp-installer.py --query remove --params '{"name": "shrimp"}'
         """
     )
     
-    parser.add_argument('-c', '--config', type=str, 
-                       help='병합할 MCP 서버 설정 JSON 파일')
+    parser.add_argument('-c', '--config', type=str, nargs='+', action='append',
+                       help='병합할 MCP 서버 설정 JSON (여러 파일, glob, 디렉토리, - = stdin)')
     parser.add_argument('--add-installer', action='store_true',
                        help='mcp-installer 추가')
     parser.add_argument('--list', action='store_true',
@@ -747,9 +1547,113 @@ def main():
                        help='특정 명령어를 화이트리스트에 추가')
     parser.add_argument('--whitelist-file', type=str,
                        help='외부 화이트리스트 JSON 파일 로드')
+    parser.add_argument('--on-duplicate', choices=['skip', 'replace', 'rename', 'fail'],
+                       help='이름/명령어 중복 시 처리 정책 (지정하면 확인 질문 없이 진행)')
+    parser.add_argument('--backup-compression', choices=sorted(BACKUP_CODECS), default='zlib',
+                       help='백업 압축 방식 (기본: zlib)')
+    parser.add_argument('--json-summary', action='store_true',
+                       help='가져오기 결과를 JSON으로 stdout에 출력 (일반 메시지는 stderr)')
+    parser.add_argument('--list-backups', action='store_true',
+                       help='백업 기록 목록 보기')
+    parser.add_argument('--restore-at', type=str, metavar='TIME',
+                       help='지정한 시각(또는 백업 이름) 시점의 설정으로 복원')
+    parser.add_argument('--probe', nargs='*', metavar='NAME',
+                       help='stdio 서버를 실제 실행해 initialize/tools/list 핸드셰이크 점검 (이름 생략 시 전체)')
+    parser.add_argument('--probe-jobs', type=int, default=4,
+                       help='--probe 동시 실행 수 (기본: 4)')
+    parser.add_argument('--probe-timeout', type=float, default=30.0,
+                       help='--probe 전체 마감시간(초), 넘으면 남은 서버 강제 종료. --optimize-launch는 실행 1회 마감시간 (기본: 30)')
+    parser.add_argument('--optimize-launch', nargs='*', metavar='NAME',
+                       help='로컬에 설치된 npx/uvx 패키지를 직접 실행하도록 바꾸는 제안과 시작 시간 비교 (이름 생략 시 전체)')
+    parser.add_argument('--apply-launch', action='store_true',
+                       help='--optimize-launch 제안 중 변경 설정이 정상 응답한 항목을 적용')
+    parser.add_argument('--launch-runs', type=int, default=3,
+                       help='--optimize-launch 설정별 측정 실행 횟수 (기본: 3)')
+    parser.add_argument('--profile', nargs='?', const='text', choices=['text', 'json', 'chrome'],
+                       help='단계별 소요 시간 계측 결과 출력 (기본 text: 표, json, chrome: trace 이벤트)')
+    parser.add_argument('--profile-output', type=str, metavar='FILE',
+                       help='--profile 결과를 저장할 파일 (기본: stderr)')
+    parser.add_argument('--log-format', choices=['text', 'json'],
+                       help='메시지 형식 (json: 메시지와 작업 이벤트를 JSON lines로 stdout에 출력, 기본: MCP_LOG_FORMAT 또는 text)')
+    parser.add_argument('--log-file', nargs='?', const=str(OPLOG_FILE), metavar='FILE',
+                       help=f'작업 이벤트를 JSON lines로 추가할 회전 로그 파일 (경로 생략 시 {OPLOG_FILE}, 환경변수 MCP_LOG_FILE)')
+    parser.add_argument('--metrics-file', type=str, metavar='FILE',
+                       help='Prometheus textfile collector용 .prom 지표 파일 (작업 수/지연 히스토그램/바이트, 환경변수 MCP_METRICS_FILE)')
+    parser.add_argument('--serve', action='store_true',
+                       help='상주 모드: 설정/검증기/온라인 정보 캐시를 유지하며 Unix 소켓으로 질의 처리')
+    parser.add_argument('--query', choices=ConfigDaemon.METHODS, metavar='METHOD',
+                       help=f"상주 데몬에 질의 ({'/'.join(ConfigDaemon.METHODS)}) - 결과 JSON을 stdout에 출력")
+    parser.add_argument('--params', type=str, default='{}',
+                       help='--query 요청 파라미터 JSON')
+    parser.add_argument('--socket', type=str, default=str(DAEMON_SOCKET),
+                       help=f'상주 모드 소켓 경로 (기본: {DAEMON_SOCKET})')
     
     args = parser.parse_args()
     
+    # 얇은 클라이언트: 설치 인스턴스 없이 데몬에 바로 질의
+    if args.query:
+        return run_query(args)
+    
+    OPLOG.configure('mcp-installer', args.log_format, args.log_file, args.metrics_file)
+    if args.profile:
+        PROFILER.enable()
+    try:
+        with OPLOG.operation('run', command=run_command_name(args)) as op:
+            exit_code = run_main(args, parser)
+            op.outcome = 'ok' if exit_code == 0 else 'failed'
+            op.fields['exit_code'] = exit_code
+        return exit_code
+    finally:
+        if args.profile:
+            PROFILER.report(args.profile, args.profile_output)
+        OPLOG.close()
+
+def run_command_name(args: argparse.Namespace) -> str:
+    """작업 로그용 명령 이름 (지정된 주요 옵션)"""
+    names = [option for option, value in (
+        ('config', args.config), ('add-installer', args.add_installer), ('remove', args.remove),
+        ('restore-at', args.restore_at), ('list', args.list), ('list-backups', args.list_backups),
+        ('probe', args.probe is not None), ('optimize-launch', args.optimize_launch is not None),
+        ('verify', args.verify), ('serve', args.serve)) if value]
+    return '+'.join(names) or 'help'
+
+def run_main(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """설치 인스턴스를 만들어 명령 실행 (--json-summary면 요약 JSON 출력)"""
+    # 인스턴스 생성
+    installer = MCPInstaller(dry_run=args.dry_run, on_duplicate=args.on_duplicate,
+                             backup_compression=args.backup_compression)
+    
+    if not args.json_summary:
+        return run(args, parser, installer)
+    
+    # JSON 요약 모드: 일반 메시지는 stderr로 보내고 stdout에는 요약 JSON 한 줄만 출력
+    with contextlib.redirect_stdout(sys.stderr):
+        exit_code = run(args, parser, installer)
+    summary = dict(installer.import_summary, exit_code=exit_code, dry_run=args.dry_run)
+    if installer.probe_results is not None:
+        summary['probe'] = installer.probe_results
+    if installer.launch_results is not None:
+        summary['optimize_launch'] = installer.launch_results
+    print(json.dumps(summary, ensure_ascii=False))
+    return exit_code
+
+def run_query(args: argparse.Namespace) -> int:
+    """--query: 데몬 응답 JSON을 stdout에 출력 (오류 응답이면 종료 코드 1)"""
+    try:
+        params = json.loads(args.params)
+    except json.JSONDecodeError as e:
+        error(f"--params JSON 파싱 오류: {e}")
+        return 1
+    try:
+        response = query_daemon(args.query, params, Path(args.socket))
+    except (OSError, ValueError) as e:
+        error(f"데몬에 연결할 수 없습니다 ({args.socket}): {e} - 'python mcp-installer.py --serve'로 먼저 실행하세요")
+        return 1
+    print(json.dumps(response.get('result', response.get('error')), indent=2, ensure_ascii=False))
+    return 1 if 'error' in response else 0
+
+def run(args: argparse.Namespace, parser: argparse.ArgumentParser, installer: MCPInstaller) -> int:
+    """명령 실행 (종료 코드 반환)"""
     # Windows 콘솔에서 ANSI 색상 지원 활성화
     if sys.platform == 'win32':
         os.system('color')
@@ -771,18 +1675,45 @@ def main():
         if not SecurityValidator.load_whitelist_file(whitelist_path):
             return 1
     
-    # 인스턴스 생성
-    installer = MCPInstaller(dry_run=args.dry_run)
+    if args.apply_launch and args.optimize_launch is None:
+        error("--apply-launch는 --optimize-launch와 함께 사용해야 합니다")
+        return 1
+    
+    if args.restore_at and (args.add_installer or args.config or args.remove or args.apply_launch):
+        error("--restore-at은 다른 변경 작업과 함께 사용할 수 없습니다")
+        return 1
+    
+    # 상주 모드 (화이트리스트 확장을 반영한 검증기 상태를 그대로 유지)
+    if args.serve:
+        return ConfigDaemon(installer, Path(args.socket)).serve()
+    
+    # 설정 소스 확인 (파일, glob, 디렉토리, '-' = stdin)
+    config_sources = []
+    if args.config:
+        config_sources = expand_config_sources([spec for group in args.config for spec in group])
+        if config_sources is None:
+            return 1
     
     # 파일 잠금 획득 (변경이 필요한 작업일 때만)
-    needs_lock = (args.add_installer or args.config or args.remove) and not args.dry_run
-    if needs_lock:
-        if not installer.acquire_lock(timeout=10):
+    needs_lock = (args.add_installer or args.config or args.remove or args.restore_at
+                  or args.apply_launch) and not args.dry_run
+    # 조회 작업은 공유 잠금 (쓰기 도중의 설정/백업 인덱스를 읽지 않도록, 조회끼리는 동시 실행)
+    needs_shared_lock = not needs_lock and (args.list or args.list_backups or args.probe is not None
+                                            or args.optimize_launch is not None)
+    if needs_lock or needs_shared_lock:
+        if not installer.acquire_lock(timeout=10, shared=needs_shared_lock):
             return 1
     
     try:
-        # 설정 파일 로드
-        if not installer.load_config():
+        if args.list_backups:
+            installer.list_backups()
+        
+        # 시점 복원 (현재 설정 파일이 손상되어 있어도 동작하도록 로드 전에 처리)
+        if args.restore_at:
+            return 0 if installer.restore_at(args.restore_at, force=args.force) else 1
+        
+        # 설정 파일 로드 (실제 쓰기가 없는 작업은 mcpServers만 추출)
+        if not installer.load_config(read_only=not needs_lock):
             return 1
         
         # 명령 처리
@@ -792,13 +1723,14 @@ def main():
         needs_backup = (
             args.add_installer or 
             args.config or 
-            args.remove
+            args.remove or
+            args.apply_launch
         ) and not args.dry_run and installer.claude_json_path.exists()
         
         # 백업 생성 (실제 변경이 필요한 경우에만)
         if needs_backup and modified is False:  # 변경 전에 백업
-            backup_path = installer.create_backup()
-            if not backup_path:
+            backup = installer.create_backup()
+            if not backup:
                 warn("백업 생성 실패 - 계속 진행하시겠습니까?")
                 if not args.force:
                     try:
@@ -821,17 +1753,15 @@ def main():
                 pass
         
         if args.config:
-            config_path = Path(args.config)
-            if not config_path.exists():
-                error(f"설정 파일을 찾을 수 없습니다: {args.config}")
-                return 1
-            if installer.add_server(config_path):
+            if installer.add_servers_from_sources(config_sources):
                 modified = True
             else:
                 # 일부 서버가 추가되지 않았을 수 있지만, 일부는 성공했을 수 있음
-                # add_server의 반환값이 False면 모두 실패한 것
+                # 반환값이 False면 모두 실패한 것
                 if not args.dry_run:
                     has_error = True
+            if installer.import_summary['failed_sources']:
+                has_error = True
         
         if args.remove:
             if installer.remove_server(args.remove):
@@ -839,6 +1769,16 @@ def main():
             else:
                 has_error = True  # 제거 실패
         
+        # 실행 최적화 (적용 시에는 측정과 저장 사이에 설정이 바뀌지 않도록 배타 잠금 유지)
+        if args.optimize_launch is not None:
+            if not needs_lock:
+                installer.release_lock()
+            installer.launch_results = installer.optimize_launch(
+                args.optimize_launch, apply=args.apply_launch,
+                runs=max(1, args.launch_runs), timeout=args.probe_timeout)
+            if any(result.get('applied') for result in installer.launch_results.values()):
+                modified = True
+        
         # 목록 출력
         if args.list or modified:
             installer.list_servers()
@@ -857,8 +1797,16 @@ def main():
             if not installer.verify():
                 has_error = True
         
+        # 서버 실행 점검 (오래 걸릴 수 있으므로 조회 잠금을 먼저 해제)
+        if args.probe is not None:
+            if not needs_lock:
+                installer.release_lock()
+            installer.probe_results = installer.probe(args.probe, args.probe_jobs, args.probe_timeout)
+            if any(result['status'] in ('error', 'timeout', 'blocked') for result in installer.probe_results.values()):
+                has_error = True
+        
         # 아무 옵션도 없으면 도움말 출력
-        if not any(vars(args).values()):
+        if all(value == parser.get_default(key) for key, value in vars(args).items()):
             parser.print_help()
         
         # 오류가 있었으면 비정상 종료
@@ -869,8 +1817,7 @@ def main():
     
     finally:
         # 잠금 해제
-        if needs_lock:
-            installer.release_lock()
+        installer.release_lock()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
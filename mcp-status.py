@@ -14,42 +14,216 @@ File History:
   2025.09.04 PM06:00 원자적 파일 쓰기 및 예외 처리 강화
   2025.09.04 PM06:30 백업 관리 및 JSON 검증 로직 추가
   2025.09.04 PM11:50 온라인 MCP 정보 검색 및 상세 정보 표시 기능 추가
+  2026.10.17 AM09:00 온라인 정보 일괄 선조회(prefetch) - 병렬 조회 및 전체 마감시간 적용
+  2026.10.17 AM10:00 온라인 정보 영구 디스크 캐시 - TTL, 실패 캐시, LRU 정리, --refresh/--offline
+  2026.10.17 AM11:00 NPM 조건부 요청(ETag/Last-Modified) 및 축약 메타데이터(--abbreviated) 지원
+  2026.10.17 PM01:00 조회 전용 실행 시 mcpServers만 스트리밍 추출 (mcp_common.load_mcp_view)
+  2026.10.17 PM02:00 저장 시 mcpServers 영역만 부분 패치 (mcp_common.patch_mcp_servers)
+  2026.10.17 PM07:00 백업을 내용 주소 기반 저장소로 변경 (mcp_common.BackupStore)
+  2026.10.17 PM11:00 mcp-installer.py와 같은 잠금 사용 (조회는 공유, --add는 배타), 세대 번호 기반 뷰 캐시
+  2026.10.18 AM01:00 --watch 실시간 현황 (inotify/mtime 폴링, 변경된 서버만 다시 조회·표시)
+  2026.10.18 AM06:00 --profile 단계별 소요 시간 계측 (잠금/파싱/네트워크/보고서 출력, JSON/Chrome trace)
+  2026.10.18 AM07:00 작업 이벤트 로그(--log-file, JSON lines) 및 --metrics-file Prometheus 지표
+  2026.10.18 AM08:00 시작 시간 단축 - ssl/urllib은 레지스트리 조회 시, tempfile/shutil은 쓰기 시에만 임포트, --offline은 스레드 풀 없이 순차 조회
+  2026.10.18 AM09:00 하드코딩된 known_mcps를 버전 관리되는 오프라인 메타데이터 색인(mcp-index.json)으로 교체, --update-index
+  2026.10.18 AM10:00 레지스트리 조회에 호스트별 keep-alive 연결 풀 사용 (SSL 컨텍스트 1회 생성, 핸드셰이크 재사용)
+  2026.10.18 PM02:00 만료 항목 재검증이 실패하면 이전 정보와 ETag/Last-Modified를 유지 (빈 실패 캐시로 덮어쓰지 않음)
+  2026.10.18 PM03:00 --abbreviated라도 이전 캐시 정보가 없으면 전체 메타데이터 요청 (설명/저장소/키워드가 비지 않도록)
 =====================================================================
 """
 
 import json
 import sys
-import shutil
 import os
-import tempfile
-import urllib.request
-import urllib.parse
-import ssl
+import select
 import time
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, List, Set, Tuple
+
+from mcp_common import (OPLOG, OPLOG_FILE, PROFILER, BackupStore, ConfigLock, load_mcp_view_cached,
+                        patch_mcp_servers, profiled)
 
 # MCP 정보 캐시 (성능 최적화)
+# 키: "mcp_name:package", 값: {'info', 'fetched', 'ttl', 'accessed', 'negative'}
 MCP_INFO_CACHE = {}
-CACHE_EXPIRY = 3600  # 1시간 캐시
+CACHE_EXPIRY = 3600           # 1시간 캐시
+NEGATIVE_CACHE_EXPIRY = 300   # 조회 실패 결과는 5분만 캐시
+CACHE_MAX_ENTRIES = 500       # 최대 항목 수 (초과 시 오래 사용되지 않은 항목부터 제거)
+CACHE_ACCESS_RESOLUTION = 86400  # 사용 시각 갱신 단위 (캐시 적중만으로 매 실행 파일을 다시 쓰지 않도록)
+CACHE_VERSION = 1
 
-def get_mcp_online_info(mcp_name: str, package_name: Optional[str] = None) -> Dict[str, Any]:
-    """MCP 온라인 정보 검색 (GitHub, NPM 등에서)"""
-    global MCP_INFO_CACHE
+# 영구 캐시 파일 (프로세스 간 재사용)
+MCP_CACHE_DIR = Path.home() / ".claude-mcp-cache"
+MCP_CACHE_FILE = MCP_CACHE_DIR / "online-info.json"
+
+# 오프라인 메타데이터 색인 (스크립트와 함께 배포, --update-index로 갱신한 사본은 캐시 디렉토리에 저장)
+MCP_INDEX_BUNDLED = Path(__file__).resolve().parent / "mcp-index.json"
+MCP_INDEX_FILE = MCP_CACHE_DIR / "mcp-index.json"
+INDEX_VERSION = 1
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+# NPM 레지스트리 설정 (MCP_STATUS_REGISTRY 환경변수로 미러 지정 가능)
+NPM_REGISTRY_URL = os.environ.get('MCP_STATUS_REGISTRY', 'https://registry.npmjs.org').rstrip('/')
+# 축약 메타데이터 (--abbreviated: 전체 버전 문서 대신 설치용 축약 문서 요청, 전송량 감소)
+NPM_ABBREVIATED_ACCEPT = 'application/vnd.npm.install-v1+json; q=1.0, application/json; q=0.8, */*'
+REGISTRY_OPTIONS = {'abbreviated': False}
+# 레지스트리 요청 통계 (요청 수, 304 응답 수, 수신 바이트)
+REGISTRY_STATS = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+REGISTRY_TIMEOUT = 3          # 요청 1회 타임아웃 (초)
+REGISTRY_MAX_IDLE = 8         # 호스트별로 유지할 유휴 keep-alive 연결 수 (기본 선조회 동시 조회 수)
+REGISTRY_MAX_REDIRECTS = 3
+
+# 캐시 동작 옵션 (--refresh: 캐시 무시 후 재조회, --offline: 네트워크 사용 안 함)
+CACHE_OPTIONS = {'refresh': False, 'offline': False}
+_CACHE_LOCK = threading.Lock()
+_CACHE_DIRTY = False
+
+@profiled('cache.load')
+def load_info_cache(cache_file: Path = MCP_CACHE_FILE) -> int:
+    """디스크 캐시를 메모리 캐시로 로드 (로드된 항목 수 반환, 실패 시 빈 캐시)"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] 캐시 파일을 읽을 수 없습니다 (무시됨): {e}")
+        return 0
     
-    # package_name이 리스트인 경우 처리
-    if isinstance(package_name, list):
-        package_name = package_name[0] if package_name else None
+    if not isinstance(stored, dict) or stored.get('version') != CACHE_VERSION:
+        return 0
+    
+    entries = stored.get('entries', {})
+    if not isinstance(entries, dict):
+        return 0
+    
+    with _CACHE_LOCK:
+        for key, entry in entries.items():
+            if isinstance(entry, dict) and isinstance(entry.get('info'), dict):
+                MCP_INFO_CACHE[key] = entry
+    return len(entries)
+
+@profiled('cache.save')
+def save_info_cache(cache_file: Path = MCP_CACHE_FILE) -> bool:
+    """메모리 캐시를 디스크에 원자적으로 저장 (변경이 없으면 건너뜀, LRU 정리 포함)"""
+    global _CACHE_DIRTY
+    
+    with _CACHE_LOCK:
+        if not _CACHE_DIRTY:
+            return True
+        
+        # LRU 정리: 최근 사용 순으로 CACHE_MAX_ENTRIES개만 유지
+        if len(MCP_INFO_CACHE) > CACHE_MAX_ENTRIES:
+            ordered = sorted(MCP_INFO_CACHE.items(),
+                             key=lambda item: item[1].get('accessed', 0), reverse=True)
+            MCP_INFO_CACHE.clear()
+            MCP_INFO_CACHE.update(ordered[:CACHE_MAX_ENTRIES])
+        
+        payload = {'version': CACHE_VERSION, 'entries': dict(MCP_INFO_CACHE)}
+        _CACHE_DIRTY = False
+    
+    import tempfile
+    temp_path = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=cache_file.parent, prefix='.cache_tmp_', suffix='.json')
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, cache_file)
+        temp_path = None
+        return True
+    except OSError as e:
+        print(f"[WARN] 캐시 저장 실패 (무시됨): {e}")
+        return False
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+def _get_cached_info(cache_key: str) -> Optional[Dict[str, Any]]:
+    """유효한 캐시 항목의 정보 반환 (--offline이면 만료된 항목도 사용)"""
+    global _CACHE_DIRTY
+    
+    if CACHE_OPTIONS['refresh']:
+        return None
+    
+    with _CACHE_LOCK:
+        entry = MCP_INFO_CACHE.get(cache_key)
+        if not entry:
+            return None
+        now = time.time()
+        if not CACHE_OPTIONS['offline'] and now - entry.get('fetched', 0) >= entry.get('ttl', CACHE_EXPIRY):
+            return None
+        # LRU 정리에는 하루 단위 사용 시각이면 충분 - 적중한 실행마다 캐시 파일을 다시 쓰지 않음
+        if now - entry.get('accessed', 0) >= CACHE_ACCESS_RESOLUTION:
+            entry['accessed'] = now
+            _CACHE_DIRTY = True
+        return entry['info']
+
+def _get_cache_entry(cache_key: str) -> Optional[Dict[str, Any]]:
+    """만료 여부와 관계없이 캐시 항목 반환 (조건부 요청 검증자 재사용용)"""
+    with _CACHE_LOCK:
+        entry = MCP_INFO_CACHE.get(cache_key)
+        return dict(entry) if entry else None
+
+def _store_cached_info(cache_key: str, info: Dict[str, Any], negative: bool,
+                       validators: Optional[Dict[str, str]] = None, stale: bool = False) -> None:
+    """
+    조회 결과를 캐시에 저장 (실패한 조회는 짧은 TTL로 저장, ETag/Last-Modified 검증자 포함)
     
-    # 캐시 확인
-    cache_key = f"{mcp_name}:{package_name or ''}"
-    if cache_key in MCP_INFO_CACHE:
-        cached_time, cached_info = MCP_INFO_CACHE[cache_key]
-        if time.time() - cached_time < CACHE_EXPIRY:
-            return cached_info
+    stale=True: 재검증이 일시적으로 실패해 이전 정보를 다시 저장하는 경우 - 검증자는 유지하고
+    실패 캐시와 같은 짧은 TTL 뒤에 다시 재검증한다.
+    """
+    global _CACHE_DIRTY
     
-    info = {
+    now = time.time()
+    entry = {
+        'info': info,
+        'fetched': now,
+        'accessed': now,
+        'ttl': NEGATIVE_CACHE_EXPIRY if negative or stale else CACHE_EXPIRY,
+        'negative': negative
+    }
+    if validators and not negative:
+        entry.update({k: v for k, v in validators.items() if v})
+    with _CACHE_LOCK:
+        MCP_INFO_CACHE[cache_key] = entry
+        _CACHE_DIRTY = True
+
+# 온라인 정보 선조회 설정 (--jobs, --deadline 옵션으로 변경 가능)
+PREFETCH_MAX_WORKERS = 8     # 동시 조회 수 제한
+PREFETCH_DEADLINE = 10.0     # 전체 선조회 마감시간 (초)
+
+# ~/.claude.lock 대기 시간 (mcp-installer.py와 공유하는 잠금)
+LOCK_TIMEOUT = 10.0
+
+# --watch 설정
+WATCH_POLL_INTERVAL = 1.0    # inotify를 쓸 수 없을 때 mtime 폴링 간격 (초)
+WATCH_RESCAN_INTERVAL = 60.0 # inotify 사용 시에도 이 간격으로 한 번씩 재확인 (놓친 이벤트 대비)
+WATCH_DEBOUNCE = 0.1         # 연속 쓰기를 한 번의 변경으로 묶는 대기 시간 (초)
+WATCH_CHANGE_LOG = 10        # 화면에 표시할 최근 변경 수
+
+def get_arg_value(option: str, default: Any, cast=str) -> Any:
+    """sys.argv에서 '--option 값' 또는 '--option=값' 형식의 값 추출"""
+    for i, arg in enumerate(sys.argv[1:], 1):
+        try:
+            if arg == option and i + 1 < len(sys.argv):
+                return cast(sys.argv[i + 1])
+            if arg.startswith(option + '='):
+                return cast(arg.split('=', 1)[1])
+        except ValueError:
+            print(f"[WARN] {option} 값이 올바르지 않습니다 - 기본값 {default} 사용")
+            return default
+    return default
+
+def empty_online_info() -> Dict[str, Any]:
+    """빈 온라인 정보 구조 생성"""
+    return {
         'description': None,
         'repository': None,
         'version': None,
@@ -58,89 +232,533 @@ def get_mcp_online_info(mcp_name: str, package_name: Optional[str] = None) -> Di
         'health_check': None,
         'runtime': None
     }
+
+def extract_package_name(config: Dict[str, Any]) -> Optional[str]:
+    """서버 설정의 args에서 패키지명 추출 (npx 패키지, uvx 첫 인자 등)"""
+    args_list = config.get('args') or []
+    if config.get('command') == 'uvx' and args_list and isinstance(args_list[0], str) \
+            and not args_list[0].startswith('-'):
+        return args_list[0]
+    for i, arg in enumerate(args_list):
+        if isinstance(arg, str) and (arg.startswith('@') or (i > 0 and args_list[i-1] in ['-y', 'npx'])):
+            if arg not in ['-y', 'npx', '/c']:
+                return arg
+    return None
+
+def online_info_key(mcp_name: str, package_name: Optional[str]) -> str:
+    """온라인 정보 캐시/선조회 결과의 키 생성"""
+    return f"{mcp_name}:{package_name or ''}"
+
+def collect_mcp_targets(data: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+    """전역 및 프로젝트별 mcpServers에서 조회 대상 (이름, 패키지) 목록 수집 (중복 제거)"""
+    targets = {}
+    
+    def _collect(servers):
+        if not isinstance(servers, dict):
+            return
+        for name, config in servers.items():
+            if not isinstance(config, dict):
+                continue
+            package = extract_package_name(config)
+            targets.setdefault(online_info_key(name, package), (name, package))
+    
+    _collect(data.get('mcpServers', {}))
+    for proj_config in (data.get('projects') or {}).values():
+        if isinstance(proj_config, dict):
+            _collect(proj_config.get('mcpServers'))
+    
+    return list(targets.values())
+
+def prefetch_mcp_online_info(data: Dict[str, Any],
+                             max_workers: int = PREFETCH_MAX_WORKERS,
+                             deadline: float = PREFETCH_DEADLINE) -> Dict[str, Dict[str, Any]]:
+    """
+    모든 MCP 서버의 온라인 정보를 병렬로 선조회
     
+    Args:
+        data: ~/.claude.json 전체 데이터
+        max_workers: 동시 조회 스레드 수 (최소 1)
+        deadline: 전체 선조회 마감시간(초). 초과한 항목은 빈 정보로 채움
+    
+    Returns:
+        online_info_key(이름, 패키지) -> 온라인 정보 딕셔너리
+    """
+    return prefetch_online_targets(collect_mcp_targets(data), max_workers, deadline)
+
+@profiled('network.prefetch')
+def prefetch_online_targets(targets: List[Tuple[str, Optional[str]]],
+                            max_workers: int = PREFETCH_MAX_WORKERS,
+                            deadline: float = PREFETCH_DEADLINE) -> Dict[str, Dict[str, Any]]:
+    """(이름, 패키지) 목록의 온라인 정보를 병렬로 선조회 (prefetch_mcp_online_info 참고)"""
+    results = {}
+    if not targets:
+        return results
+    
+    # --offline: 네트워크 대기가 없으므로 순차 조회 (스레드 풀 모듈도 임포트하지 않음)
+    if CACHE_OPTIONS['offline']:
+        for name, package in targets:
+            results[online_info_key(name, package)] = get_mcp_online_info(name, package)
+        return results
+    
+    from concurrent.futures import ThreadPoolExecutor, wait
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets))))
     try:
-        # NPM 패키지 검색 시도
-        if package_name and isinstance(package_name, str) and package_name.startswith('@'):
-            # SSL 컨텍스트 생성 (Windows 환경 지원)
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # NPM API 호출
+        futures = {
+            executor.submit(get_mcp_online_info, name, package): online_info_key(name, package)
+            for name, package in targets
+        }
+        done, pending = wait(futures, timeout=max(0.0, deadline))
+        
+        for future in done:
             try:
-                npm_url = f"https://registry.npmjs.org/{urllib.parse.quote(package_name, safe='@/')}"
+                results[futures[future]] = future.result()
             except Exception:
-                npm_url = None
+                results[futures[future]] = empty_online_info()
+        
+        if pending:
+            print(f"[WARN] 온라인 정보 조회 마감시간 초과 ({deadline}초) - {len(pending)}개 항목 생략")
+            for future in pending:
+                future.cancel()
+                results[futures[future]] = empty_online_info()
+    finally:
+        # 마감시간을 넘긴 조회는 기다리지 않음 (요청 timeout으로 자연 종료)
+        executor.shutdown(wait=False)
+    
+    return results
+
+def lookup_online_info(online_infos: Optional[Dict[str, Dict[str, Any]]],
+                       mcp_name: str, package_name: Optional[str]) -> Dict[str, Any]:
+    """선조회 결과에서 온라인 정보 조회 (선조회 결과가 없으면 직접 조회)"""
+    if online_infos is None:
+        return get_mcp_online_info(mcp_name, package_name)
+    return online_infos.get(online_info_key(mcp_name, package_name)) or empty_online_info()
+
+def _count_registry(stat: str, amount: int = 1) -> None:
+    """레지스트리 요청 통계 누적 (선조회 스레드에서 동시 호출)"""
+    with _CACHE_LOCK:
+        REGISTRY_STATS[stat] += amount
+
+class RegistryError(Exception):
+    """레지스트리가 오류 상태 코드(4xx/5xx)로 응답한 경우"""
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+
+class RegistryConnectionPool:
+    """
+    호스트별 keep-alive 연결을 재사용하는 최소 HTTP/1.1 GET 클라이언트 (스레드 안전)
+    
+    SSL 컨텍스트는 처음 HTTPS 요청 때 한 번만 만든다. 응답 본문을 끝까지 읽은 연결은
+    호스트별 유휴 목록에 돌려놓아 다음 요청이 TCP/TLS 핸드셰이크 없이 재사용한다.
+    유휴 연결이 서버 쪽에서 이미 닫혀 있으면 새 연결로 한 번 재시도한다.
+    max_idle=0이면 매 요청 새 연결 (이전 urlopen 방식과 같음, 벤치마크 비교용).
+    """
+    
+    def __init__(self, max_idle: int = REGISTRY_MAX_IDLE):
+        self.max_idle = max_idle
+        self.connections = 0      # 새로 연 연결 수
+        self._idle = {}           # (scheme, host, port) -> [HTTPConnection]
+        self._lock = threading.Lock()
+        self._ssl_context = None
+    
+    def _context(self):
+        import ssl
+        with self._lock:
+            if self._ssl_context is None:
+                # SSL 컨텍스트 생성 (Windows 환경 지원)
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                self._ssl_context = context
+            return self._ssl_context
+    
+    def _acquire(self, key: Tuple[str, str, int], timeout: float, reuse: bool):
+        """유휴 연결을 꺼내거나 새로 만든다 (연결, 재사용 여부)"""
+        import http.client
+        if reuse:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is not None:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.connections += 1
+        return conn, False
+    
+    def _release(self, key: Tuple[str, str, int], conn) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    def get(self, url: str, headers: Dict[str, str], timeout: float = REGISTRY_TIMEOUT):
+        """
+        GET 요청 (리다이렉트는 REGISTRY_MAX_REDIRECTS번까지 따라감)
+        
+        Returns:
+            (상태 코드, 사유 문구, 응답 헤더, 본문 bytes)
+        """
+        import http.client
+        from urllib.parse import urljoin, urlsplit
+        
+        for _ in range(REGISTRY_MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                raise ValueError(f"지원하지 않는 레지스트리 URL: {url}")
+            key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+            path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
             
-            if npm_url:
+            for attempt in range(2):
+                conn, reused = self._acquire(key, timeout, reuse=attempt == 0)
                 try:
-                    req = urllib.request.Request(
-                        npm_url,
-                        headers={'User-Agent': 'mcp-status/1.0'}
-                    )
-                    with urllib.request.urlopen(req, context=ssl_context, timeout=3) as response:
-                        npm_data = json.loads(response.read().decode('utf-8'))
-                        
-                        # 정보 추출
-                        if 'description' in npm_data:
-                            info['description'] = npm_data['description']
-                        
-                        if 'repository' in npm_data and isinstance(npm_data['repository'], dict):
-                            info['repository'] = npm_data['repository'].get('url', '')
-                            # git+ 제거 및 .git 제거
-                            if info['repository']:
-                                info['repository'] = info['repository'].replace('git+', '').replace('.git', '')
-                        
-                        if 'dist-tags' in npm_data:
-                            info['version'] = npm_data['dist-tags'].get('latest')
-                        
-                        # keywords에서 MCP 관련 정보 추출
-                        if 'keywords' in npm_data:
-                            keywords = npm_data.get('keywords', [])
-                            if 'mcp' in keywords:
-                                info['features'] = [k for k in keywords if k != 'mcp' and not k.startswith('mcp-')]
-                except Exception:
-                    pass  # 온라인 정보 실패는 무시
-        
-        # 알려진 MCP 정보 (하드코딩된 정보)
-        known_mcps = {
-            'shrimp': {
-                'description': '자연어 요청을 구조화된 개발 작업으로 변환, 작업 분해·추적 지원',
-                'features': ['체인 오브 소트(chain-of-thought) 기반 계획', '수행 및 반영(reflection) 흐름 제공'],
-                'runtime': 'Node.js 18+ (npm 기반)',
-                'scope': 'user',
-                'health_check': 'GET /health'
-            },
-            'filesystem': {
-                'description': '파일 시스템 접근 및 조작 기능 제공',
-                'features': ['파일 읽기/쓰기', '디렉토리 탐색', '파일 검색'],
-                'runtime': 'Node.js',
-                'scope': 'user'
-            },
-            'mcp-installer': {
-                'description': 'MCP 서버 관리 도구 (설치/제거/업데이트)',
-                'features': ['MCP 서버 자동 설치', '의존성 관리', '설정 자동화'],
-                'runtime': 'Node.js (npx)',
-                'scope': 'user'
-            }
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if reused:
+                        continue  # 서버가 닫은 유휴 연결 - 새 연결로 재시도
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                break
+            
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            
+            location = response.headers.get('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return response.status, response.reason, response.headers, body
+        raise RegistryError(response.status, "리다이렉트가 너무 많습니다")
+    
+    def close(self) -> None:
+        """유휴 연결 모두 닫기"""
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+# 프로세스 전체에서 공유 (상주 데몬에서는 요청 사이에도 연결 유지)
+REGISTRY_POOL = RegistryConnectionPool()
+
+@profiled('network.npm_fetch')
+def fetch_npm_metadata(package_name: str, previous: Optional[Dict[str, Any]] = None
+                       ) -> Tuple[int, Optional[Dict[str, Any]], Dict[str, str]]:
+    """
+    NPM 레지스트리에서 패키지 메타데이터 조회 (조건부 요청 지원)
+    
+    이전 캐시 항목에 ETag/Last-Modified가 있으면 If-None-Match/If-Modified-Since를
+    보내 변경되지 않은 경우 304 응답(본문 없음)을 받는다. --abbreviated라도 설명/저장소/
+    키워드를 보완할 이전 정보가 없으면(첫 조회, 이전 조회 실패 등) 전체 문서를 요청한다.
+    
+    Returns:
+        (HTTP 상태 코드, 메타데이터 또는 None, 저장할 검증자 {'etag', 'last_modified', 'accept'})
+    """
+    # 네트워크 조회 시에만 필요 (--offline 및 캐시 적중 시 임포트 비용 없음)
+    import urllib.parse
+    
+    has_previous = bool(previous) and not previous.get('negative')
+    accept = NPM_ABBREVIATED_ACCEPT if REGISTRY_OPTIONS['abbreviated'] and has_previous else 'application/json'
+    npm_url = f"{NPM_REGISTRY_URL}/{urllib.parse.quote(package_name, safe='@/')}"
+    headers = {'User-Agent': 'mcp-status/1.0', 'Accept': accept}
+    
+    # 같은 Accept 형식으로 받은 검증자만 재사용 (전체/축약 문서의 ETag는 서로 다름)
+    validators = {}
+    if has_previous and previous.get('accept') == accept:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+            validators['etag'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+            validators['last_modified'] = previous['last_modified']
+    validators['accept'] = accept
+    
+    _count_registry('requests')
+    with OPLOG.operation('registry.fetch', package=package_name) as op:
+        status, reason, response_headers, body = REGISTRY_POOL.get(npm_url, headers)
+        op.fields['status'] = status
+        if status == 304:
+            op.outcome = 'not_modified'
+            _count_registry('not_modified')
+            return 304, None, validators
+        if status >= 300:
+            raise RegistryError(status, reason)
+        
+        _count_registry('bytes', len(body))
+        op.size = len(body)
+        validators = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'accept': accept
         }
+        return status, json.loads(body.decode('utf-8')), validators
+
+def apply_npm_metadata(info: Dict[str, Any], npm_data: Dict[str, Any]) -> None:
+    """NPM 메타데이터(전체 또는 축약)에서 MCP 정보 추출"""
+    if 'description' in npm_data:
+        info['description'] = npm_data['description']
+    
+    if 'repository' in npm_data and isinstance(npm_data['repository'], dict):
+        info['repository'] = npm_data['repository'].get('url', '')
+        # git+ 제거 및 .git 제거
+        if info['repository']:
+            info['repository'] = info['repository'].replace('git+', '').replace('.git', '')
+    
+    if 'dist-tags' in npm_data:
+        info['version'] = npm_data['dist-tags'].get('latest')
+    
+    # keywords에서 MCP 관련 정보 추출
+    if 'keywords' in npm_data:
+        keywords = npm_data.get('keywords', [])
+        if 'mcp' in keywords:
+            info['features'] = [k for k in keywords if k != 'mcp' and not k.startswith('mcp-')]
+
+def _read_index_file(path: Path) -> Optional[Dict[str, Any]]:
+    """색인 파일 읽기 (없거나 형식/버전이 맞지 않으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] 메타데이터 색인을 읽을 수 없습니다 (무시됨): {path} - {e}")
+        return None
+    
+    if (not isinstance(index, dict) or index.get('version') != INDEX_VERSION
+            or not isinstance(index.get('servers'), dict)):
+        return None
+    return index
+
+@profiled('index.load')
+def load_metadata_index() -> Dict[str, Any]:
+    """
+    오프라인 메타데이터 색인을 한 번만 로드 (이후 호출은 메모리의 색인 반환)
+    
+    --update-index로 갱신한 사본은 그 사본을 만들 때의 배포 색인(bundled)보다 새로운 색인이
+    배포되기 전까지 우선 사용한다 (시스템 시계와 무관하게 generated 문자열만 비교).
+    서버 이름(별칭 포함)과 패키지명 각각으로 항목을 찾는 딕셔너리를 만들어 둔다.
+    
+    Returns:
+        {'generated', 'bundled', 'source', 'servers', 'by_name', 'by_package'}
+    """
+    global _INDEX
+    
+    with _INDEX_LOCK:
+        if _INDEX is not None:
+            return _INDEX
         
-        # 알려진 정보로 보완
-        if mcp_name in known_mcps:
-            for key, value in known_mcps[mcp_name].items():
-                if not info[key]:
-                    info[key] = value
+        bundled = _read_index_file(MCP_INDEX_BUNDLED)
+        updated = _read_index_file(MCP_INDEX_FILE)
+        bundled_generated = str(bundled.get('generated', '')) if bundled else ''
+        if updated and str(updated.get('bundled', '')) >= bundled_generated:
+            path, index = MCP_INDEX_FILE, updated
+        else:
+            path, index = MCP_INDEX_BUNDLED, bundled
+        
+        _INDEX = {'generated': None, 'bundled': bundled_generated, 'source': None,
+                  'servers': {}, 'by_name': {}, 'by_package': {}}
+        if index:
+            _INDEX.update(generated=index.get('generated'), source=path)
+            for name, entry in index['servers'].items():
+                if not isinstance(entry, dict):
+                    continue
+                _INDEX['servers'][name] = entry
+                for alias in [name, *entry.get('aliases', [])]:
+                    _INDEX['by_name'].setdefault(alias, entry)
+                if entry.get('package'):
+                    _INDEX['by_package'][entry['package']] = entry
+        return _INDEX
+
+def _package_base(package_name: str) -> str:
+    """버전 지정을 뺀 패키지명 ('@scope/pkg@1.2.3' -> '@scope/pkg')"""
+    at = package_name.rfind('@')
+    return package_name[:at] if at > 0 else package_name
+
+def lookup_index_entry(mcp_name: str, package_name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """색인에서 패키지명(버전 지정 제외) 우선, 없으면 서버 이름으로 항목 조회"""
+    index = load_metadata_index()
+    if isinstance(package_name, str):
+        entry = index['by_package'].get(_package_base(package_name))
+        if entry is not None:
+            return entry
+    return index['by_name'].get(mcp_name)
+
+def apply_index_info(info: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """비어 있는 항목을 색인 항목으로 채운 정보 반환 (원본은 변경하지 않음)"""
+    if not entry or all(info.values()):
+        return info
+    merged = dict(info)
+    for key, value in info.items():
+        if not value and entry.get(key):
+            merged[key] = list(entry[key]) if isinstance(entry[key], list) else entry[key]
+    return merged
+
+def update_metadata_index(max_workers: int = PREFETCH_MAX_WORKERS,
+                          deadline: float = PREFETCH_DEADLINE) -> int:
+    """
+    색인의 npm 패키지 메타데이터를 레지스트리에서 일괄 조회해 캐시 디렉토리의 사본으로 저장
+    
+    버전/저장소는 레지스트리 값으로 갱신하고, 설명·기능은 색인에 없을 때만 채운다
+    (직접 작성한 한국어 설명 유지). npm이 아닌 항목(pypi 등)은 그대로 둔다.
+    
+    Returns:
+        종료 코드 (조회한 패키지가 모두 실패하면 1)
+    """
+    global _INDEX
+    
+    from concurrent.futures import ThreadPoolExecutor, wait
+    import tempfile
+    
+    index = load_metadata_index()
+    servers = {name: dict(entry) for name, entry in index['servers'].items()}
+    targets = {name: entry['package'] for name, entry in servers.items()
+               if entry.get('registry') == 'npm' and entry.get('package')}
+    print(f"[INFO] 메타데이터 색인 갱신 중... ({len(targets)}개 npm 패키지, 기준: {index['source']})")
+    
+    updated = failed = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets) or 1)))
+    try:
+        futures = {executor.submit(fetch_npm_metadata, package): name for name, package in targets.items()}
+        done, pending = wait(futures, timeout=max(0.0, deadline))
+        for future in done:
+            name = futures[future]
+            try:
+                _, npm_data, _ = future.result()
+            except Exception as e:
+                print(f"[WARN] {name} ({targets[name]}) 조회 실패: {e}")
+                failed += 1
+                continue
+            if not npm_data:
+                failed += 1
+                continue
+            fresh = empty_online_info()
+            apply_npm_metadata(fresh, npm_data)
+            entry = servers[name]
+            for key in ('version', 'repository'):
+                if fresh[key]:
+                    entry[key] = fresh[key]
+            for key in ('description', 'features'):
+                if fresh[key] and not entry.get(key):
+                    entry[key] = fresh[key]
+            updated += 1
+        
+        if pending:
+            print(f"[WARN] 색인 갱신 마감시간 초과 ({deadline}초) - {len(pending)}개 항목은 이전 정보 유지")
+            for future in pending:
+                future.cancel()
+            failed += len(pending)
+    finally:
+        executor.shutdown(wait=False)
+    
+    payload = {'version': INDEX_VERSION, 'generated': datetime.now().isoformat(timespec='seconds'),
+               'bundled': index['bundled'], 'servers': servers}
+    temp_path = None
+    try:
+        MCP_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=MCP_INDEX_FILE.parent, prefix='.index_tmp_', suffix='.json')
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, MCP_INDEX_FILE)
+        temp_path = None
+    except OSError as e:
+        print(f"[ERROR] 메타데이터 색인 저장 실패: {e}")
+        return 1
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+    
+    # 다음 조회부터 새 색인 사용
+    with _INDEX_LOCK:
+        _INDEX = None
+    print(f"[SUCCESS] 메타데이터 색인 저장: {MCP_INDEX_FILE} "
+          f"(갱신 {updated}개, 실패 {failed}개, 전체 {len(servers)}개)")
+    return 1 if targets and not updated else 0
+
+@profiled('online_info.lookup')
+def get_mcp_online_info(mcp_name: str, package_name: Optional[str] = None) -> Dict[str, Any]:
+    """MCP 온라인 정보 검색 (GitHub, NPM 등에서)"""
+    # package_name이 리스트인 경우 처리
+    if isinstance(package_name, list):
+        package_name = package_name[0] if package_name else None
+    
+    # 캐시 확인 (메모리 + 디스크 캐시)
+    cache_key = online_info_key(mcp_name, package_name)
+    entry = lookup_index_entry(mcp_name, package_name)
+    cached_info = _get_cached_info(cache_key)
+    if cached_info is not None:
+        # 실패 캐시(빈 정보)도 색인으로 보완 (오프라인 환경에서 보고서가 비지 않도록)
+        return apply_index_info(cached_info, entry)
+    
+    info = empty_online_info()
+    lookup_failed = False
+    stale = False
+    network_used = False
+    validators = {}
+    
+    try:
+        indexed_npm = (entry is not None and entry.get('registry') == 'npm' and isinstance(package_name, str)
+                       and entry.get('package') == _package_base(package_name))
+        
+        # NPM 패키지 검색 시도 (scoped 패키지 또는 색인에 npm 패키지로 등록된 경우, --offline이면 건너뜀)
+        if (package_name and isinstance(package_name, str) and (package_name.startswith('@') or indexed_npm)
+                and not CACHE_OPTIONS['offline']):
+            network_used = True
+            previous = _get_cache_entry(cache_key)
+            try:
+                status, npm_data, validators = fetch_npm_metadata(package_name, previous)
+                if status == 304 and previous:
+                    # 변경 없음 - 이전 정보 재사용
+                    info = dict(previous['info'])
+                elif npm_data is not None:
+                    if validators.get('accept') == NPM_ABBREVIATED_ACCEPT:
+                        # 축약 메타데이터에는 설명/저장소/키워드가 없으므로 이전 정보 유지
+                        info = dict(previous['info'])
+                    apply_npm_metadata(info, npm_data)
+                else:
+                    lookup_failed = True
+            except Exception as e:
+                # 패키지가 없어진 경우(4xx)가 아닌 일시적 실패(연결/시간 초과/5xx)면 마지막으로 받은 정보와
+                # 검증자를 유지하고 짧은 TTL 뒤 조건부 요청으로 재검증
+                transient = not (isinstance(e, RegistryError) and e.status < 500)
+                if transient and previous and not previous.get('negative'):
+                    info = dict(previous['info'])
+                    validators = {k: previous.get(k) for k in ('etag', 'last_modified', 'accept')}
+                    stale = True
+                else:
+                    lookup_failed = True  # 온라인 정보 실패는 무시 (짧은 TTL로 캐시)
+        
+        # 오프라인 색인으로 보완 (레지스트리에서 얻지 못한 항목만)
+        info = apply_index_info(info, entry)
         
     except Exception:
         pass  # 온라인 검색 실패는 무시
     
-    # 캐시 저장
-    MCP_INFO_CACHE[cache_key] = (time.time(), info)
+    # 캐시 저장 (네트워크 없이 색인만으로 만든 결과는 매번 즉시 만들 수 있으므로 저장하지 않음)
+    if network_used:
+        _store_cached_info(cache_key, info, negative=lookup_failed, validators=validators, stale=stale)
     return info
 
-def generate_markdown_report(data):
-    """MCP 현황을 Markdown 형식으로 생성"""
+@profiled('report.markdown')
+def generate_markdown_report(data, online_infos=None):
+    """MCP 현황을 Markdown 형식으로 생성 (online_infos: prefetch_mcp_online_info 결과)"""
     lines = []
     lines.append("# Claude Code CLI MCP 서버 현황 보고서")
     lines.append(f"\n> 생성 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -171,17 +789,10 @@ def generate_markdown_report(data):
             command = config.get('command', 'N/A')
             
             # args에서 패키지명 추출
-            package = None
-            if config.get('args'):
-                args_list = config['args']
-                for i, arg in enumerate(args_list):
-                    if arg.startswith('@') or (i > 0 and args_list[i-1] in ['-y', 'npx']):
-                        if arg not in ['-y', 'npx', '/c']:
-                            package = arg
-                            break
+            package = extract_package_name(config)
             
-            # 온라인 정보 가져오기
-            online_info = get_mcp_online_info(name, package)
+            # 온라인 정보 가져오기 (선조회 결과 사용)
+            online_info = lookup_online_info(online_infos, name, package)
             
             lines.append(f"#### {idx}. {name.upper()}")
             lines.append("")
@@ -281,8 +892,56 @@ def generate_markdown_report(data):
     
     return "\n".join(lines)
 
-def print_mcp_status(data):
-    """MCP 서버 현황 상세 출력"""
+def format_server_block(name: str, config: Dict[str, Any], online_info: Dict[str, Any],
+                        idx: Optional[int] = None) -> List[str]:
+    """서버 하나의 상세 정보 출력 줄 목록 (idx가 없으면 번호 없이 표시)"""
+    # 상태 확인 (이모지 대신 텍스트 사용)
+    status = "[활성화]" if config.get('command') else "[비활성화]"
+    command = config.get('command', 'N/A')
+    
+    # args에서 패키지명 추출 (npx 패키지명 찾기)
+    package = extract_package_name(config)
+    
+    # MCP 정보 출력 (개선된 포맷)
+    lines = [f"\n{idx}. {name.upper()}" if idx is not None else f"\n{name.upper()}"]
+    lines.append("-" * 80)
+    lines.append(f"  상태: {status}")
+    lines.append(f"  ID: {name}")
+    
+    if online_info['description']:
+        lines.append(f"  설명: {online_info['description']}")
+    
+    if command:
+        runtime_info = online_info['runtime'] or f"{command}"
+        if package:
+            runtime_info += f" ({package})"
+        lines.append(f"  실행방식: {runtime_info}")
+    
+    if online_info['features']:
+        lines.append(f"  주요 기능:")
+        for feature in online_info['features'][:3]:  # 최대 3개만 표시
+            lines.append(f"    - {feature}")
+    
+    if online_info['repository']:
+        lines.append(f"  저장소: {online_info['repository']}")
+    
+    if online_info['version']:
+        lines.append(f"  버전: {online_info['version']}")
+    
+    if online_info['scope']:
+        lines.append(f"  스코프: {online_info['scope']}")
+    
+    if online_info['health_check']:
+        lines.append(f"  상태체크: {online_info['health_check']}")
+    
+    # 설정 정보
+    if config.get('env'):
+        lines.append(f"  환경변수: {len(config['env'])}개 설정됨")
+    return lines
+
+@profiled('report.print')
+def print_mcp_status(data, online_infos=None):
+    """MCP 서버 현황 상세 출력 (online_infos: prefetch_mcp_online_info 결과)"""
     # Windows 콘솔 인코딩 설정
     if sys.platform == 'win32':
         try:
@@ -305,59 +964,9 @@ def print_mcp_status(data):
         print("=" * 80)
         
         for idx, (name, config) in enumerate(global_servers.items(), 1):
-            # 상태 확인 (이모지 대신 텍스트 사용)
-            status = "[활성화]" if config.get('command') else "[비활성화]"
-            command = config.get('command', 'N/A')
-            
-            # args에서 패키지명 추출
-            package = None
-            if config.get('args'):
-                args_list = config['args']
-                # npx 패키지명 찾기
-                for i, arg in enumerate(args_list):
-                    if isinstance(arg, str) and (arg.startswith('@') or (i > 0 and args_list[i-1] in ['-y', 'npx'])):
-                        if arg not in ['-y', 'npx', '/c']:
-                            package = arg
-                            break
-            
-            # 온라인 정보 가져오기
-            online_info = get_mcp_online_info(name, package)
-            
-            # MCP 정보 출력 (개선된 포맷)
-            print(f"\n{idx}. {name.upper()}")
-            print("-" * 80)
-            print(f"  상태: {status}")
-            print(f"  ID: {name}")
-            
-            if online_info['description']:
-                print(f"  설명: {online_info['description']}")
-            
-            if command:
-                runtime_info = online_info['runtime'] or f"{command}"
-                if package:
-                    runtime_info += f" ({package})"
-                print(f"  실행방식: {runtime_info}")
-            
-            if online_info['features']:
-                print(f"  주요 기능:")
-                for feature in online_info['features'][:3]:  # 최대 3개만 표시
-                    print(f"    - {feature}")
-            
-            if online_info['repository']:
-                print(f"  저장소: {online_info['repository']}")
-            
-            if online_info['version']:
-                print(f"  버전: {online_info['version']}")
-            
-            if online_info['scope']:
-                print(f"  스코프: {online_info['scope']}")
-            
-            if online_info['health_check']:
-                print(f"  상태체크: {online_info['health_check']}")
-            
-            # 설정 정보
-            if config.get('env'):
-                print(f"  환경변수: {len(config['env'])}개 설정됨")
+            # 온라인 정보 가져오기 (선조회 결과 사용)
+            online_info = lookup_online_info(online_infos, name, extract_package_name(config))
+            print("\n".join(format_server_block(name, config, online_info, idx)))
         
         print("\n" + "=" * 80)
         
@@ -416,20 +1025,268 @@ def print_mcp_status(data):
     print("\n온라인 정보 수집:")
     if MCP_INFO_CACHE:
         print(f"  - 캐시된 정보: {len(MCP_INFO_CACHE)}개")
-        print(f"  - 캐시 유효시간: {CACHE_EXPIRY//60}분")
+        print(f"  - 캐시 유효시간: {CACHE_EXPIRY//60}분 (실패 시 {NEGATIVE_CACHE_EXPIRY//60}분)")
+        print(f"  - 캐시 파일: {MCP_CACHE_FILE}")
+        if CACHE_OPTIONS['offline']:
+            print("  - 오프라인 모드: 네트워크 조회 안 함")
+        if REGISTRY_STATS['requests']:
+            print(f"  - 레지스트리 요청: {REGISTRY_STATS['requests']}회 "
+                  f"(변경 없음 304: {REGISTRY_STATS['not_modified']}회, 수신: {REGISTRY_STATS['bytes']:,} bytes, "
+                  f"연결: {REGISTRY_POOL.connections}개)")
     else:
         print("  - 온라인 정보 수집 대기 중")
     
     print("\n" + "="*70)
 
+class _Inotify:
+    """ctypes 기반 최소 inotify 래퍼 (Linux 전용, 디렉토리 단위 감시)"""
+    
+    # IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.watched = set()
+    
+    def add_dir(self, directory: Path) -> None:
+        if directory in self.watched:
+            return
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), self.MASK) >= 0:
+            self.watched.add(directory)
+    
+    def wait(self, timeout: float) -> bool:
+        """이벤트가 올 때까지 대기 후 이벤트 버퍼 비우기 (이벤트 여부 반환)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+    
+    def close(self) -> None:
+        os.close(self.fd)
+
+class ConfigWatcher:
+    """
+    설정 파일 변경 감시
+    
+    Linux에서는 inotify로 파일이 있는 디렉토리를 감시해 이벤트가 올 때만 깨어나고
+    (원자적 교체로 inode가 바뀌어도 감시 유지), 그 외에는 interval마다 stat으로 확인한다.
+    어느 경우든 최종 판단은 파일의 (mtime, 크기, inode) 비교로 한다.
+    """
+    
+    def __init__(self, paths: List[Path], interval: float = WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self._stats = {}
+        try:
+            self._inotify = _Inotify() if sys.platform.startswith('linux') else None
+        except (OSError, AttributeError):
+            self._inotify = None
+        self.watch(paths)
+    
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify else f'polling {self.interval}s'
+    
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def watch(self, paths: List[Path]) -> None:
+        """감시 대상 교체 (새 대상은 현재 상태를 기준으로 삼음)"""
+        self._stats = {path: self._stats.get(path, self._stat_key(path)) for path in paths}
+        if self._inotify:
+            for path in paths:
+                self._inotify.add_dir(path.parent)
+    
+    def wait(self) -> Set[Path]:
+        """감시 대상 중 하나 이상이 바뀔 때까지 대기 후 바뀐 파일 집합 반환"""
+        while True:
+            if self._inotify:
+                if self._inotify.wait(WATCH_RESCAN_INTERVAL):
+                    time.sleep(WATCH_DEBOUNCE)
+                    self._inotify.wait(0)
+            else:
+                time.sleep(self.interval)
+            changed = set()
+            for path, previous in self._stats.items():
+                current = self._stat_key(path)
+                if current != previous:
+                    self._stats[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+    
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
+
+def read_project_mcp_json(path: Path) -> Dict[str, Any]:
+    """프로젝트 .mcp.json의 mcpServers 읽기 (없거나 손상되었으면 빈 dict)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            servers = json.load(f).get('mcpServers')
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return servers if isinstance(servers, dict) else {}
+
+def diff_server_maps(old: Dict[Tuple, Dict[str, Any]], new: Dict[Tuple, Dict[str, Any]]
+                     ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+    """(출처, 서버 이름) -> 설정 맵 비교: (추가, 제거, 변경) 키 목록"""
+    added = sorted(key for key in new if key not in old)
+    removed = sorted(key for key in old if key not in new)
+    modified = sorted(key for key in new if key in old and old[key] != new[key])
+    return added, removed, modified
+
+def watch_mcp_status(claude_json_path: Path, config_lock: ConfigLock,
+                     interval: float = WATCH_POLL_INTERVAL) -> int:
+    """
+    --watch: ~/.claude.json과 프로젝트 .mcp.json 변경을 감시하며 현황을 갱신
+    
+    바뀐 파일만 다시 읽고, mcpServers 맵을 비교해 추가/변경된 서버만 다시 그리며
+    온라인 정보는 처음 보는 패키지만 조회한다. 터미널이면 화면을 다시 그리고,
+    아니면(파이프/로그) 변경 내역만 출력한다.
+    """
+    # 출처: ('global', '') / ('project', 경로) / ('mcp.json', 경로)
+    file_servers = {}   # 파일 -> {출처: mcpServers}
+    online_infos = {}   # online_info_key -> 온라인 정보 (프로세스 동안 유지)
+    blocks = {}         # (출처, 이름) -> 출력 줄 목록
+    changes = []        # 최근 변경 내역
+    interactive = sys.stdout.isatty()
+    
+    def read_file(path: Path) -> Dict[Tuple, Dict[str, Any]]:
+        if path == claude_json_path:
+            try:
+                view = read_config_view(claude_json_path, config_lock)
+            except (OSError, ValueError) as e:
+                changes.append(f"[{datetime.now():%H:%M:%S}] [WARN] 설정 파일 읽기 실패: {e}")
+                return file_servers.get(path, {})  # 쓰는 도중 등: 이전 상태 유지
+            sources = {('global', ''): view.get('mcpServers') or {}}
+            for proj_path, proj_config in (view.get('projects') or {}).items():
+                if isinstance(proj_config, dict) and proj_config.get('mcpServers'):
+                    sources[('project', proj_path)] = proj_config['mcpServers']
+            project_dirs[:] = list((view.get('projects') or {}).keys())
+            return sources
+        return {('mcp.json', str(path.parent)): read_project_mcp_json(path)}
+    
+    def flatten() -> Dict[Tuple, Dict[str, Any]]:
+        return {
+            (source, name): config
+            for sources in file_servers.values()
+            for source, servers in sources.items()
+            for name, config in servers.items()
+            if isinstance(config, dict)
+        }
+    
+    def watched_paths() -> List[Path]:
+        return [claude_json_path] + [Path(p) / '.mcp.json' for p in project_dirs]
+    
+    def refresh_blocks(keys: List[Tuple], servers: Dict[Tuple, Dict[str, Any]]) -> None:
+        targets = {}
+        for key in keys:
+            name, package = key[1], extract_package_name(servers[key])
+            if online_info_key(name, package) not in online_infos:
+                targets[online_info_key(name, package)] = (name, package)
+        if targets:  # 처음 보는 패키지만 온라인 조회
+            online_infos.update(prefetch_online_targets(list(targets.values())))
+            save_info_cache()
+        for key in keys:
+            config = servers[key]
+            info = lookup_online_info(online_infos, key[1], extract_package_name(config))
+            blocks[key] = format_server_block(key[1], config, info)
+    
+    def render(servers: Dict[Tuple, Dict[str, Any]]) -> None:
+        lines = ["=" * 70,
+                 f" MCP 서버 현황 (감시 중: {watcher.backend}, Ctrl+C 종료) - {datetime.now():%Y-%m-%d %H:%M:%S}",
+                 "=" * 70]
+        by_source = {}
+        for source, name in servers:
+            by_source.setdefault(source, []).append(name)
+        for source in sorted(by_source, key=lambda s: (s[0] != 'global', s)):
+            kind, location = source
+            title = {'global': "전역 MCP 서버", 'project': f"프로젝트: {location}",
+                     'mcp.json': f".mcp.json: {location}"}[kind]
+            lines.append(f"\n[{title}] {len(by_source[source])}개")
+            for name in by_source[source]:
+                lines.extend(blocks[(source, name)])
+        if not servers:
+            lines.append("\n등록된 MCP 서버가 없습니다.")
+        lines.append("\n[최근 변경]")
+        lines.extend(f"  {change}" for change in changes[-WATCH_CHANGE_LOG:] or ["  (없음)"])
+        sys.stdout.write("\x1b[H\x1b[2J" + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    project_dirs = []
+    file_servers[claude_json_path] = read_file(claude_json_path)
+    for path in watched_paths()[1:]:
+        file_servers[path] = read_file(path)
+    watcher = ConfigWatcher(watched_paths(), interval)
+    servers = flatten()
+    refresh_blocks(list(servers), servers)
+    if interactive:
+        render(servers)
+    else:
+        print(f"[INFO] 감시 시작 ({watcher.backend}): 서버 {len(servers)}개, 파일 {len(watched_paths())}개")
+    
+    try:
+        while True:
+            for path in watcher.wait():
+                file_servers[path] = read_file(path)
+            
+            # 프로젝트 목록이 바뀌었으면 감시 대상 .mcp.json도 맞춰 갱신
+            paths = watched_paths()
+            watcher.watch(paths)
+            for path in set(file_servers) - set(paths):
+                del file_servers[path]
+            for path in paths:
+                if path not in file_servers:
+                    file_servers[path] = read_file(path)
+            
+            new_servers = flatten()
+            added, removed, modified = diff_server_maps(servers, new_servers)
+            servers = new_servers
+            if not (added or removed or modified):
+                continue
+            
+            refresh_blocks(added + modified, servers)
+            for key in removed:
+                blocks.pop(key, None)
+            stamp = f"{datetime.now():%H:%M:%S}"
+            for symbol, keys in (('+', added), ('-', removed), ('~', modified)):
+                for source, name in keys:
+                    where = "전역" if source[0] == 'global' else source[1]
+                    changes.append(f"[{stamp}] {symbol} {name} ({where})")
+            if interactive:
+                render(servers)
+            else:
+                for change in changes[-(len(added) + len(removed) + len(modified)):]:
+                    print(change, flush=True)
+    except KeyboardInterrupt:
+        print("\n[INFO] 감시 종료")
+    finally:
+        watcher.close()
+    return 0
+
 def create_backup(file_path):
-    """안전한 백업 파일 생성 (예외 처리 포함)"""
+    """안전한 백업 생성 (내용 주소 기반 저장소, 예외 처리 포함) - 백업 기록 또는 None 반환"""
     if not file_path.exists():
         return None
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    import shutil
     backup_dir = file_path.parent / ".claude-backups"
-    backup_path = backup_dir / f"claude_{timestamp}.json"
     
     try:
         # 백업 디렉토리 생성
@@ -442,17 +1299,15 @@ def create_backup(file_path):
             print("[WARN] 디스크 공간 부족 - 백업을 건너뜁니다")
             return None
         
-        # 백업 파일 생성
-        shutil.copy2(file_path, backup_path)
+        # 백업 생성 (같은 내용이 이미 저장되어 있으면 재사용)
+        record = BackupStore(backup_dir).save(file_path)
         
-        # 백업 파일 검증
-        if backup_path.exists() and backup_path.stat().st_size > 0:
-            print(f"[INFO] 백업 생성 완료: {backup_path.name}")
-            return backup_path
+        # 백업 검증
+        if record['size'] > 0:
+            print(f"[INFO] 백업 생성 완료: {record['name']}")
+            return record
         else:
             print("[WARN] 백업 파일 생성 실패")
-            if backup_path.exists():
-                backup_path.unlink()
             return None
             
     except PermissionError as e:
@@ -464,10 +1319,16 @@ def create_backup(file_path):
 
 def atomic_save(file_path, data):
     """원자적 파일 저장 (임시 파일 사용)"""
+    import tempfile
     temp_fd = None
     temp_path = None
     
     try:
+        # 기존 파일은 mcpServers 영역만 교체 (나머지는 재직렬화 없이 그대로 복사)
+        if file_path.exists() and patch_mcp_servers(file_path, data['mcpServers']):
+            print(f"[SUCCESS] 설정 저장 완료: {file_path}")
+            return True
+        
         # 1단계: 임시 파일에 쓰기
         temp_fd, temp_path = tempfile.mkstemp(
             dir=file_path.parent,
@@ -532,7 +1393,142 @@ def atomic_save(file_path, data):
             except (OSError, PermissionError):
                 pass
 
+@profiled('config.read_view')
+def read_config_view(file_path, config_lock):
+    """
+    공유 잠금 아래에서 mcpServers 뷰 읽기 (설정이 바뀌지 않았으면 캐시된 뷰 재사용)
+
+    잠금은 읽는 동안만 보유하므로 온라인 조회/출력 중에는 설치 작업을 막지 않는다.
+    조회는 최선 노력이므로 잠금 대기 시간이 지나면 잠금 없이 읽는다.
+    """
+    if not config_lock.acquire(shared=True, timeout=LOCK_TIMEOUT):
+        print("[WARN] 설정 잠금 대기 시간 초과 - 잠금 없이 읽습니다")
+    try:
+        return load_mcp_view_cached(file_path, config_lock.read_generation())
+    finally:
+        config_lock.release()
+
+@profiled('config.add_installer')
+def add_mcp_installer(file_path, config_lock):
+    """
+    mcp-installer 추가 (배타 잠금 아래에서 최신 설정을 다시 읽고 수정/저장) - 종료 코드 반환
+    """
+    if not config_lock.acquire(timeout=LOCK_TIMEOUT):
+        print("[ERROR] 다른 프로세스가 설정을 수정 중입니다. 잠시 후 다시 시도하세요.")
+        return 1
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # mcpServers가 없으면 생성
+        if 'mcpServers' not in data:
+            data['mcpServers'] = {}
+        
+        # mcp-installer가 이미 있는지 확인
+        if 'mcp-installer' in data['mcpServers']:
+            print("\n[INFO] mcp-installer가 이미 존재합니다.")
+            return 0
+        
+        # mcp-installer 추가 (OS별 분기)
+        if sys.platform == 'win32':
+            data['mcpServers']['mcp-installer'] = {
+                "type": "stdio",
+                "command": "cmd.exe",
+                "args": ["/c", "npx", "-y", "@anaisbetts/mcp-installer"]
+            }
+        elif sys.platform == 'darwin':
+            # macOS
+            data['mcpServers']['mcp-installer'] = {
+                "type": "stdio",
+                "command": "npx",
+                "args": ["-y", "@anaisbetts/mcp-installer"]
+            }
+        else:
+            # Linux 및 기타 Unix
+            data['mcpServers']['mcp-installer'] = {
+                "type": "stdio",
+                "command": "npx",
+                "args": ["-y", "@anaisbetts/mcp-installer"]
+            }
+        
+        # 백업 생성 (실패해도 계속 진행 가능)
+        backup = create_backup(file_path)
+        if not backup:
+            print("[WARN] 백업 생성 실패 - 계속 진행합니다")
+        
+        # 원자적 저장
+        if atomic_save(file_path, data):
+            config_lock.bump_generation()
+            print("\n[SUCCESS] mcp-installer가 추가되었습니다!")
+            if backup:
+                print(f"[INFO] 백업: {backup['name']}")
+            print("[INFO] Claude Code를 재시작하면 변경사항이 적용됩니다.")
+            print("\n[TIP] 더 많은 MCP 서버를 추가하려면: python mcp-installer.py -c config.json")
+            print("[TIP] 보고서 생성: python mcp-status.py --report")
+            return 0
+        
+        print("\n[ERROR] 설정 저장 실패")
+        # 백업에서 복구 시도
+        if backup:
+            try:
+                BackupStore(file_path.parent / ".claude-backups").restore(backup, file_path)
+                config_lock.bump_generation()
+                print("[INFO] 백업에서 복구 완료")
+            except Exception as e:
+                print(f"[ERROR] 백업 복구 실패: {e}")
+        return 1
+    finally:
+        config_lock.release()
+
+def get_profile_format() -> Optional[str]:
+    """--profile [text|json|chrome] / --profile=형식 옵션 값 (지정하지 않았으면 None)"""
+    formats = ('text', 'json', 'chrome')
+    for i, arg in enumerate(sys.argv[1:], 1):
+        if arg == '--profile':
+            # mcp-installer.py(nargs='?')와 같이 다음 인자가 형식이면 사용
+            if i + 1 < len(sys.argv) and sys.argv[i + 1] in formats:
+                return sys.argv[i + 1]
+            return 'text'
+        if arg.startswith('--profile='):
+            value = arg.split('=', 1)[1]
+            if value in formats:
+                return value
+            print(f"[WARN] --profile 값이 올바르지 않습니다 ({value}) - text 사용")
+            return 'text'
+    return None
+
+def get_log_file() -> Optional[str]:
+    """--log-file [경로] / --log-file=경로 옵션 값 (경로 생략 시 기본 작업 로그 파일, mcp-installer.py와 동일)"""
+    for i, arg in enumerate(sys.argv[1:], 1):
+        if arg == '--log-file':
+            value = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+            return value if value and not value.startswith('-') else str(OPLOG_FILE)
+        if arg.startswith('--log-file='):
+            return arg.split('=', 1)[1] or str(OPLOG_FILE)
+    return None
+
 def main():
+    # 현황 출력이 stdout을 쓰므로 작업 이벤트는 파일/지표로만 기록 (MCP_LOG_FORMAT 무시)
+    OPLOG.configure('mcp-status', 'text', get_log_file(), get_arg_value('--metrics-file', None))
+    profile_format = get_profile_format()
+    if profile_format:
+        PROFILER.enable()
+    try:
+        with OPLOG.operation('run', command='add' if '--add' in sys.argv else
+                             'update-index' if '--update-index' in sys.argv else
+                             'watch' if '--watch' in sys.argv else 'report' if '--report' in sys.argv else 'status') as op:
+            exit_code = run_status()
+            op.outcome = 'ok' if not exit_code else 'failed'
+            op.fields['exit_code'] = exit_code
+        return exit_code
+    finally:
+        if profile_format:
+            PROFILER.report(profile_format, get_arg_value('--profile-output', None))
+        OPLOG.close()
+
+def run_status():
+    """현황 출력 / 보고서 / --add / --watch 실행 (종료 코드 반환)"""
     # Windows 콘솔 인코딩 설정 (메인 함수 시작 시)
     if sys.platform == 'win32':
         try:
@@ -546,22 +1542,53 @@ def main():
     # 파일 경로 (크로스 플럏폼 지원)
     claude_json_path = Path.home() / ".claude.json"
     
+    # 캐시 옵션 처리
+    CACHE_OPTIONS['refresh'] = '--refresh' in sys.argv
+    CACHE_OPTIONS['offline'] = '--offline' in sys.argv
+    REGISTRY_OPTIONS['abbreviated'] = '--abbreviated' in sys.argv
+    # 동시 조회 수만큼 유휴 연결을 유지해야 선조회 스레드가 모두 연결을 재사용함
+    REGISTRY_POOL.max_idle = max(REGISTRY_MAX_IDLE, get_arg_value('--jobs', PREFETCH_MAX_WORKERS, int))
+    
+    if '--update-index' in sys.argv:
+        if CACHE_OPTIONS['offline']:
+            print("[ERROR] --update-index는 --offline과 함께 사용할 수 없습니다")
+            return 1
+        return update_metadata_index(get_arg_value('--jobs', PREFETCH_MAX_WORKERS, int),
+                                     get_arg_value('--deadline', PREFETCH_DEADLINE, float))
+    
     print("[INFO] Claude Code CLI 설정 파일 분석 중...")
-    print("[INFO] 온라인 MCP 정보 검색 중...")
+    if CACHE_OPTIONS['offline']:
+        print("[INFO] 오프라인 모드 - 캐시 및 오프라인 색인의 MCP 정보만 사용합니다")
+    else:
+        print("[INFO] 온라인 MCP 정보 검색 중...")
+    load_info_cache()
+    config_lock = ConfigLock(claude_json_path.parent / ".claude.lock")
     
     try:
-        # JSON 파일 읽기
-        with open(claude_json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # 실시간 감시 모드
+        if '--watch' in sys.argv:
+            return watch_mcp_status(claude_json_path, config_lock,
+                                    get_arg_value('--interval', WATCH_POLL_INTERVAL, float))
+        
+        # mcpServers만 읽기 (공유 잠금, 변경 없으면 캐시된 뷰 재사용)
+        # --add는 출력 후 배타 잠금 아래에서 전체 설정을 다시 읽어 수정한다
+        data = read_config_view(claude_json_path, config_lock)
+        
+        # 온라인 정보 일괄 선조회 (병렬, 마감시간 적용)
+        online_infos = prefetch_mcp_online_info(
+            data,
+            max_workers=get_arg_value('--jobs', PREFETCH_MAX_WORKERS, int),
+            deadline=get_arg_value('--deadline', PREFETCH_DEADLINE, float)
+        )
         
         # MCP 현황 상세 출력
-        print_mcp_status(data)
+        print_mcp_status(data, online_infos)
         
         # --report 옵션 처리
         if '--report' in sys.argv:
             try:
                 # Markdown 보고서 생성
-                report_content = generate_markdown_report(data)
+                report_content = generate_markdown_report(data, online_infos)
                 
                 # doc 폴더 생성 (없으면)
                 doc_dir = Path.cwd() / 'doc'
@@ -580,59 +1607,7 @@ def main():
         
         # 사용자 입력 처리
         if len(sys.argv) > 1 and sys.argv[1] == '--add':
-            # mcpServers가 없으면 생성
-            if 'mcpServers' not in data:
-                data['mcpServers'] = {}
-            
-            # mcp-installer가 이미 있는지 확인
-            if 'mcp-installer' in data['mcpServers']:
-                print("\n[INFO] mcp-installer가 이미 존재합니다.")
-            else:
-                # mcp-installer 추가 (OS별 분기)
-                if sys.platform == 'win32':
-                    data['mcpServers']['mcp-installer'] = {
-                        "type": "stdio",
-                        "command": "cmd.exe",
-                        "args": ["/c", "npx", "-y", "@anaisbetts/mcp-installer"]
-                    }
-                elif sys.platform == 'darwin':
-                    # macOS
-                    data['mcpServers']['mcp-installer'] = {
-                        "type": "stdio",
-                        "command": "npx",
-                        "args": ["-y", "@anaisbetts/mcp-installer"]
-                    }
-                else:
-                    # Linux 및 기타 Unix
-                    data['mcpServers']['mcp-installer'] = {
-                        "type": "stdio",
-                        "command": "npx",
-                        "args": ["-y", "@anaisbetts/mcp-installer"]
-                    }
-                
-                # 백업 생성 (실패해도 계속 진행 가능)
-                backup_path = create_backup(claude_json_path)
-                if not backup_path:
-                    print("[WARN] 백업 생성 실패 - 계속 진행합니다")
-                
-                # 원자적 저장
-                if atomic_save(claude_json_path, data):
-                    print("\n[SUCCESS] mcp-installer가 추가되었습니다!")
-                    if backup_path:
-                        print(f"[INFO] 백업 파일: {backup_path.name}")
-                    print("[INFO] Claude Code를 재시작하면 변경사항이 적용됩니다.")
-                    print("\n[TIP] 더 많은 MCP 서버를 추가하려면: python mcp-installer.py -c config.json")
-                    print("[TIP] 보고서 생성: python mcp-status.py --report")
-                else:
-                    print("\n[ERROR] 설정 저장 실패")
-                    # 백업에서 복구 시도
-                    if backup_path and backup_path.exists():
-                        try:
-                            shutil.copy2(backup_path, claude_json_path)
-                            print("[INFO] 백업에서 복구 완료")
-                        except Exception as e:
-                            print(f"[ERROR] 백업 복구 실패: {e}")
-                    return 1
+            return add_mcp_installer(claude_json_path, config_lock)
         
     except FileNotFoundError:
         print(f"[ERROR] Claude 설정 파일을 찾을 수 없습니다: {claude_json_path}")
@@ -645,6 +1620,10 @@ def main():
     except Exception as e:
         print(f"[ERROR] 오류 발생: {e}")
         return 1
+    finally:
+        # 온라인 정보 캐시 저장 (다음 실행에서 재사용)
+        save_info_cache()
+        REGISTRY_POOL.close()
     
     return 0
 
@@ -0,0 +1,1816 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+파일명: mcp_common.py
+기능 요약: mcp-installer.py / mcp-status.py 공용 설정 파일 처리 모듈
+          대용량 ~/.claude.json 읽기 등 두 스크립트가 함께 쓰는 기능
+
+File History:
+  2026.10.17 PM01:00 초기 버전 생성 - 스트리밍 방식 mcpServers 추출 기능
+  2026.10.17 PM02:00 mcpServers 영역만 교체하는 부분 패치 저장 기능 추가
+  2026.10.17 PM07:00 내용 주소 기반(SHA-256) 중복 제거 백업 저장소 추가
+  2026.10.17 PM08:00 스냅샷 + JSON 델타 백업 체인, 시점 복원(BackupStore.at) 추가
+  2026.10.17 PM09:00 manifest 인덱스 헤더 및 자가 복구(rebuild), 이전 방식 백업 이관
+  2026.10.17 PM10:00 커널 advisory 잠금(ConfigLock: flock 공유/배타, 타임아웃) 추가
+  2026.10.17 PM11:00 설정 세대 번호 및 지문 기반 조회 뷰 캐시(load_mcp_view_cached) 추가
+  2026.10.18 AM02:00 stdio MCP 서버 실행 점검(initialize + tools/list 핸드셰이크, 병렬/마감시간) 추가
+  2026.10.18 AM04:00 npx/uvx 항목의 로컬 진입점 직접 실행 변환 제안(plan_direct_launch) 추가
+  2026.10.18 AM06:00 구간 계측(PROFILER: 단계별 시간 집계, JSON/Chrome trace 출력) 추가
+  2026.10.18 AM07:00 구조화 작업 로그(OPLOG: JSON lines, 회전 파일) 및 Prometheus textfile 지표 추가
+  2026.10.18 AM08:00 subprocess/hashlib/tempfile/shutil/스레드 풀 등을 사용하는 함수 안에서 지연 임포트
+  2026.10.18 PM04:00 32MB 미만 설정 파일은 json.load로 읽고, 스트리밍 시 바이트 위치는 부분 패치에서만 추적
+  2026.10.18 PM05:00 조회 뷰 캐시를 json.dumps로 한 번에 기록 (json.dump의 조각 단위 쓰기 제거)
+=====================================================================
+"""
+
+import functools
+import importlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_WS_RE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+_READ_CHUNK = 1024 * 1024
+# 이 크기 미만의 설정 파일은 json.load(C 구현)로 한 번에 읽는 편이 빠르다
+VIEW_STREAM_THRESHOLD = 32 * 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# 구간 계측 (--profile): 잠금/파싱/백업/fsync/검증/네트워크 등 단계별 소요 시간
+# ---------------------------------------------------------------------------
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 쓰는 아무 일도 하지 않는 구간"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'args', 'start', 'children')
+
+    def __init__(self, profiler: 'SpanProfiler', name: str, args: Optional[Dict[str, Any]]):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.children = 0.0
+
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        stack = self.profiler._stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].children += duration
+        self.profiler._record(self, duration, len(stack))
+        return False
+
+
+class SpanProfiler:
+    """
+    가벼운 구간 계측기
+
+    span(name)은 with 블록의, profiled(name)은 함수 호출의 소요 시간을 기록한다.
+    꺼져 있으면 플래그 확인 한 번만 하고 원래 함수를 호출하므로 비용은 무시할 수 있다.
+    스레드별로 중첩을 추적해 구간마다 전체 시간과 하위 구간을 뺀 자체 시간을 집계한다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.origin = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: _Span, duration: float, depth: int) -> None:
+        with self._lock:
+            self.events.append({
+                'name': span.name, 'start': span.start - self.origin, 'duration': duration,
+                'self': duration - span.children, 'depth': depth,
+                'thread': threading.get_ident(), 'args': span.args,
+            })
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """구간 이름별 호출 수, 전체/자체/최대 시간(초) - 자체 시간 큰 순"""
+        phases = {}
+        for event in self.events:
+            phase = phases.setdefault(event['name'], {'phase': event['name'], 'calls': 0, 'total': 0.0,
+                                                      'self': 0.0, 'max': 0.0})
+            phase['calls'] += 1
+            phase['total'] += event['duration']
+            phase['self'] += event['self']
+            phase['max'] = max(phase['max'], event['duration'])
+        return sorted(phases.values(), key=lambda p: p['self'], reverse=True)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """chrome://tracing / Perfetto에서 열 수 있는 Trace Event 형식"""
+        pid = os.getpid()
+        return {'traceEvents': [
+            {'name': e['name'], 'ph': 'X', 'pid': pid, 'tid': e['thread'],
+             'ts': round(e['start'] * 1e6, 1), 'dur': round(e['duration'] * 1e6, 1), 'args': e['args'] or {}}
+            for e in self.events
+        ], 'displayTimeUnit': 'ms'}
+
+    def report(self, fmt: str = 'text', output: Optional[str] = None) -> None:
+        """계측 결과 출력 (text: 단계별 표, json: 구간 목록+요약, chrome: trace 파일)"""
+        wall = time.perf_counter() - self.origin
+        if fmt == 'chrome':
+            text = json.dumps(self.chrome_trace())
+        elif fmt == 'json':
+            text = json.dumps({'wall': wall, 'phases': self.summary(), 'spans': self.events}, ensure_ascii=False)
+        else:
+            # 스레드에서 실행된 구간(병렬 조회 등)은 자체 시간 합이 실제 경과 시간보다 클 수 있다
+            lines = [f"{'단계':<32} {'호출':>6} {'전체 ms':>10} {'자체 ms':>10} {'최대 ms':>10} {'비율':>6}"]
+            for phase in self.summary():
+                lines.append(f"{phase['phase']:<32} {phase['calls']:>6} {phase['total'] * 1000:>10.1f} "
+                             f"{phase['self'] * 1000:>10.1f} {phase['max'] * 1000:>10.1f} "
+                             f"{phase['self'] / wall if wall else 0:>6.1%}")
+            measured = sum(e['duration'] for e in self.events if e['depth'] == 0
+                           and e['thread'] == threading.main_thread().ident)
+            lines.append(f"{'(계측 외)':<32} {'':>6} {max(0.0, wall - measured) * 1000:>10.1f}")
+            lines.append(f"{'전체 경과':<32} {'':>6} {wall * 1000:>10.1f}")
+            text = '\n'.join(lines)
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        else:
+            print(text, file=sys.stderr)
+
+
+PROFILER = SpanProfiler()
+
+
+def profiled(name: str):
+    """함수 호출 구간 계측 데코레이터 (PROFILER가 꺼져 있으면 그대로 호출)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            with _Span(PROFILER, name, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _StreamingJSONReader:
+    """
+    파일을 청크 단위로 읽으며 JSON 값을 하나씩 디코딩하는 리더
+
+    각 값은 json.JSONDecoder.raw_decode(C 구현)로 파싱하되, 필요 없는 값은
+    바로 버리므로 메모리에는 읽기 버퍼와 현재 값 하나만 남는다.
+    값이 버퍼 끝에서 잘린 경우 남은 부분 크기만큼 더 읽어 다시 시도한다.
+    바이트 위치(byte_pos)는 track_bytes=True일 때만 추적한다 (버린 부분을 매번 인코딩하지 않도록).
+    """
+
+    def __init__(self, f, track_bytes: bool = False):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.offset = 0  # buf[0]의 파일 내 문자 위치 (오류 메시지용)
+        self.byte_offset = 0  # buf[0]의 파일 내 바이트 위치 (부분 패치용)
+        self.track_bytes = track_bytes
+        self.eof = False
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, '', self.offset + self.pos)
+
+    def _fill(self, size: int = _READ_CHUNK) -> bool:
+        """버퍼에 데이터 추가 (이미 소비한 앞부분은 버림), 더 읽을 것이 없으면 False"""
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.offset += self.pos
+            if self.track_bytes:
+                self.byte_offset += len(self.buf[:self.pos].encode('utf-8'))
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def byte_pos(self) -> int:
+        """현재 위치의 파일 내 바이트 오프셋"""
+        return self.byte_offset + len(self.buf[:self.pos].encode('utf-8'))
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 반환 (파일 끝이면 빈 문자열)"""
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch: str, msg: str) -> None:
+        if self.peek() != ch:
+            raise self._error(msg)
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값을 디코딩하여 반환"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # 버퍼 끝에서 끝난 숫자 등은 잘렸을 수 있으므로 더 읽고 재확인
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise json.JSONDecodeError(e.msg, '', self.offset + e.pos)
+            self._fill(max(_READ_CHUNK, len(self.buf) - self.pos))
+
+    def members(self):
+        """객체의 키를 하나씩 반환 (호출자가 각 키 뒤의 값을 소비해야 함)"""
+        self.expect('{', "Expecting '{'")
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(':', "Expecting ':' delimiter")
+            yield key
+            c = self.peek()
+            self.pos += 1
+            if c == '}':
+                return
+            if c != ',':
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+
+@profiled('parse.mcp_view')
+def load_mcp_view(path: Path) -> Dict[str, Any]:
+    """
+    ~/.claude.json에서 mcpServers와 각 프로젝트의 mcpServers만 읽기 (읽기 전용)
+
+    VIEW_STREAM_THRESHOLD 이상인 파일은 전체를 한 번에 파싱하지 않고 값 단위로 읽어
+    필요한 부분만 남기므로 대화 기록 등으로 수십 MB가 된 설정 파일도 적은 메모리로 읽는다.
+    그보다 작은 파일은 json.load가 더 빠르므로 전체를 읽은 뒤 같은 형태로 추려 반환한다.
+    반환값은 {'mcpServers': ..., 'projects': {경로: {'mcpServers': ...}}} 형태의
+    부분 문서이므로 저장(쓰기)에 사용하면 안 된다.
+
+    Raises:
+        FileNotFoundError: 파일이 없는 경우
+        json.JSONDecodeError: 문서 구조가 올바르지 않은 경우
+    """
+    view = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if os.fstat(f.fileno()).st_size < VIEW_STREAM_THRESHOLD:
+            data = json.load(f)
+            if not isinstance(data, dict):
+                raise json.JSONDecodeError("Expecting '{'", '', 0)
+            if 'mcpServers' in data:
+                view['mcpServers'] = data['mcpServers']
+            if isinstance(data.get('projects'), dict):
+                view['projects'] = {
+                    proj_path: ({'mcpServers': proj_config['mcpServers']}
+                                if isinstance(proj_config, dict) and 'mcpServers' in proj_config else {})
+                    for proj_path, proj_config in data['projects'].items()
+                }
+            return view
+
+        reader = _StreamingJSONReader(f)
+        for key in reader.members():
+            if key == 'projects' and reader.peek() == '{':
+                projects = view['projects'] = {}
+                for proj_path in reader.members():
+                    proj_config = reader.value()
+                    projects[proj_path] = (
+                        {'mcpServers': proj_config['mcpServers']}
+                        if isinstance(proj_config, dict) and 'mcpServers' in proj_config else {}
+                    )
+            elif key == 'mcpServers':
+                view['mcpServers'] = reader.value()
+            else:
+                reader.value()
+        if reader.peek():
+            raise reader._error("Extra data")
+    return view
+
+
+# 조회용 mcpServers 뷰 캐시 (설정이 바뀌지 않았으면 대용량 설정 파일을 다시 읽지 않음)
+VIEW_CACHE_FILE = Path.home() / ".claude-mcp-cache" / "config-view.json"
+
+
+def config_fingerprint(path: Path, generation: int) -> Dict[str, Any]:
+    """
+    설정 파일 변경 판별용 지문
+
+    세대 번호는 이 도구들의 쓰기를, stat 정보는 Claude Code 등 외부 프로그램의
+    쓰기를 감지한다 (mtime 해상도가 낮은 파일 시스템에서도 세대 번호로 구분).
+    """
+    st = os.stat(path)
+    return {
+        'path': str(path),
+        'generation': generation,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'ctime_ns': st.st_ctime_ns,
+        'ino': st.st_ino,
+    }
+
+
+def load_mcp_view_cached(path: Path, generation: int, cache_path: Path = VIEW_CACHE_FILE) -> Dict[str, Any]:
+    """
+    load_mcp_view + 지문 기반 캐시
+
+    지문이 같으면 캐시된 뷰를 그대로 반환하고, 다르면 다시 읽어 캐시를 갱신한다.
+    캐시 쓰기 실패는 무시한다.
+
+    Raises:
+        FileNotFoundError, json.JSONDecodeError: load_mcp_view와 같음
+    """
+    fingerprint = config_fingerprint(path, generation)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('fingerprint') == fingerprint:
+            return cached['view']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    view = load_mcp_view(path)
+    import tempfile  # 캐시를 새로 쓸 때만 필요 (적중 시 임포트하지 않음)
+    temp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, prefix='.view_tmp_')
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+            # json.dump는 순수 파이썬 조각 단위로 쓰므로 C 인코더(json.dumps)로 한 번에 기록
+            f.write(json.dumps({'fingerprint': fingerprint, 'view': view}, ensure_ascii=False))
+        os.replace(temp_path, cache_path)
+        temp_path = None
+    except OSError:
+        pass
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return view
+
+
+def locate_mcp_servers(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    최상위 mcpServers 값의 바이트 범위 (시작, 끝) 반환
+
+    mcpServers를 찾으면 나머지 문서는 읽지 않는다. 키가 없으면 None.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = _StreamingJSONReader(f, track_bytes=True)
+        for key in reader.members():
+            if key == 'mcpServers':
+                reader.peek()
+                start = reader.byte_pos()
+                value = reader.value()
+                if not isinstance(value, dict):
+                    return None
+                return start, reader.byte_pos()
+            reader.value()
+    return None
+
+
+def _line_indent(f, pos: int) -> bytes:
+    """pos가 속한 줄의 앞쪽 들여쓰기 반환"""
+    head_start = max(0, pos - 4096)
+    f.seek(head_start)
+    head = f.read(pos - head_start)
+    line = head[head.rfind(b'\n') + 1:]
+    return line[:len(line) - len(line.lstrip(b' \t'))]
+
+
+def _copy_range(src, dst, offset: int, count: int) -> None:
+    """src 파일의 [offset, offset+count) 범위를 dst 현재 위치에 복사 (가능하면 커널 내 복사)"""
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    dst.flush()
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, count, offset)
+                if copied == 0:
+                    break
+                offset += copied
+                count -= copied
+            dst.seek(0, os.SEEK_END)
+            if count == 0:
+                return
+        except OSError:
+            pass  # 파일 시스템 미지원 (EXDEV, ENOSYS 등) - 일반 복사로 대체
+    if sys.platform != 'win32' and hasattr(os, 'sendfile'):
+        try:
+            while count > 0:
+                copied = os.sendfile(dst_fd, src_fd, offset, count)
+                if copied == 0:
+                    break
+                offset += copied
+                count -= copied
+            dst.seek(0, os.SEEK_END)
+            if count == 0:
+                return
+        except OSError:
+            pass
+    src.seek(offset)
+    while count > 0:
+        chunk = src.read(min(count, _READ_CHUNK))
+        if not chunk:
+            raise IOError("원본 파일이 복사 중에 잘렸습니다")
+        dst.write(chunk)
+        count -= len(chunk)
+
+
+@profiled('save.patch_mcp_servers')
+def patch_mcp_servers(path: Path, servers: Dict[str, Any], indent: int = 2) -> bool:
+    """
+    설정 파일의 mcpServers 영역만 새 값으로 교체하여 원자적으로 저장
+
+    mcpServers 앞뒤의 나머지 바이트는 다시 직렬화하지 않고 그대로 복사하며
+    (copy_file_range/sendfile 지원 시 커널 내 복사), 검증도 교체한 영역만 수행한다.
+    임시 파일 → fsync → 원자적 교체 순서는 전체 저장과 동일하다.
+
+    Returns:
+        True: 패치 저장 완료
+        False: 최상위 mcpServers 객체가 없어 패치 불가 (호출자가 전체 저장으로 대체)
+
+    Raises:
+        json.JSONDecodeError: 원본 문서 구조가 올바르지 않은 경우
+        OSError, ValueError: 쓰기 또는 검증 실패
+    """
+    import tempfile
+    located = locate_mcp_servers(path)
+    if located is None:
+        return False
+    start, end = located
+
+    temp_path = None
+    try:
+        with open(path, 'rb') as src:
+            size = os.fstat(src.fileno()).st_size
+            pad = _line_indent(src, start)
+            new_bytes = json.dumps(servers, indent=indent, ensure_ascii=False).encode('utf-8')
+            if indent is not None and pad:
+                new_bytes = new_bytes.replace(b'\n', b'\n' + pad)
+
+            temp_fd, temp_path = tempfile.mkstemp(
+                dir=path.parent,
+                prefix='.claude_tmp_',
+                suffix='.json'
+            )
+            with os.fdopen(temp_fd, 'w+b') as dst:
+                _copy_range(src, dst, 0, start)
+                dst.write(new_bytes)
+                _copy_range(src, dst, end, size - end)
+                dst.flush()
+                with PROFILER.span('fsync'):
+                    os.fsync(dst.fileno())
+
+                # 교체한 영역만 검증 (크기 및 JSON 유효성)
+                if dst.seek(0, os.SEEK_END) != size - (end - start) + len(new_bytes):
+                    raise IOError("패치된 파일 크기가 예상과 다릅니다")
+                dst.seek(start)
+                if not isinstance(json.loads(dst.read(len(new_bytes)).decode('utf-8')), dict):
+                    raise ValueError("mcpServers 필드가 올바르지 않습니다")
+
+        # 원자적 교체
+        if sys.platform == 'win32':
+            if path.exists():
+                path.unlink()
+            os.rename(temp_path, path)
+        else:
+            os.replace(temp_path, path)
+        temp_path = None
+        return True
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+# 백업 압축 방식별 (모듈, 파일 확장자)
+BACKUP_CODECS = {
+    'zlib': ('zlib', '.z'),
+    'lzma': ('lzma', '.xz'),
+    'none': (None, '.json'),
+}
+
+
+def _codec_module(codec: str):
+    module_name = BACKUP_CODECS[codec][0]
+    return importlib.import_module(module_name) if module_name else None
+
+
+# 백업 보존 정책 (델타 저장이므로 많은 리비전을 저렴하게 유지)
+BACKUP_MAX_KEEP = 1000
+BACKUP_MAX_AGE_DAYS = 90
+
+# 델타 백업에서 항목 단위로 비교하는 최상위 키 (나머지 키는 값 전체 비교)
+DELTA_NESTED_KEYS = ('mcpServers', 'projects')
+
+
+def diff_json_documents(old: Dict[str, Any], new: Dict[str, Any]) -> List[list]:
+    """
+    두 설정 문서의 JSON 델타 계산
+
+    Returns:
+        [['set', [키 경로], 값] | ['del', [키 경로]], ...]
+        mcpServers/projects는 서버·프로젝트 단위, 그 외 최상위 키는 값 전체 단위
+    """
+    ops = []
+    for key in old:
+        if key not in new:
+            ops.append(['del', [key]])
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        previous = old.get(key)
+        if key in DELTA_NESTED_KEYS and isinstance(value, dict) and isinstance(previous, dict):
+            for sub_key in previous:
+                if sub_key not in value:
+                    ops.append(['del', [key, sub_key]])
+            for sub_key, sub_value in value.items():
+                if sub_key not in previous or previous[sub_key] != sub_value:
+                    ops.append(['set', [key, sub_key], sub_value])
+        else:
+            ops.append(['set', [key], value])
+    return ops
+
+
+def apply_json_delta(doc: Dict[str, Any], ops: List[list]) -> Dict[str, Any]:
+    """diff_json_documents 결과를 doc에 적용 (제자리 수정)"""
+    for op in ops:
+        target = doc
+        for key in op[1][:-1]:
+            target = target.setdefault(key, {})
+        if op[0] == 'set':
+            target[op[1][-1]] = op[2]
+        else:
+            target.pop(op[1][-1], None)
+    return doc
+
+
+def canonical_json_hash(doc: Any) -> str:
+    """키 순서·공백과 무관한 JSON 문서 해시 (델타 재생 검증용)"""
+    import hashlib
+    canonical = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class BackupStore:
+    """
+    내용 주소 기반(content-addressed) 백업 저장소
+
+    .claude-backups/
+        objects/<sha256 앞 2자리>/<sha256><확장자>   설정 파일 내용 (압축 가능)
+        manifest.jsonl                              백업 인덱스 (헤더 + 한 줄에 기록 하나, 추가 전용)
+
+    같은 내용의 설정 파일은 blob 하나만 저장하고 manifest에 시각만 추가하므로
+    변경이 없는 백업은 디스크를 거의 쓰지 않는다.
+
+    기록은 전체 스냅샷(kind='full')과 직전 기록 대비 JSON 델타(kind='delta')로
+    나뉜다. 델타는 SNAPSHOT_INTERVAL개마다 새 스냅샷으로 끊기므로 어느 시점이든
+    스냅샷 하나 + 최대 SNAPSHOT_INTERVAL개 델타 재생으로 복원된다.
+
+    보존 정리와 최신 백업 조회는 manifest만 읽으며 디렉토리를 나열하지 않는다.
+    manifest가 유실·손상되었거나 blob과 맞지 않으면 rebuild()로 다시 만든다.
+    """
+
+    MANIFEST_NAME = 'manifest.jsonl'
+    INDEX_VERSION = 2
+    LEGACY_PATTERN = 'claude_*.json'  # 저장소 도입 전의 전체 복사본 백업
+    SNAPSHOT_INTERVAL = 100
+
+    def __init__(self, backup_dir: Path, compression: str = 'zlib'):
+        if compression not in BACKUP_CODECS:
+            raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+        self.backup_dir = Path(backup_dir)
+        self.objects_dir = self.backup_dir / 'objects'
+        self.manifest_path = self.backup_dir / self.MANIFEST_NAME
+        self.compression = compression
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}{BACKUP_CODECS[codec][1]}"
+
+    def _find_blob(self, digest: str) -> Optional[Tuple[Path, str]]:
+        """이미 저장된 blob 찾기 (압축 방식과 무관)"""
+        for codec in BACKUP_CODECS:
+            path = self._blob_path(digest, codec)
+            if path.exists():
+                return path, codec
+        return None
+
+    def _load(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        manifest 읽기
+
+        Returns:
+            (백업 기록 목록, 정상 여부) - 헤더가 없거나(이전 형식/유실) 손상된 줄이
+            있으면 정상 아님 → rebuild() 대상
+        """
+        records = []
+        healthy = True
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                try:
+                    healthy = json.loads(header).get('index') == self.INDEX_VERSION
+                except (json.JSONDecodeError, AttributeError):
+                    healthy = False
+                lines = f if healthy else [header, *f]
+                for line in lines:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        healthy = False
+                        continue
+                    if isinstance(record, dict) and 'sha256' in record and 'name' in record:
+                        records.append(record)
+        except FileNotFoundError:
+            healthy = not self.backup_dir.exists()
+        return records, healthy
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """manifest의 백업 기록 목록 (오래된 것부터, 손상된 줄은 무시)"""
+        return self._load()[0]
+
+    def _checked_entries(self) -> List[Dict[str, Any]]:
+        """쓰기 작업용 기록 목록 (manifest가 정상이 아니면 먼저 재구성)"""
+        records, healthy = self._load()
+        return records if healthy else self.rebuild()
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """가장 최근 백업 기록"""
+        records = self.entries()
+        return records[-1] if records else None
+
+    def find(self, name: str) -> Optional[Dict[str, Any]]:
+        """이름으로 백업 기록 찾기 (같은 이름이면 최신 기록)"""
+        for record in reversed(self.entries()):
+            if record['name'] == name:
+                return record
+        return None
+
+    def _append_manifest(self, record: Dict[str, Any]) -> None:
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
+                f.write(json.dumps({'index': self.INDEX_VERSION}) + '\n')
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            with PROFILER.span('fsync'):
+                os.fsync(f.fileno())
+
+    def _write_manifest(self, records: List[Dict[str, Any]]) -> None:
+        """manifest 전체를 원자적으로 다시 쓰기 (정리 작업용)"""
+        import tempfile
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.backup_dir, prefix='.manifest_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'index': self.INDEX_VERSION}) + '\n')
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.manifest_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _write_blob(self, digest: str, content: bytes) -> Tuple[Path, str]:
+        """blob 저장 (이미 같은 내용이 있으면 재사용)"""
+        import tempfile
+        existing = self._find_blob(digest)
+        if existing:
+            return existing
+
+        codec = self.compression
+        module = _codec_module(codec)
+        data = module.compress(content) if module else content
+        path = self._blob_path(digest, codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.blob_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                with PROFILER.span('fsync'):
+                    os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return path, codec
+
+    def _read_blob(self, digest: str, name: str) -> bytes:
+        """blob 읽기 (압축 해제 + SHA-256 검증)"""
+        import hashlib
+        found = self._find_blob(digest)
+        if not found:
+            raise FileNotFoundError(f"백업 데이터가 없습니다: {name} ({digest[:12]})")
+        path, codec = found
+        with open(path, 'rb') as f:
+            data = f.read()
+        module = _codec_module(codec)
+        content = module.decompress(data) if module else data
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise ValueError(f"백업 데이터 해시가 일치하지 않습니다: {name}")
+        return content
+
+    @staticmethod
+    def _index_of(records: List[Dict[str, Any]], record: Dict[str, Any]) -> int:
+        for index in range(len(records) - 1, -1, -1):
+            if records[index]['name'] == record['name'] and records[index].get('time') == record.get('time'):
+                return index
+        raise KeyError(f"manifest에 없는 백업 기록: {record['name']}")
+
+    @staticmethod
+    def _chain_start(records: List[Dict[str, Any]], index: int) -> int:
+        """index 기록을 복원하는 데 필요한 가장 가까운 전체 스냅샷 위치"""
+        start = index
+        while start >= 0 and records[start].get('kind') == 'delta':
+            start -= 1
+        if start < 0:
+            raise ValueError(f"기준 스냅샷이 없는 델타 백업입니다: {records[index]['name']}")
+        return start
+
+    def _materialize(self, records: List[Dict[str, Any]], index: int) -> Any:
+        """스냅샷부터 델타를 순서대로 적용해 index 시점의 JSON 문서 복원"""
+        start = self._chain_start(records, index)
+        doc = json.loads(self._read_blob(records[start]['sha256'], records[start]['name']))
+        for record in records[start + 1:index + 1]:
+            apply_json_delta(doc, json.loads(self._read_blob(record['patch'], record['name'])))
+        return doc
+
+    def _try_delta(self, records: List[Dict[str, Any]], content: bytes,
+                   digest: str) -> Optional[Tuple[bytes, Any]]:
+        """
+        직전 백업 대비 델타 계산 (델타가 적합하지 않으면 None → 전체 스냅샷)
+
+        체인 길이가 SNAPSHOT_INTERVAL에 이르렀거나 누적 델타 크기가 원본보다
+        커지면 새 스냅샷을 만들어 복원 시 적용할 델타 수를 제한한다.
+        """
+        if not records:
+            return None
+        last = len(records) - 1
+        try:
+            start = self._chain_start(records, last)
+        except ValueError:
+            return None
+        chain = records[start + 1:]
+        if len(chain) >= self.SNAPSHOT_INTERVAL:
+            return None
+
+        try:
+            doc = json.loads(content)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        if not isinstance(doc, dict):
+            return None
+
+        if records[last]['sha256'] == digest:
+            ops = []  # 직전 백업과 내용이 같음
+        else:
+            try:
+                previous = self._materialize(records, last)
+            except (OSError, ValueError):
+                return None  # 직전 백업을 복원할 수 없으면 새 스냅샷으로 체인 재시작
+            if not isinstance(previous, dict):
+                return None
+            ops = diff_json_documents(previous, doc)
+
+        patch = json.dumps(ops, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if sum(r.get('patch_size', 0) for r in chain) + len(patch) > len(content):
+            return None
+        return patch, doc
+
+    @profiled('backup.store_save')
+    def save(self, source: Path) -> Dict[str, Any]:
+        """
+        설정 파일을 백업하고 기록 반환
+
+        같은 내용의 blob이 이미 있으면 재사용하고, 그렇지 않으면 직전 백업 대비
+        mcpServers/projects 단위 JSON 델타로 저장한다 (주기적으로 전체 스냅샷).
+
+        Returns:
+            {'name', 'time', 'sha256', 'size', 'kind', 'codec', 'stored', 'deduplicated', ...}
+
+        Raises:
+            OSError: 읽기/쓰기 실패
+        """
+        import hashlib
+        with open(source, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        records = self._checked_entries()
+
+        now = time.time()
+        record = {
+            'name': f"claude_{datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S_%f')[:-3]}",
+            'time': now,
+            'sha256': digest,
+            'size': len(content),
+        }
+
+        deduplicated = self._find_blob(digest) is not None
+        delta = None if deduplicated else self._try_delta(records, content, digest)
+        if delta:
+            patch, doc = delta
+            patch_digest = hashlib.sha256(patch).hexdigest()
+            blob_path, codec = self._write_blob(patch_digest, patch)
+            record.update(kind='delta', patch=patch_digest, patch_size=len(patch), doc=canonical_json_hash(doc))
+            deduplicated = patch == b'[]'
+        else:
+            blob_path, codec = self._write_blob(digest, content)
+            record['kind'] = 'full'
+        record.update(codec=codec, stored=blob_path.stat().st_size)
+
+        self._append_manifest(record)
+        return dict(record, deduplicated=deduplicated)
+
+    def read(self, record: Dict[str, Any]) -> bytes:
+        """
+        백업 내용 읽기
+
+        원본 blob이 있으면 그대로 반환하고 (SHA-256 검증), 델타 기록은 스냅샷에
+        델타를 재생해 JSON으로 다시 직렬화한다 (정규화 해시 검증).
+        """
+        if record.get('kind') != 'delta' or self._find_blob(record['sha256']):
+            return self._read_blob(record['sha256'], record['name'])
+
+        records = self.entries()
+        doc = self._materialize(records, self._index_of(records, record))
+        if canonical_json_hash(doc) != record.get('doc'):
+            raise ValueError(f"델타 재생 결과가 백업 당시 내용과 다릅니다: {record['name']}")
+        return (json.dumps(doc, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def at(self, timestamp: float) -> Optional[Dict[str, Any]]:
+        """timestamp 시각 또는 그 이전의 가장 최근 백업 기록"""
+        for record in reversed(self.entries()):
+            if record.get('time', 0) <= timestamp:
+                return record
+        return None
+
+    def restore(self, record: Dict[str, Any], dest: Path) -> None:
+        """백업 내용을 dest에 원자적으로 복원"""
+        import tempfile
+        content = self.read(record)
+        temp_fd, temp_path = tempfile.mkstemp(dir=Path(dest).parent, prefix='.claude_tmp_', suffix='.json')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if sys.platform == 'win32' and Path(dest).exists():
+                Path(dest).unlink()
+            os.replace(temp_path, dest)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def _blob_digest(record: Dict[str, Any]) -> str:
+        return record['patch'] if record.get('kind') == 'delta' else record['sha256']
+
+    def cleanup(self, max_keep: int = BACKUP_MAX_KEEP,
+                max_age_days: int = BACKUP_MAX_AGE_DAYS) -> List[Dict[str, Any]]:
+        """
+        오래된 백업 기록 정리 후 참조되지 않는 blob 삭제
+
+        최신 max_keep개 중 max_age_days일 이내 기록만 남긴다. 단, 남은 가장 오래된
+        델타 기록이 복원 가능하도록 그 기준 스냅샷까지의 기록은 함께 유지한다.
+        삭제된 기록 목록 반환.
+        """
+        records = self._checked_entries()
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
+        start = max(len(records) - max_keep, 0) if max_keep > 0 else len(records)
+        while start < len(records) and records[start].get('time', 0) < cutoff:
+            start += 1
+        if start < len(records):
+            try:
+                start = self._chain_start(records, start)
+            except ValueError:
+                pass  # 기준 스냅샷이 이미 없는 체인은 그대로 둔다
+        keep, removed = records[start:], records[:start]
+        if not removed:
+            return []
+
+        self._write_manifest(keep)
+
+        referenced = {self._blob_digest(r) for r in keep}
+        for record in removed:
+            digest = self._blob_digest(record)
+            if digest in referenced:
+                continue
+            found = self._find_blob(digest)
+            if found:
+                try:
+                    found[0].unlink()
+                except OSError:
+                    pass
+            referenced.add(digest)  # 같은 blob 중복 삭제 시도 방지
+        return removed
+
+    def rebuild(self) -> List[Dict[str, Any]]:
+        """
+        manifest를 실제 저장 내용과 맞춰 다시 작성 (자가 복구)
+
+        - blob이 없는 기록과 그 뒤로 끊긴 델타 체인은 제거
+        - manifest에 없는 스냅샷 blob은 파일 수정 시각 기준 기록으로 복원
+        - 이전 방식의 claude_*.json 전체 복사본은 저장소로 옮긴 뒤 삭제
+
+        Returns:
+            재구성된 기록 목록
+        """
+        import hashlib
+        if not self.backup_dir.exists():
+            return []
+        records, _ = self._load()
+
+        kept = []
+        chain_ok = False
+        for record in records:
+            present = self._find_blob(self._blob_digest(record)) is not None
+            if record.get('kind') == 'delta':
+                chain_ok = chain_ok and present
+            else:
+                chain_ok = present
+            if chain_ok:
+                kept.append(record)
+
+        referenced = {self._blob_digest(r) for r in kept}
+        recovered = []
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob('*/*'):
+                digest = path.name.split('.', 1)[0]
+                if digest in referenced or path.name.startswith('.'):
+                    continue
+                try:
+                    content = self._read_blob(digest, path.name)
+                    is_snapshot = isinstance(json.loads(content), dict)
+                except (OSError, ValueError):
+                    continue
+                if not is_snapshot:
+                    path.unlink()  # 기준 기록을 잃은 델타는 재생할 수 없음
+                    continue
+                recovered.append(self._rebuilt_record(content, digest, path, path.stat().st_mtime))
+                referenced.add(digest)
+
+        for path in self.backup_dir.glob(self.LEGACY_PATTERN):
+            with open(path, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+            blob_path, _ = self._write_blob(digest, content)
+            recovered.append(self._rebuilt_record(content, digest, blob_path, path.stat().st_mtime, path.stem))
+
+        rebuilt = sorted(kept + recovered, key=lambda r: r.get('time', 0))
+        self._write_manifest(rebuilt)
+        for path in self.backup_dir.glob(self.LEGACY_PATTERN):
+            path.unlink()
+        return rebuilt
+
+    @staticmethod
+    def _rebuilt_record(content: bytes, digest: str, blob_path: Path, mtime: float,
+                        name: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'name': name or f"claude_{datetime.fromtimestamp(mtime).strftime('%Y%m%d_%H%M%S_%f')[:-3]}",
+            'time': mtime,
+            'sha256': digest,
+            'size': len(content),
+            'kind': 'full',
+            'codec': next(c for c, (_, ext) in BACKUP_CODECS.items() if blob_path.name.endswith(ext)),
+            'stored': blob_path.stat().st_size,
+        }
+
+
+class ConfigLock:
+    """
+    ~/.claude.lock 기반 프로세스 간 잠금 (커널 advisory lock)
+
+    - POSIX: fcntl.flock 공유(읽기)/배타(쓰기) 잠금. 경쟁 시 LOCK_NB로 짧은 간격부터
+      점점 늘려(최대 POSIX_RETRY_MAX초) 재시도하고, timeout이 지나면 fd를 닫고 포기한다
+      (상주 데몬에서도 시간 초과한 요청이 스레드/fd를 남기지 않음).
+    - Windows: msvcrt.locking 배타 잠금만 지원하므로 공유 잠금도 배타로 처리하고
+      짧은 간격으로 재시도한다.
+    - 보유 프로세스가 죽으면 커널이 잠금을 풀어주므로 오래된 잠금 판정이 필요 없다.
+      잠금 파일은 삭제하지 않는다 (삭제-재생성 사이의 경쟁 방지).
+    """
+
+    WINDOWS_RETRY_INTERVAL = 0.05
+    POSIX_RETRY_MIN = 0.001
+    POSIX_RETRY_MAX = 0.05
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.fd: Optional[int] = None
+        self.shared = False
+
+    @property
+    def locked(self) -> bool:
+        return self.fd is not None
+
+    @profiled('lock.acquire')
+    def acquire(self, shared: bool = False, timeout: float = 10.0) -> bool:
+        """
+        잠금 획득
+
+        Args:
+            shared: True면 공유(읽기) 잠금, False면 배타(쓰기) 잠금
+            timeout: 최대 대기 시간(초), 0이면 즉시 실패
+
+        Returns:
+            획득 여부 (이미 보유 중이면 True)
+        """
+        if self.fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            acquired = (self._acquire_posix(fd, shared, timeout) if fcntl
+                        else self._acquire_windows(fd, timeout))
+        except BaseException:
+            os.close(fd)
+            raise
+        if not acquired:
+            return False  # fd는 _acquire_*에서 정리됨
+
+        self.fd, self.shared = fd, shared
+        if not shared or not fcntl:
+            # 진단용 보유자 정보 (잠금 판정에는 사용하지 않음), 세대 번호는 유지
+            try:
+                self._write_state(dict(self._read_state(), pid=os.getpid(), time=time.time()))
+            except OSError:
+                pass
+        return True
+
+    def _read_state(self) -> Dict[str, Any]:
+        """잠금 파일 내용 {'pid', 'time', 'generation'} (이전 형식/손상 시 빈 dict)"""
+        try:
+            if self.fd is not None:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                raw = os.read(self.fd, 4096)
+            else:
+                with open(self.path, 'rb') as f:
+                    raw = f.read(4096)
+            state = json.loads(raw)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.ftruncate(self.fd, 0)
+        os.write(self.fd, json.dumps(state).encode())
+
+    def read_generation(self) -> int:
+        """
+        설정 세대 번호 (이 도구들이 ~/.claude.json을 쓸 때마다 1 증가)
+
+        잠금 보유 중이면 잠금 파일 fd로, 아니면 파일을 직접 읽는다.
+        """
+        generation = self._read_state().get('generation', 0)
+        return generation if isinstance(generation, int) else 0
+
+    def bump_generation(self) -> int:
+        """설정 변경 후 세대 번호 증가 (배타 잠금 보유 중에만 호출)"""
+        if self.fd is None or (self.shared and fcntl):
+            raise RuntimeError("세대 번호는 배타 잠금을 보유한 상태에서만 변경할 수 있습니다")
+        state = self._read_state()
+        state['generation'] = self.read_generation() + 1
+        self._write_state(state)
+        return state['generation']
+
+    def _acquire_posix(self, fd: int, shared: bool, timeout: float) -> bool:
+        operation = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        deadline = time.monotonic() + timeout
+        interval = self.POSIX_RETRY_MIN
+        while True:
+            try:
+                fcntl.flock(fd, operation)
+                return True
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    os.close(fd)
+                    return False
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, self.POSIX_RETRY_MAX)
+
+    def _acquire_windows(self, fd: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    return False
+                time.sleep(self.WINDOWS_RETRY_INTERVAL)
+
+    def release(self) -> None:
+        """잠금 해제 (보유하지 않았으면 무시)"""
+        fd, self.fd = self.fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+# MCP stdio 핸드셰이크에 사용하는 프로토콜 버전
+MCP_PROTOCOL_VERSION = '2025-06-18'
+PROBE_STDERR_LINES = 5   # 실패 시 결과에 남길 stderr 마지막 줄 수
+
+
+def _kill_process_tree(proc: 'subprocess.Popen') -> None:
+    """프로세스와 자식 프로세스 종료 (npx, cmd.exe /c 등 래퍼 하위 프로세스 포함)"""
+    import signal
+    import subprocess
+    if proc.poll() is not None:
+        return
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        proc.kill()
+
+
+class _StdioSession:
+    """
+    stdio MCP 서버와의 JSON-RPC 세션 (줄 단위 JSON 메시지)
+
+    stdout/stderr는 별도 스레드가 읽으므로 파이프가 차서 서버가 멈추지 않고,
+    응답 대기는 큐 타임아웃으로 마감시간을 지킨다 (Windows 파이프에서도 동작).
+    """
+
+    def __init__(self, command: str, args: List[str], env: Optional[Dict[str, str]]):
+        import queue
+        import shutil
+        import subprocess
+        popen_env = dict(os.environ)
+        popen_env.update({str(k): str(v) for k, v in (env or {}).items()})
+        kwargs = ({'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == 'win32'
+                  else {'start_new_session': True})
+        self.proc = subprocess.Popen(
+            [shutil.which(command) or command, *[str(arg) for arg in args]],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            env=popen_env, **kwargs
+        )
+        self.messages = queue.Queue()
+        self.stderr_tail = deque(maxlen=PROBE_STDERR_LINES)
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        for line in self.proc.stdout:
+            self.messages.put(line)
+        self.messages.put(None)
+
+    def _read_stderr(self) -> None:
+        for line in self.proc.stderr:
+            text = line.decode('utf-8', 'replace').rstrip()
+            if text:
+                self.stderr_tail.append(text)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.proc.stdin.write((json.dumps(message) + '\n').encode('utf-8'))
+        self.proc.stdin.flush()
+
+    def request(self, request_id: int, method: str, params: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        """
+        요청을 보내고 같은 id의 응답 결과 반환 (알림·로그 줄은 건너뜀)
+
+        Raises:
+            TimeoutError: 마감시간 초과
+            ConnectionError: 응답 전에 서버 종료
+            RuntimeError: JSON-RPC 오류 응답
+        """
+        import queue
+        import subprocess
+        self.send({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{method} 응답 마감시간 초과")
+            try:
+                line = self.messages.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"{method} 응답 마감시간 초과")
+            if line is None:
+                try:
+                    code = self.proc.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    code = None
+                raise ConnectionError(f"{method} 응답 전에 서버가 stdout을 닫았습니다 (종료 코드 {code})")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue  # stdout에 섞인 로그 출력
+            if not isinstance(message, dict) or message.get('id') != request_id:
+                continue
+            if 'error' in message:
+                raise RuntimeError(f"{method} 오류: {message['error'].get('message', message['error'])}")
+            return message.get('result') or {}
+
+    def close(self) -> None:
+        import subprocess
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        _kill_process_tree(self.proc)
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+@profiled('probe.server')
+def probe_stdio_server(config: Dict[str, Any], deadline: float,
+                       client_name: str = 'mcp-installer') -> Dict[str, Any]:
+    """
+    stdio MCP 서버를 실행해 initialize + tools/list 핸드셰이크 수행
+
+    Args:
+        config: mcpServers 항목 (command, args, env)
+        deadline: time.monotonic() 기준 마감 시각. 넘으면 서버를 강제 종료
+
+    Returns:
+        {'status': 'ok'|'timeout'|'error', 'spawn_ms', 'initialize_ms', 'first_response_ms',
+         'tools_ms', 'tools', 'server', 'protocol', 'error', 'stderr'}
+        spawn_ms: 프로세스 생성, initialize_ms: 생성 후 initialize 응답까지,
+        first_response_ms: 실행 시작부터 첫 응답까지, tools_ms: tools/list 왕복 (페이지 포함)
+    """
+    result = {'status': 'error', 'spawn_ms': None, 'initialize_ms': None, 'first_response_ms': None,
+              'tools_ms': None, 'tools': None, 'server': None, 'protocol': None, 'error': None}
+    started = time.perf_counter()
+    try:
+        session = _StdioSession(config.get('command', ''), config.get('args') or [], config.get('env'))
+    except (OSError, ValueError) as e:
+        result['error'] = f"실행 실패: {e}"
+        return result
+    spawned = time.perf_counter()
+    result['spawn_ms'] = round((spawned - started) * 1000, 1)
+
+    try:
+        init = session.request(1, 'initialize', {
+            'protocolVersion': MCP_PROTOCOL_VERSION,
+            'capabilities': {},
+            'clientInfo': {'name': client_name, 'version': '1.0'},
+        }, deadline)
+        answered = time.perf_counter()
+        result['initialize_ms'] = round((answered - spawned) * 1000, 1)
+        result['first_response_ms'] = round((answered - started) * 1000, 1)
+        result['server'] = init.get('serverInfo')
+        result['protocol'] = init.get('protocolVersion')
+        session.send({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+
+        tools = []
+        cursor = None
+        request_id = 2
+        while True:
+            page = session.request(request_id, 'tools/list', {'cursor': cursor} if cursor else {}, deadline)
+            tools.extend(page.get('tools') or [])
+            cursor = page.get('nextCursor')
+            request_id += 1
+            if not cursor:
+                break
+        result['tools_ms'] = round((time.perf_counter() - answered) * 1000, 1)
+        result['tools'] = len(tools)
+        result['status'] = 'ok'
+    except TimeoutError as e:
+        result['status'] = 'timeout'
+        result['error'] = str(e)
+    except (ConnectionError, RuntimeError, OSError) as e:
+        result['error'] = str(e)
+    finally:
+        session.close()
+
+    if result['status'] != 'ok' and session.stderr_tail:
+        result['stderr'] = list(session.stderr_tail)
+    return result
+
+
+def probe_servers(servers: Dict[str, Dict[str, Any]], max_workers: int = 4,
+                  deadline: float = 30.0) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 stdio 서버를 제한된 작업자 수로 동시에 점검
+
+    모든 점검은 호출 시점부터 deadline초 안에 끝나며, 그때까지 응답하지 않은 서버는
+    강제 종료되고 마감 전에 시작하지 못한 서버는 timeout으로 기록된다.
+    """
+    end = time.monotonic() + deadline
+
+    def _probe(config):
+        if time.monotonic() >= end:
+            return {'status': 'timeout', 'error': "마감시간 전에 시작하지 못했습니다"}
+        return probe_stdio_server(config, end)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(servers) or 1))) as executor:
+        futures = {name: executor.submit(_probe, config) for name, config in servers.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+# ---------------------------------------------------------------------------
+# 실행 최적화: npx/uvx 항목을 로컬에 이미 설치된 진입점 직접 실행으로 변환
+# ---------------------------------------------------------------------------
+
+_EXACT_VERSION_RE = re.compile(r'^v?\d+\.\d+\.\d+(?:[-+.][0-9A-Za-z.-]+)?$')
+_NPX_YES_FLAGS = {'-y', '--yes'}
+
+
+def _split_launcher(config: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """cmd.exe /c 래퍼와 확장자를 벗긴 (실행기 이름, 나머지 인자)"""
+    command = Path(str(config.get('command', ''))).name.lower()
+    args = [str(arg) for arg in config.get('args') or []]
+    if command in ('cmd', 'cmd.exe') and args[:1] == ['/c'] and len(args) > 1:
+        command, args = Path(args[1]).name.lower(), args[2:]
+    for suffix in ('.exe', '.cmd', '.bat'):
+        if command.endswith(suffix):
+            command = command[:-len(suffix)]
+    return command, args
+
+
+def _split_package_spec(spec: str, separators: str = '@') -> Tuple[str, Optional[str]]:
+    """'@scope/pkg@1.2.3' -> ('@scope/pkg', '1.2.3'), 버전이 없으면 None"""
+    start = 1 if spec.startswith('@') else 0
+    for sep in separators.split('|'):
+        idx = spec.find(sep, start)
+        if idx > 0:
+            return spec[:idx], spec[idx + len(sep):]
+    return spec, None
+
+
+def _pinned_version_matches(wanted: Optional[str], installed: Optional[str]) -> Optional[str]:
+    """요청 버전과 설치 버전 비교 - 바꿀 수 없으면 사유, 가능하면 None"""
+    if wanted in (None, '', 'latest'):
+        return None
+    if not _EXACT_VERSION_RE.match(wanted):
+        return f"버전 범위 지정({wanted})은 고정 경로로 바꿀 수 없습니다"
+    if installed != wanted.lstrip('v'):
+        return f"요청 버전 {wanted} != 로컬 버전 {installed}"
+    return None
+
+
+def npm_package_dirs(name: str) -> List[Path]:
+    """
+    로컬에 설치된 npm 패키지 디렉토리 후보 (전역 prefix 우선, 그 다음 npx 캐시 최신순)
+
+    npx 캐시(<npm cache>/_npx/<hash>/node_modules)는 npm이 정리할 수 있으므로
+    전역 설치가 있으면 그쪽을 먼저 쓴다.
+    """
+    import shutil
+    windows = sys.platform == 'win32'
+    roots = []
+    prefix = os.environ.get('npm_config_prefix') or os.environ.get('NPM_CONFIG_PREFIX')
+    if prefix:
+        roots.append(Path(prefix) / 'node_modules' if windows else Path(prefix) / 'lib' / 'node_modules')
+    node = shutil.which('node')
+    if node:
+        bin_dir = Path(node).resolve().parent
+        roots.append(bin_dir / 'node_modules' if windows else bin_dir.parent / 'lib' / 'node_modules')
+
+    found = [root / name for root in roots if (root / name / 'package.json').is_file()]
+
+    cache = os.environ.get('npm_config_cache') or os.environ.get('NPM_CONFIG_CACHE')
+    if cache:
+        cache_dir = Path(cache)
+    elif windows:
+        cache_dir = Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local')) / 'npm-cache'
+    else:
+        cache_dir = Path.home() / '.npm'
+    cached = []
+    for manifest in (cache_dir / '_npx').glob(f'*/node_modules/{name}/package.json'):
+        try:
+            cached.append((manifest.stat().st_mtime, manifest.parent))
+        except OSError:
+            continue
+    found.extend(path for _, path in sorted(cached, reverse=True))
+
+    unique = []
+    for path in found:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+def npm_bin_entry(package_dir: Path, name: str) -> Tuple[Optional[Path], Optional[str]]:
+    """package.json의 bin 항목에서 (진입 스크립트 경로, 설치 버전) 찾기"""
+    try:
+        with open(package_dir / 'package.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    bins = manifest.get('bin')
+    if isinstance(bins, dict):
+        # npx와 같은 규칙: 하나뿐이면 그것, 여러 개면 패키지 이름(스코프 제외)과 같은 것
+        bins = next(iter(bins.values())) if len(bins) == 1 else bins.get(name.rsplit('/', 1)[-1])
+    if not isinstance(bins, str):
+        return None, manifest.get('version')
+    entry = (package_dir / bins).resolve()
+    return (entry if entry.is_file() else None), manifest.get('version')
+
+
+def uv_tool_dir() -> Path:
+    """uv tool install 위치 (UV_TOOL_DIR, 없으면 플랫폼 기본값)"""
+    if os.environ.get('UV_TOOL_DIR'):
+        return Path(os.environ['UV_TOOL_DIR'])
+    if sys.platform == 'win32':
+        return Path(os.environ.get('APPDATA', Path.home() / 'AppData' / 'Roaming')) / 'uv' / 'tools'
+    return Path(os.environ.get('XDG_DATA_HOME', Path.home() / '.local' / 'share')) / 'uv' / 'tools'
+
+
+def _plan_npx(args: List[str], config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    index = 0
+    while index < len(args) and args[index] in _NPX_YES_FLAGS:
+        index += 1
+    if index >= len(args) or args[index].startswith('-'):
+        return None, "지원하지 않는 npx 옵션 (-y 외 옵션 사용)"
+    name, version = _split_package_spec(args[index])
+    for package_dir in npm_package_dirs(name):
+        entry, installed = npm_bin_entry(package_dir, name)
+        if entry is None:
+            continue
+        mismatch = _pinned_version_matches(version, installed)
+        if mismatch:
+            return None, mismatch
+        rewritten = dict(config, command='node', args=[str(entry)] + args[index + 1:])
+        return rewritten, f"{name}@{installed} ({package_dir})"
+    return None, f"로컬 npm 전역 설치/npx 캐시에 {name} 없음"
+
+
+def _plan_uvx(args: List[str], config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    if sys.platform == 'win32':
+        return None, "Windows의 uv 도구 실행 파일(.exe)은 python으로 직접 실행할 수 없습니다"
+    if not args or args[0].startswith('-'):
+        return None, "지원하지 않는 uvx 옵션 (--from 등 사용)"
+    name, version = _split_package_spec(args[0], '==|@')
+    tool = uv_tool_dir() / name
+    script = tool / 'bin' / name
+    python = tool / 'bin' / 'python'
+    if not (script.is_file() and python.exists()):
+        return None, f"uv tool install로 설치된 {name} 없음 ({tool})"
+    dist = name.replace('-', '_').lower()
+    installed = None
+    for dist_info in tool.glob('lib/python*/site-packages/*.dist-info'):
+        dist_name, _, dist_version = dist_info.name[:-len('.dist-info')].partition('-')
+        if dist_name.lower() == dist:
+            installed = dist_version
+            break
+    mismatch = _pinned_version_matches(version, installed)
+    if mismatch:
+        return None, mismatch
+    rewritten = dict(config, command=str(python), args=[str(script)] + args[1:])
+    return rewritten, f"{name}=={installed} ({tool})" if installed else f"{name} ({tool})"
+
+
+def plan_direct_launch(config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    npx/uvx 실행 항목을 로컬에 이미 있는 진입점의 직접 실행으로 바꾼 설정 제안
+
+    npx -y <pkg>는 실행할 때마다 레지스트리에서 패키지를 해석하므로, 전역 prefix나
+    npx 캐시에 설치된 패키지가 있으면 `node <bin 스크립트>`로, uv tool로 설치된
+    uvx 패키지는 해당 도구 환경의 python으로 콘솔 스크립트를 바로 실행한다.
+    고정 버전(pkg@1.2.3)은 로컬 버전이 같을 때만, 버전 범위는 바꾸지 않는다.
+
+    Returns:
+        (바꾼 설정, 출처 설명) 또는 (None, 바꿀 수 없는 사유). 보안 검증은 호출자 몫
+    """
+    launcher, args = _split_launcher(config)
+    if launcher == 'npx':
+        return _plan_npx(args, config)
+    if launcher == 'uvx':
+        return _plan_uvx(args, config)
+    return None, "npx/uvx 실행 항목이 아님"
+
+
+# ---------------------------------------------------------------------------
+# 구조화 작업 로그 (JSON lines) 및 Prometheus textfile 지표
+# ---------------------------------------------------------------------------
+
+OPLOG_FILE = Path.home() / ".claude-mcp-cache" / "operations.jsonl"
+OPLOG_MAX_BYTES = 5 * 1024 * 1024   # 이 크기를 넘으면 operations.jsonl.1 ... 로 회전
+OPLOG_BACKUP_COUNT = 3
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Operation:
+    """OperationLog.operation()의 with 블록 - 소요 시간과 결과를 기록"""
+
+    def __init__(self, log: 'OperationLog', name: str, fields: Dict[str, Any]):
+        self.log = log
+        self.name = name
+        self.fields = fields
+        self.outcome = 'ok'
+        self.size = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.outcome == 'ok':
+            self.outcome = 'error'
+            self.fields.setdefault('error', f"{exc_type.__name__}: {exc}")
+        self.log.emit(self.name, self.outcome, duration=time.perf_counter() - self.start, size=self.size,
+                      **self.fields)
+        return False
+
+
+class OperationLog:
+    """
+    작업 단위 구조화 이벤트 기록기
+
+    이벤트는 {ts, script, host, pid, operation, outcome, server, duration_ms, bytes, ...}
+    JSON 한 줄이며, --log-format json이면 stdout으로, 로그 파일을 지정하면 크기 기준으로
+    회전하는 파일에 추가된다. 지표 파일을 지정하면 종료 시 작업별 횟수/지연 히스토그램/
+    바이트 수를 누적해 node_exporter textfile collector 형식(.prom)으로 원자적으로 쓴다.
+    아무것도 설정하지 않으면 emit은 바로 반환한다.
+    """
+
+    def __init__(self):
+        self.script = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else 'mcp'
+        self.json_output = False
+        self.log_path = None
+        self.metrics_path = None
+        self.max_bytes = OPLOG_MAX_BYTES
+        self.backup_count = OPLOG_BACKUP_COUNT
+        self._events = []
+        self._lock = threading.Lock()
+        self._host = None
+
+    @property
+    def active(self) -> bool:
+        return self.json_output or self.log_path is not None or self.metrics_path is not None
+
+    def configure(self, script: str, log_format: Optional[str] = None, log_file: Optional[str] = None,
+                  metrics_file: Optional[str] = None) -> None:
+        """출력 설정 (지정하지 않은 항목은 MCP_LOG_FORMAT / MCP_LOG_FILE / MCP_METRICS_FILE 환경변수)"""
+        self.script = script
+        log_format = log_format or os.environ.get('MCP_LOG_FORMAT', 'text')
+        self.json_output = log_format == 'json'
+        log_file = log_file or os.environ.get('MCP_LOG_FILE')
+        self.log_path = Path(log_file).expanduser() if log_file else None
+        metrics_file = metrics_file or os.environ.get('MCP_METRICS_FILE')
+        self.metrics_path = Path(metrics_file).expanduser() if metrics_file else None
+
+    def _base(self) -> Dict[str, Any]:
+        if self._host is None:
+            import socket
+            self._host = socket.gethostname()
+        return {'ts': datetime.now().astimezone().isoformat(timespec='milliseconds'),
+                'script': self.script, 'host': self._host, 'pid': os.getpid()}
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        if self.json_output:
+            print(line, flush=True)
+        if self.log_path is not None:
+            try:
+                with self._lock:
+                    self._append_rotating(line + '\n')
+            except OSError:
+                pass  # 로그 기록 실패로 작업을 중단하지 않음
+
+    def _append_rotating(self, line: str) -> None:
+        path = self.log_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(line) > self.max_bytes:
+            for index in range(self.backup_count - 1, 0, -1):
+                older = path.with_name(f"{path.name}.{index}")
+                if older.exists():
+                    os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        # O_APPEND 한 번의 write라 여러 프로세스가 동시에 써도 줄이 섞이지 않는다
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def emit(self, operation: str, outcome: str = 'ok', server: Optional[str] = None,
+             duration: Optional[float] = None, size: Optional[int] = None, **fields) -> None:
+        """작업 이벤트 기록 (duration: 초, size: 읽거나 쓴 바이트 수)"""
+        if not self.active:
+            return
+        record = self._base()
+        record.update(operation=operation, outcome=outcome)
+        if server is not None:
+            record['server'] = server
+        if duration is not None:
+            record['duration_ms'] = round(duration * 1000, 3)
+        if size is not None:
+            record['bytes'] = size
+        record.update(fields)
+        with self._lock:
+            self._events.append((operation, outcome, duration, size))
+        self._write(record)
+
+    def operation(self, name: str, **fields) -> _Operation:
+        """with 블록의 소요 시간과 결과(예외 시 error)를 기록 - op.outcome, op.size, op.fields로 결과 보강"""
+        return _Operation(self, name, fields)
+
+    def message(self, level: str, text: str) -> bool:
+        """info/warn 등 사람용 메시지를 이벤트로 기록. stdout을 JSON이 차지하면 True"""
+        if self.json_output or self.log_path is not None:
+            record = self._base()
+            record.update(operation='message', level=level, message=text)
+            self._write(record)
+        return self.json_output
+
+    def write_metrics(self) -> bool:
+        """이번 실행의 이벤트를 누적 상태에 더해 Prometheus textfile(.prom)로 저장"""
+        if self.metrics_path is None or not self._events:
+            return True
+        path = self.metrics_path
+        state_path = path.with_name(path.name + '.state.json')
+        lock = ConfigLock(path.with_name(path.name + '.lock'))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not lock.acquire(timeout=2.0):
+                return False
+            try:
+                try:
+                    with open(state_path, 'r', encoding='utf-8') as f:
+                        state = json.load(f)
+                except (OSError, ValueError):
+                    state = {}
+                ops = state.setdefault('operations', {})
+                for operation, outcome, duration, size in self._events:
+                    key = f"{self.script}|{operation}"
+                    entry = ops.setdefault(key, {'outcomes': {}, 'buckets': [0] * len(METRICS_BUCKETS),
+                                                 'count': 0, 'sum': 0.0, 'bytes': 0})
+                    entry['outcomes'][outcome] = entry['outcomes'].get(outcome, 0) + 1
+                    if duration is not None:
+                        entry['count'] += 1
+                        entry['sum'] += duration
+                        for index, bound in enumerate(METRICS_BUCKETS):
+                            if duration <= bound:
+                                entry['buckets'][index] += 1
+                    if size:
+                        entry['bytes'] += size
+                state.setdefault('last_run', {})[self.script] = time.time()
+                _atomic_write_text(state_path, json.dumps(state, sort_keys=True))
+                _atomic_write_text(path, self._render_metrics(state))
+                self._events = []
+                return True
+            finally:
+                lock.release()
+        except OSError:
+            return False
+
+    @staticmethod
+    def _render_metrics(state: Dict[str, Any]) -> str:
+        def labels(script, operation, **extra):
+            pairs = {'script': script, 'operation': operation, **extra}
+            return ','.join(f'{k}="{_prom_escape(v)}"' for k, v in pairs.items())
+
+        ops = sorted(state.get('operations', {}).items())
+        lines = ['# HELP mcp_operations_total MCP 설치/현황 작업 수 (결과별)',
+                 '# TYPE mcp_operations_total counter']
+        for key, entry in ops:
+            script, operation = key.split('|', 1)
+            for outcome, count in sorted(entry['outcomes'].items()):
+                lines.append(f"mcp_operations_total{{{labels(script, operation, outcome=outcome)}}} {count}")
+        lines += ['# HELP mcp_operation_duration_seconds MCP 작업 소요 시간',
+                  '# TYPE mcp_operation_duration_seconds histogram']
+        for key, entry in ops:
+            if not entry['count']:
+                continue
+            script, operation = key.split('|', 1)
+            # 버킷별 개수는 해당 상한 이하 누적값으로 저장되어 있음
+            for bound, count in zip(METRICS_BUCKETS, entry['buckets']):
+                lines.append(f"mcp_operation_duration_seconds_bucket{{{labels(script, operation, le=f'{bound:g}')}}} {count}")
+            lines.append(f"mcp_operation_duration_seconds_bucket{{{labels(script, operation, le='+Inf')}}} {entry['count']}")
+            lines.append(f"mcp_operation_duration_seconds_sum{{{labels(script, operation)}}} {entry['sum']:.6f}")
+            lines.append(f"mcp_operation_duration_seconds_count{{{labels(script, operation)}}} {entry['count']}")
+        lines += ['# HELP mcp_operation_bytes_total MCP 작업이 읽거나 쓴 바이트 수',
+                  '# TYPE mcp_operation_bytes_total counter']
+        for key, entry in ops:
+            if entry['bytes']:
+                script, operation = key.split('|', 1)
+                lines.append(f"mcp_operation_bytes_total{{{labels(script, operation)}}} {entry['bytes']}")
+        lines += ['# HELP mcp_last_run_timestamp_seconds 마지막 실행 시각 (Unix time)',
+                  '# TYPE mcp_last_run_timestamp_seconds gauge']
+        for script, stamp in sorted(state.get('last_run', {}).items()):
+            lines.append(f'mcp_last_run_timestamp_seconds{{script="{_prom_escape(script)}"}} {stamp:.3f}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self) -> None:
+        self.write_metrics()
+
+
+def _prom_escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """임시 파일에 쓴 뒤 교체 (textfile collector가 쓰다 만 파일을 읽지 않도록)"""
+    import tempfile
+    temp_fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.tmp_')
+    try:
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+OPLOG = OperationLog()
+
+
+def logged(name: str, size=None):
+    """
+    함수 호출을 작업 이벤트로 기록하는 데코레이터 (OPLOG가 꺼져 있으면 그대로 호출)
+
+    반환값이 참이면 ok, 거짓이면 failed, 예외면 error.
+    size(result, *args)를 주면 반환값에서 바이트 수를 구해 함께 기록한다.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not OPLOG.active:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                OPLOG.emit(name, 'error', duration=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+                raise
+            nbytes = None
+            if size is not None and result:
+                try:
+                    nbytes = size(result, *args)
+                except (OSError, TypeError, KeyError, AttributeError):
+                    nbytes = None
+            OPLOG.emit(name, 'ok' if result else 'failed', duration=time.perf_counter() - start, size=nbytes)
+            return result
+        return wrapper
+    return decorator